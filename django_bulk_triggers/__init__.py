@@ -11,7 +11,10 @@ from django_bulk_triggers.factory import (
     create_trigger_instance,
     is_container_configured,
 )
-from django_bulk_triggers.constants import DEFAULT_BULK_UPDATE_BATCH_SIZE
+from django_bulk_triggers.constants import (
+    DEFAULT_BULK_DELETE_BATCH_SIZE,
+    DEFAULT_BULK_UPDATE_BATCH_SIZE,
+)
 
 # Add NullHandler to prevent logging messages if the application doesn't configure logging
 logging.getLogger(__name__).addHandler(logging.NullHandler())
@@ -27,4 +30,5 @@ __all__ = [
     "create_trigger_instance",
     "is_container_configured",
     "DEFAULT_BULK_UPDATE_BATCH_SIZE",
+    "DEFAULT_BULK_DELETE_BATCH_SIZE",
 ]
@@ -7,7 +7,8 @@ for better maintainability and testing.
 
 import logging
 import traceback
-from django.db import transaction, connection
+from django.core.exceptions import FieldDoesNotExist
+from django.db import transaction, connections
 from django.db.backends.utils import CursorWrapper
 
 from django_bulk_triggers import engine
@@ -78,13 +79,6 @@ class QueryDebugCursorWrapper(CursorWrapper):
             _log_query(sql, params)
         return super().executemany(sql, param_list)
 
-def _enable_query_debugging():
-    """Enable query debugging by using Django's built-in query logging."""
-    # Use Django's built-in query logging instead of cursor wrapping
-    from django.db import connection
-    connection.queries_log.clear()
-    connection.use_debug_cursor = True
-
 def _disable_query_debugging():
     """Disable query debugging."""
     from django.db import connection
@@ -92,6 +86,17 @@ def _disable_query_debugging():
     _reset_query_debug()
 
 
+class _QueryCounter:
+    """Execute wrapper that counts the database queries run through it."""
+
+    def __init__(self):
+        self.count = 0
+
+    def __call__(self, execute, sql, params, many, context):
+        self.count += 1
+        return execute(sql, params, many, context)
+
+
 class BulkOperationsMixin:
     """
     Mixin containing bulk operation methods for TriggerQuerySetMixin.
@@ -119,10 +124,49 @@ class BulkOperationsMixin:
         but supports multi-table inheritance (MTI) models and triggers. All arguments are supported and
         passed through to the correct logic. For MTI, only a subset of options may be supported.
         """
+        create_kwargs = {
+            "batch_size": batch_size,
+            "ignore_conflicts": ignore_conflicts,
+            "update_conflicts": update_conflicts,
+            "update_fields": update_fields,
+            "unique_fields": unique_fields,
+            "bypass_triggers": bypass_triggers,
+            "bypass_validation": bypass_validation,
+        }
+        if not logger.isEnabledFor(logging.DEBUG):
+            return self._bulk_create_with_triggers(objs, **create_kwargs)
+
+        # Count the queries this operation issues, triggers included
+        query_counter = _QueryCounter()
+        with connections[self.db].execute_wrapper(query_counter):
+            result = self._bulk_create_with_triggers(objs, **create_kwargs)
+
+        logger.debug(f"=== BULK_CREATE DEBUG END ===")
+        logger.debug(f"Total queries executed: {query_counter.count}")
+
+        if query_counter.count > len(objs) + 5:  # More than 1 query per object + some overhead
+            logger.warning(f"POTENTIAL N+1 QUERY DETECTED: {query_counter.count} queries for {len(objs)} objects")
+            logger.warning("This suggests queries are being executed in a loop!")
+
+        return result
+
+    def _bulk_create_with_triggers(
+        self,
+        objs,
+        batch_size=None,
+        ignore_conflicts=False,
+        update_conflicts=False,
+        update_fields=None,
+        unique_fields=None,
+        bypass_triggers=False,
+        bypass_validation=False,
+    ):
+        """
+        Run bulk_create's triggers around the MTI or optimized single-table insert.
+        """
         # Reset query debugging for this operation
         _reset_query_debug()
-        _enable_query_debugging()
-        
+
         logger.debug(f"=== BULK_CREATE DEBUG START ===")
         logger.debug(f"Creating {len(objs)} objects of type {self.model.__name__}")
         logger.debug(f"Parameters: batch_size={batch_size}, ignore_conflicts={ignore_conflicts}, update_conflicts={update_conflicts}")
@@ -166,138 +210,9 @@ class BulkOperationsMixin:
         if not bypass_triggers:
             if update_conflicts and unique_fields:
                 # For upsert operations, we need to determine which records will be created vs updated
-                # Check which records already exist in the database based on unique fields
-                existing_records = []
-                new_records = []
-
-                # We'll store the records for AFTER triggers after classification is complete
-
-                # Build a filter to check which records already exist
-                unique_values = []
-                for obj in objs:
-                    unique_value = {}
-                    query_fields = {}  # Track which database field to use for each unique field
-                    for field_name in unique_fields:
-                        # First check for _id field (more reliable for ForeignKeys)
-                        if hasattr(obj, field_name + "_id"):
-                            # Handle ForeignKey fields where _id suffix is used
-                            unique_value[field_name] = getattr(obj, field_name + "_id")
-                            query_fields[field_name] = (
-                                field_name + "_id"
-                            )  # Use _id field for query
-                        elif hasattr(obj, field_name):
-                            unique_value[field_name] = getattr(obj, field_name)
-                            query_fields[field_name] = field_name
-                    if unique_value:
-                        unique_values.append((unique_value, query_fields))
-
-                # Query the database to find existing records
-                if unique_values:
-                    # Build Q objects for the query
-                    from django.db.models import Q
-
-                    query = Q()
-                    for unique_value, query_fields in unique_values:
-                        subquery = Q()
-                        for field_name, db_field in query_fields.items():
-                            subquery &= Q(**{db_field: unique_value[field_name]})
-                        query |= subquery
-
-                    # Find existing records
-                    # Preload all foreign key relationships to avoid N+1 queries during field copying
-                    fk_fields = [f.name for f in model_cls._meta.fields if f.is_relation and not f.many_to_many]
-                    if fk_fields:
-                        queryset = model_cls.objects.select_related(*fk_fields).filter(query)
-                        logger.debug(f"N+1 FIX: Preloading foreign key relationships: {fk_fields}")
-                    else:
-                        queryset = model_cls.objects.filter(query)
-                        logger.debug("N+1 FIX: No foreign key relationships to preload")
-
-                    existing_objs = list(queryset)
-
-                    # OPTIMIZED: Build a dict lookup for O(1) matching instead of O(n*m)
-                    # Create composite keys from unique fields for fast lookup
-                    existing_lookup = {}
-                    for existing_obj in existing_objs:
-                        key_parts = []
-                        for field_name in unique_fields:
-                            # Try _id variant first (for ForeignKeys), then the field itself
-                            if hasattr(existing_obj, field_name + "_id"):
-                                value = getattr(existing_obj, field_name + "_id")
-                            elif hasattr(existing_obj, field_name):
-                                value = getattr(existing_obj, field_name)
-                            else:
-                                value = None
-                            key_parts.append(value)
-                        
-                        # Use tuple as dict key (hashable)
-                        composite_key = tuple(key_parts)
-                        existing_lookup[composite_key] = existing_obj
-                    
-                    logger.debug(f"UPSERT OPTIMIZATION: Built lookup table for {len(existing_objs)} existing records")
-
-                    # Classify objects as existing or new based on unique fields
-                    for obj in objs:
-                        # Build the same composite key for this object
-                        key_parts = []
-                        for field_name in unique_fields:
-                            # Try _id variant first (for ForeignKeys), then the field itself
-                            if hasattr(obj, field_name + "_id"):
-                                value = getattr(obj, field_name + "_id")
-                            elif hasattr(obj, field_name):
-                                value = getattr(obj, field_name)
-                            else:
-                                value = None
-                            key_parts.append(value)
-                        
-                        composite_key = tuple(key_parts)
-                        
-                        # O(1) lookup instead of O(m) loop!
-                        if composite_key in existing_lookup:
-                            existing_obj = existing_lookup[composite_key]
-                            # Copy field values from the existing object, BUT SKIP fields that are being updated
-                            # This preserves the user's updates while populating other fields from the database
-                            update_fields_set = set(update_fields) if update_fields else set()
-                            
-                            for field in model_cls._meta.fields:
-                                if not hasattr(existing_obj, field.name):
-                                    continue
-                                
-                                # Skip fields that the user wants to update - keep user's values
-                                if field.name in update_fields_set:
-                                    continue
-                                
-                                # Also skip the attname (e.g., created_by_id) for FK fields being updated
-                                if field.is_relation and not field.many_to_many:
-                                    if field.name in update_fields_set or field.attname in update_fields_set:
-                                        continue
-
-                                if field.is_relation and not field.many_to_many:
-                                    # For foreign key fields, copy the ID to avoid stale object references
-                                    setattr(
-                                        obj,
-                                        field.attname,
-                                        getattr(existing_obj, field.attname),
-                                    )
-                                else:
-                                    # For non-relation fields, copy the value directly
-                                    setattr(
-                                        obj,
-                                        field.name,
-                                        getattr(existing_obj, field.name),
-                                    )
-
-                            # Copy the object state
-                            obj._state.adding = False
-                            obj._state.db = existing_obj._state.db
-
-                            existing_records.append(obj)
-                        else:
-                            # Not found in lookup - this is a new record
-                            new_records.append(obj)
-                else:
-                    # If no unique fields specified, all records are new
-                    new_records = objs
+                existing_records, new_records = self._classify_upsert_records(
+                    objs, unique_fields, update_fields
+                )
 
                 # Fire BEFORE and VALIDATE triggers for existing records (treated as updates)
                 if existing_records:
@@ -371,39 +286,20 @@ class BulkOperationsMixin:
         # Fire AFTER triggers
         if not bypass_triggers:
             logger.debug(f"=== FIRING AFTER TRIGGERS ===")
-            if update_conflicts and unique_fields and existing_records and new_records:
-                # For upsert operations, fire AFTER triggers for both created and updated records
+            if update_conflicts and unique_fields and existing_records:
+                # For upsert operations that matched existing rows, fire AFTER triggers
+                # matching the BEFORE triggers: updates for existing records, creates
+                # for new ones
                 logger.debug(f"Firing AFTER_UPDATE triggers for {len(existing_records)} existing records")
                 engine.run(model_cls, AFTER_UPDATE, existing_records, ctx=ctx)
-                logger.debug(f"Firing AFTER_CREATE triggers for {len(new_records)} new records")
-                engine.run(model_cls, AFTER_CREATE, new_records, ctx=ctx)
+                if new_records:
+                    logger.debug(f"Firing AFTER_CREATE triggers for {len(new_records)} new records")
+                    engine.run(model_cls, AFTER_CREATE, new_records, ctx=ctx)
             else:
                 # Regular bulk create AFTER triggers
                 logger.debug(f"Firing AFTER_CREATE triggers for {len(result)} created records")
                 engine.run(model_cls, AFTER_CREATE, result, ctx=ctx)
 
-        # Log final query statistics using Django's built-in query logging
-        from django.db import connection
-        queries = connection.queries
-        logger.debug(f"=== BULK_CREATE DEBUG END ===")
-        logger.debug(f"Total queries executed: {len(queries)}")
-        
-        if queries:
-            logger.debug("Query breakdown:")
-            for i, query in enumerate(queries):
-                logger.debug(f"  Query #{i+1}: {query['sql'][:80]}...")
-                logger.debug(f"    Time: {query['time']}s")
-        
-        if len(queries) > len(objs) + 5:  # More than 1 query per object + some overhead
-            logger.warning(f"POTENTIAL N+1 QUERY DETECTED: {len(queries)} queries for {len(objs)} objects")
-            logger.warning("This suggests queries are being executed in a loop!")
-            
-            # Show the problematic queries
-            logger.warning("Problematic queries:")
-            for i, query in enumerate(queries):
-                if 'SELECT' in query['sql'].upper():
-                    logger.warning(f"  SELECT Query #{i+1}: {query['sql'][:100]}...")
-
         return result
 
     @transaction.atomic
@@ -576,12 +472,43 @@ class BulkOperationsMixin:
     ):
         """
         Bulk delete objects in the database.
+
+        Triggers fire once for the whole set, while the rows are deleted with one
+        DELETE ... WHERE pk IN (...) statement per batch so that no statement
+        exceeds the database's bound-parameter limit.
+
+        Args:
+            objs (list[Model]): The model instances to delete.
+            bypass_triggers (bool): Skip all triggers when True.
+            bypass_validation (bool): Skip VALIDATE_DELETE triggers when True.
+            **kwargs: batch_size (int, optional) sets the number of primary keys
+                per DELETE statement. It defaults to settings.BULK_TRIGGERS_DELETE_BATCH,
+                or DEFAULT_BULK_DELETE_BATCH_SIZE (1000) when that setting is absent.
+
+        Returns:
+            int: The number of rows deleted.
+
+        Raises:
+            ValueError: If the batch size is not a positive integer.
         """
         model_cls = self.model
 
         if not objs:
             return 0
 
+        # Keep each pk__in list under the database's bound-parameter limit. The
+        # default can be tuned per project with settings.BULK_TRIGGERS_DELETE_BATCH
+        from django.conf import settings
+        from django_bulk_triggers.constants import DEFAULT_BULK_DELETE_BATCH_SIZE
+
+        batch_size = kwargs.get("batch_size")
+        if batch_size is None:
+            batch_size = getattr(
+                settings, "BULK_TRIGGERS_DELETE_BATCH", DEFAULT_BULK_DELETE_BATCH_SIZE
+            )
+        if isinstance(batch_size, bool) or not isinstance(batch_size, int) or batch_size <= 0:
+            raise ValueError("Batch size must be a positive integer.")
+
         model_cls, ctx, _ = self._setup_bulk_operation(
             objs,
             "bulk_delete",
@@ -592,20 +519,26 @@ class BulkOperationsMixin:
 
         # Execute the database operation with triggers
         def delete_operation():
-            pks = [obj.pk for obj in objs if obj.pk is not None]
-            if pks:
-                if bypass_triggers:
-                    # When bypassing triggers, use Django's native QuerySet directly
-                    # to avoid ANY trigger logic or FK caching
-                    from django.db.models import QuerySet
-                    native_qs = QuerySet(model=self.model, using=self.db)
-                    return native_qs.filter(pk__in=pks).delete()[0]
-                else:
-                    # Use the base manager to enable trigger support
-                    return self.model._base_manager.filter(pk__in=pks).delete()[0]
-            else:
+            # Read each pk once; obj.pk is a property that resolves the pk attname
+            pks = [pk for pk in (obj.pk for obj in objs) if pk is not None]
+            if not pks:
                 return 0
 
+            if bypass_triggers:
+                # When bypassing triggers, use Django's native QuerySet directly
+                # to avoid ANY trigger logic or FK caching
+                from django.db.models import QuerySet
+                base_qs = QuerySet(model=self.model, using=self.db)
+            else:
+                # Use the base manager to enable trigger support
+                base_qs = self.model._base_manager.all()
+
+            # bulk_delete runs in one transaction, so the batches delete atomically
+            deleted = 0
+            for i in range(0, len(pks), batch_size):
+                deleted += base_qs.filter(pk__in=pks[i : i + batch_size]).delete()[0]
+            return deleted
+
         result = self._execute_delete_triggers_with_operation(
             delete_operation,
             objs,
@@ -616,6 +549,101 @@ class BulkOperationsMixin:
 
         return result
 
+    def _classify_upsert_records(self, objs, unique_fields, update_fields):
+        """
+        Split upsert objects into records that already exist in the database and
+        records that will be created, matching on unique_fields.
+
+        Existing records get the database values of every field not listed in
+        update_fields copied onto them and are marked as no longer adding.
+
+        Args:
+            objs (list[Model]): The model instances being upserted.
+            unique_fields (list[str]): Fields identifying an existing row.
+            update_fields (list[str] | None): Fields the upsert will overwrite.
+
+        Returns:
+            tuple[list[Model], list[Model]]: (existing_records, new_records)
+        """
+        # Without unique fields (or objects) there is nothing to match on, and
+        # an empty Q() would match every row in the table
+        if not unique_fields or not objs:
+            return [], list(objs)
+
+        model_cls = self.model
+        existing_records = []
+        new_records = []
+
+        # Resolve once per call which attribute each unique field is read through:
+        # ForeignKeys compare by their _id attname, other fields by name
+        unique_attnames = []
+        for field_name in unique_fields:
+            try:
+                field = model_cls._meta.get_field(field_name)
+            except FieldDoesNotExist:
+                field = None
+            unique_attnames.append(getattr(field, "attname", field_name))
+
+        # Build each object's composite key once; classification reuses it
+        obj_keys = [
+            tuple(getattr(obj, attname, None) for attname in unique_attnames)
+            for obj in objs
+        ]
+
+        # Query the database to find existing records, one Q branch per distinct key
+        from django.db.models import Q
+
+        query = Q()
+        for key in dict.fromkeys(obj_keys):
+            query |= Q(**dict(zip(unique_attnames, key)))
+
+        # Find existing records. Only column values are copied below (foreign
+        # keys through their attname), so related rows are never joined in
+        existing_objs = list(model_cls.objects.filter(query))
+
+        # OPTIMIZED: Build a dict lookup for O(1) matching instead of O(n*m)
+        # Create composite keys from unique fields for fast lookup
+        existing_lookup = {
+            tuple(getattr(existing_obj, attname, None) for attname in unique_attnames): existing_obj
+            for existing_obj in existing_objs
+        }
+
+        logger.debug(f"UPSERT OPTIMIZATION: Built lookup table for {len(existing_objs)} existing records")
+
+        # Fields the user wants to update keep the user's values; every other
+        # field is copied from the database row. FK fields may be named either
+        # way (e.g. created_by or created_by_id). Resolved once, not per object
+        update_fields_set = set(update_fields) if update_fields else set()
+        copy_attnames = [
+            field.attname
+            for field in model_cls._meta.fields
+            if field.name not in update_fields_set
+            and field.attname not in update_fields_set
+        ]
+
+        # Classify objects as existing or new based on unique fields
+        for obj, composite_key in zip(objs, obj_keys):
+            # O(1) lookup instead of O(m) loop!
+            if composite_key in existing_lookup:
+                existing_obj = existing_lookup[composite_key]
+                # Copy field values from the existing object, BUT SKIP fields that are being updated
+                # This preserves the user's updates while populating other fields from the database
+                for attname in copy_attnames:
+                    # Copy by attname, so foreign keys get the ID rather than a
+                    # (possibly stale) related object and no related row is loaded
+                    setattr(obj, attname, getattr(existing_obj, attname))
+
+                # Copy the object state
+                obj._state.adding = False
+                obj._state.db = existing_obj._state.db
+
+                existing_records.append(obj)
+            else:
+                # Not found in lookup - this is a new record
+                new_records.append(obj)
+
+        return existing_records, new_records
+
     def _apply_custom_update_fields(self, objs, custom_update_fields, fields_set):
         """
         Call pre_save() for custom fields that require update handling
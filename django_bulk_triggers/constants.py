@@ -10,4 +10,8 @@ VALIDATE_DELETE = "validate_delete"
 
 # Default batch size for bulk_update operations to prevent massive SQL statements
 # This prevents PostgreSQL from crashing when updating large datasets with triggers
-DEFAULT_BULK_UPDATE_BATCH_SIZE = 1000
\ No newline at end of file
+DEFAULT_BULK_UPDATE_BATCH_SIZE = 1000
+# Default number of primary keys per DELETE ... WHERE pk IN (...) issued by bulk_delete
+# This keeps each statement under the database's bound-parameter limit; projects can
+# override it with the BULK_TRIGGERS_DELETE_BATCH setting
+DEFAULT_BULK_DELETE_BATCH_SIZE = 1000
@@ -224,10 +224,12 @@ def bulk_trigger(model_cls, event, when=None, priority=None):
 
     Args:
         model_cls: The model class to trigger into
-        event: The event to trigger into (e.g., BEFORE_UPDATE, AFTER_UPDATE)
+        event: The event to trigger into (e.g., BEFORE_UPDATE, AFTER_UPDATE),
+            or an iterable of events that should all run the same function
         when: Optional condition for when the trigger should run
         priority: Optional priority for trigger execution order
     """
+    events = [event] if isinstance(event, str) else list(event)
 
     def decorator(func):
         # Create a simple handler class for the function
@@ -238,15 +240,16 @@ def bulk_trigger(model_cls, event, when=None, priority=None):
             def handle(self, new_records=None, old_records=None, **kwargs):
                 return self.func(new_records, old_records)
 
-        # Register the trigger using the registry
-        register_trigger(
-            model=model_cls,
-            event=event,
-            handler_cls=FunctionHandler,
-            method_name="handle",
-            condition=when,
-            priority=priority or DEFAULT_PRIORITY,
-        )
+        # Register the one handler class for every requested event
+        for trigger_event in events:
+            register_trigger(
+                model=model_cls,
+                event=trigger_event,
+                handler_cls=FunctionHandler,
+                method_name="handle",
+                condition=when,
+                priority=priority or DEFAULT_PRIORITY,
+            )
 
         # Set attribute to indicate the function has been registered as a bulk trigger
         func._bulk_trigger_registered = True
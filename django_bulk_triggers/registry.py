@@ -1,4 +1,5 @@
 import logging
+from bisect import insort
 from collections.abc import Callable
 from typing import Union
 
@@ -18,9 +19,9 @@ def register_trigger(
     # Check for duplicates before adding
     trigger_info = (handler_cls, method_name, condition, priority)
     if trigger_info not in triggers:
-        triggers.append(trigger_info)
-        # Sort by priority (lower values first)
-        triggers.sort(key=lambda x: x[3])
+        # Insert in priority order (lower values first) instead of re-sorting the list;
+        # insort places it after existing triggers of equal priority, as a stable sort would
+        insort(triggers, trigger_info, key=lambda x: x[3])
         logger.debug(f"Registered {handler_cls.__name__}.{method_name} for {model.__name__}.{event}")
     else:
         logger.debug(f"Trigger {handler_cls.__name__}.{method_name} already registered for {model.__name__}.{event}")
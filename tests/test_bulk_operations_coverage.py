@@ -5,5442 +5,342 @@ This module contains tests specifically designed to cover the missing lines in
 django_bulk_triggers/bulk_operations.py.
 """
 
-import pytest
+from collections import Counter
 from unittest.mock import Mock, patch
-from django.test import TestCase, TransactionTestCase
-from django.db import connection
+from django.test import SimpleTestCase, TestCase
+from django.db.models import QuerySet
+from django_bulk_triggers.bulk_operations import BulkOperationsMixin, _QueryCounter
 from django_bulk_triggers.constants import (
     BEFORE_CREATE, AFTER_CREATE, VALIDATE_CREATE,
     BEFORE_UPDATE, AFTER_UPDATE, VALIDATE_UPDATE,
-    BEFORE_DELETE, AFTER_DELETE, VALIDATE_DELETE
+    BEFORE_DELETE, AFTER_DELETE,
 )
 from django_bulk_triggers.decorators import bulk_trigger
-from django_bulk_triggers.registry import clear_triggers
+from django_bulk_triggers.queryset import TriggerQuerySetMixin
+from django_bulk_triggers.registry import get_triggers, unregister_trigger
 from tests.models import TriggerModel, Category, UserModel
 
 
-class BulkOperationsCoverageTest(TestCase):
-    """Test class to cover missing lines in bulk_operations.py."""
-
-    def setUp(self):
-        """Set up test data."""
-        self.category1 = Category.objects.create(name="Test Category 1", description="First test category")
-        self.category2 = Category.objects.create(name="Test Category 2", description="Second test category")
-        self.user1 = UserModel.objects.create(username="testuser1", email="user1@test.com")
-
-    def tearDown(self):
-        """Clean up triggers after each test."""
-        clear_triggers()
-
-    def test_bulk_create_upsert_logic_with_foreign_keys(self):
-        """
-        Test bulk_create upsert logic with ForeignKey fields (covers lines 93-181).
-
-        This tests the upsert logic when update_conflicts=True and unique_fields
-        contains ForeignKey fields.
-        """
-        # Mock Django's bulk_create to avoid database-specific upsert requirements
-
-        trigger_calls = []
-
-        @bulk_trigger(TriggerModel, BEFORE_CREATE)
-        def before_create_trigger(new_instances, original_instances):
-            trigger_calls.append(('before_create', len(new_instances)))
-
-        @bulk_trigger(TriggerModel, BEFORE_UPDATE)
-        def before_update_trigger(new_instances, original_instances):
-            trigger_calls.append(('before_update', len(new_instances)))
-
-        @bulk_trigger(TriggerModel, AFTER_CREATE)
-        def after_create_trigger(new_instances, original_instances):
-            trigger_calls.append(('after_create', len(new_instances)))
-
-        @bulk_trigger(TriggerModel, AFTER_UPDATE)
-        def after_update_trigger(new_instances, original_instances):
-            trigger_calls.append(('after_update', len(new_instances)))
-
-        try:
-            # Create an existing record
-            existing_obj = TriggerModel.objects.create(
-                name="Existing Record",
-                value=100,
-                category=self.category1,
-                created_by=self.user1
-            )
-
-            # Create objects for upsert - one existing (by name), one new
-            upsert_objects = [
-                TriggerModel(
-                    name="Existing Record",  # This will update existing_obj
-                    value=999,
-                    category=self.category2,  # Different category
-                    created_by=self.user1
-                ),
-                TriggerModel(
-                    name="New Record",  # This will create new
-                    value=200,
-                    category=self.category1,
-                    created_by=self.user1
-                )
-            ]
-
-            # Mock Django's bulk_create to simulate upsert behavior
-            with patch('django.db.models.QuerySet.bulk_create') as mock_bulk_create:
-                mock_bulk_create.return_value = upsert_objects
-
-                # Perform upsert operation
-                result = TriggerModel.objects.bulk_create(
-                    upsert_objects,
-                    update_conflicts=True,
-                    update_fields=['value', 'category'],
-                    unique_fields=['name']  # Use name as unique field
-                )
-
-                # Verify the upsert classification logic was executed
-                # We should have triggers for both create and update operations
-                self.assertIn(('before_create', 1), trigger_calls)  # New object
-                self.assertIn(('before_update', 1), trigger_calls)  # Existing object
-                self.assertIn(('after_create', 1), trigger_calls)   # New object
-                self.assertIn(('after_update', 1), trigger_calls)   # Existing object
-
-        finally:
-            clear_triggers()
-
-    def test_bulk_create_upsert_no_unique_fields(self):
-        """
-        Test bulk_create upsert with no unique_fields specified (covers line 169).
-
-        This tests the case where no unique fields are provided, so all records are treated as new.
-        """
-        trigger_calls = []
-
-        @bulk_trigger(TriggerModel, BEFORE_CREATE)
-        def before_create_trigger(new_instances, original_instances):
-            trigger_calls.append(('before_create', len(new_instances)))
-
-        try:
-            # Create objects for upsert but don't specify unique_fields
-            upsert_objects = [
-                TriggerModel(name="No Unique 1", value=100, category=self.category1),
-                TriggerModel(name="No Unique 2", value=200, category=self.category2)
-            ]
-
-            # Mock Django's bulk_create to simulate successful operation
-            with patch('django.db.models.QuerySet.bulk_create') as mock_bulk_create:
-                mock_bulk_create.return_value = upsert_objects
-
-                # Perform upsert operation without unique_fields - should treat all as new
-                result = TriggerModel.objects.bulk_create(
-                    upsert_objects,
-                    update_conflicts=True,
-                    update_fields=['value']
-                    # Note: no unique_fields specified
-                )
-
-                # Verify all records were treated as new (line 169)
-                self.assertIn(('before_create', 2), trigger_calls)  # All objects treated as creates
-
-        finally:
-            clear_triggers()
-
-    def test_bulk_delete_no_valid_pks_return_zero(self):
-        """
-        Test bulk_delete when objects have no valid primary keys (covers line 306).
-
-        This tests the delete_operation function return path when no objects have valid pks.
-        """
-        from django_bulk_triggers.bulk_operations import BulkOperationsMixin
-
-        # Create a mock queryset with the mixin
-        class MockQuerySet(BulkOperationsMixin):
-            def __init__(self):
-                self.model = TriggerModel
-
-        queryset = MockQuerySet()
-
-        # Create objects with no primary keys
-        obj1 = TriggerModel(name="No PK Delete 1", value=100, category=self.category1)
-        obj2 = TriggerModel(name="No PK Delete 2", value=200, category=self.category2)
-        obj1.pk = None
-        obj2.pk = None
-
-        # Create the delete_operation function (this is the inner function from bulk_delete)
-        def delete_operation():
-            pks = [obj.pk for obj in [obj1, obj2] if obj.pk is not None]
-            if pks:
-                # Use the base manager to avoid recursion
-                return queryset.model._base_manager.filter(pk__in=pks).delete()[0]
-            else:
-                return 0  # This covers line 306
-
-        # Test the delete_operation function directly
-        result = delete_operation()
-
-        # Verify result is 0 when no objects have valid pks
-        self.assertEqual(result, 0)
-
-    def test_bulk_create_upsert_foreign_key_id_fields(self):
-        """
-        Test upsert logic with ForeignKey _id field handling (covers lines 105-106, 142, 148).
-
-        This tests the _id field handling for ForeignKey relationships in upsert classification.
-        """
-        trigger_calls = []
-
-        @bulk_trigger(TriggerModel, BEFORE_UPDATE)
-        def before_update_trigger(new_instances, original_instances):
-            trigger_calls.append(('before_update', len(new_instances)))
-
-        try:
-            # Create an existing record
-            existing_obj = TriggerModel.objects.create(
-                name="FK ID Test",
-                value=100,
-                category=self.category1,
-                created_by=self.user1
-            )
-
-            # Create upsert object with ForeignKey field set
-            upsert_obj = TriggerModel(
-                name="FK ID Test",  # Same name to match existing
-                value=200,
-                category=self.category1,
-                created_by=self.user1  # Same user
-            )
-
-            # Ensure the ForeignKey _id field is accessible
-            self.assertEqual(upsert_obj.category_id, self.category1.pk)
-            self.assertEqual(upsert_obj.created_by_id, self.user1.pk)
-
-            # Mock Django's bulk_create to simulate successful operation
-            with patch('django.db.models.QuerySet.bulk_create') as mock_bulk_create:
-                mock_bulk_create.return_value = [upsert_obj]
-
-                # Perform upsert using category as unique field (this will use _id field handling)
-                result = TriggerModel.objects.bulk_create(
-                    [upsert_obj],
-                    update_conflicts=True,
-                    update_fields=['value'],
-                    unique_fields=['category']  # Use ForeignKey as unique field
-                )
-
-                # Verify the _id field handling was executed (lines 105-106, 142, 148)
-                # This should trigger the update path since we're matching by category
-                self.assertIn(('before_update', 1), trigger_calls)
-
-        finally:
-            clear_triggers()
-
-    def test_bulk_create_upsert_logic_mock_database(self):
-        """
-        Test bulk_create upsert logic using mocks to cover lines 93-181.
-
-        This tests the upsert classification logic without requiring database upsert support.
-        """
-        trigger_calls = []
-
-        @bulk_trigger(TriggerModel, BEFORE_CREATE)
-        def before_create_trigger(new_instances, original_instances):
-            trigger_calls.append(('before_create', len(new_instances)))
-
-        @bulk_trigger(TriggerModel, BEFORE_UPDATE)
-        def before_update_trigger(new_instances, original_instances):
-            trigger_calls.append(('before_update', len(new_instances)))
-
-        @bulk_trigger(TriggerModel, VALIDATE_CREATE)
-        def validate_create_trigger(new_instances, original_instances):
-            trigger_calls.append(('validate_create', len(new_instances)))
-
-        @bulk_trigger(TriggerModel, VALIDATE_UPDATE)
-        def validate_update_trigger(new_instances, original_instances):
-            trigger_calls.append(('validate_update', len(new_instances)))
-
-        try:
-            # Create an existing record
-            existing_obj = TriggerModel.objects.create(
-                name="Existing Mock",
-                value=100,
-                category=self.category1
-            )
-
-            # Create objects for upsert - one existing (by name), one new
-            upsert_objects = [
-                TriggerModel(
-                    name="Existing Mock",  # This will be classified as existing
-                    value=999,
-                    category=self.category1
-                ),
-                TriggerModel(
-                    name="New Mock",  # This will be classified as new
-                    value=200,
-                    category=self.category2
-                )
-            ]
-
-            # Mock Django's bulk_create to avoid database-specific upsert requirements
-            with patch('django.db.models.QuerySet.bulk_create') as mock_bulk_create:
-                mock_bulk_create.return_value = upsert_objects
-
-                # Perform upsert operation - this will trigger the classification logic
-                result = TriggerModel.objects.bulk_create(
-                    upsert_objects,
-                    update_conflicts=True,
-                    update_fields=['value'],
-                    unique_fields=['name']  # Use name as unique field
-                )
-
-                # Verify the classification logic was executed
-                # We should have triggers for both create and update operations
-                self.assertIn(('validate_create', 1), trigger_calls)  # New object
-                self.assertIn(('validate_update', 1), trigger_calls)  # Existing object
-                self.assertIn(('before_create', 1), trigger_calls)    # New object
-                self.assertIn(('before_update', 1), trigger_calls)    # Existing object
-
-        finally:
-            clear_triggers()
-
-    def test_bulk_create_upsert_no_unique_fields(self):
-        """
-        Test bulk_create upsert with no unique_fields specified (covers line 169).
-
-        This tests the case where no unique fields are provided, so all records are treated as new.
-        """
-        trigger_calls = []
-
-        @bulk_trigger(TriggerModel, BEFORE_CREATE)
-        def before_create_trigger(new_instances, original_instances):
-            trigger_calls.append(('before_create', len(new_instances)))
-
-        try:
-            # Create objects for upsert but don't specify unique_fields
-            upsert_objects = [
-                TriggerModel(name="No Unique 1", value=100, category=self.category1),
-                TriggerModel(name="No Unique 2", value=200, category=self.category2)
-            ]
-
-            # Mock Django's bulk_create to simulate successful operation
-            with patch('django.db.models.QuerySet.bulk_create') as mock_bulk_create:
-                mock_bulk_create.return_value = upsert_objects
-
-                # Perform upsert operation without unique_fields - should treat all as new
-                result = TriggerModel.objects.bulk_create(
-                    upsert_objects,
-                    update_conflicts=True,
-                    update_fields=['value']
-                    # Note: no unique_fields specified
-                )
-
-                # Verify all records were treated as new (line 169)
-                self.assertIn(('before_create', 2), trigger_calls)  # All objects treated as creates
-
-        finally:
-            clear_triggers()
-
-    def test_bulk_delete_no_valid_pks_return_zero(self):
-        """
-        Test bulk_delete when objects have no valid primary keys (covers line 306).
-
-        This tests the delete_operation function return path when no objects have valid pks.
-        """
-        from django_bulk_triggers.bulk_operations import BulkOperationsMixin
-
-        # Create a mock queryset with the mixin
-        class MockQuerySet(BulkOperationsMixin):
-            def __init__(self):
-                self.model = TriggerModel
-
-        queryset = MockQuerySet()
-
-        # Create objects with no primary keys
-        obj1 = TriggerModel(name="No PK Delete 1", value=100, category=self.category1)
-        obj2 = TriggerModel(name="No PK Delete 2", value=200, category=self.category2)
-        obj1.pk = None
-        obj2.pk = None
-
-        # Create the delete_operation function (this is the inner function from bulk_delete)
-        def delete_operation():
-            pks = [obj.pk for obj in [obj1, obj2] if obj.pk is not None]
-            if pks:
-                # Use the base manager to avoid recursion
-                return queryset.model._base_manager.filter(pk__in=pks).delete()[0]
-            else:
-                return 0  # This covers line 306
-
-        # Test the delete_operation function directly
-        result = delete_operation()
-
-        # Verify result is 0 when no objects have valid pks
-        self.assertEqual(result, 0)
-
-    def test_bulk_create_upsert_foreign_key_id_fields(self):
-        """
-        Test upsert logic with ForeignKey _id field handling (covers lines 105-106, 142, 148).
-
-        This tests the _id field handling for ForeignKey relationships in upsert classification.
-        """
-        trigger_calls = []
-
-        @bulk_trigger(TriggerModel, BEFORE_UPDATE)
-        def before_update_trigger(new_instances, original_instances):
-            trigger_calls.append(('before_update', len(new_instances)))
-
-        try:
-            # Create an existing record
-            existing_obj = TriggerModel.objects.create(
-                name="FK ID Test",
-                value=100,
-                category=self.category1,
-                created_by=self.user1
-            )
-
-            # Create upsert object with ForeignKey field set
-            upsert_obj = TriggerModel(
-                name="FK ID Test",  # Same name to match existing
-                value=200,
-                category=self.category1,
-                created_by=self.user1  # Same user
-            )
-
-            # Ensure the ForeignKey _id field is accessible
-            self.assertEqual(upsert_obj.category_id, self.category1.pk)
-            self.assertEqual(upsert_obj.created_by_id, self.user1.pk)
-
-            # Mock Django's bulk_create to simulate successful operation
-            with patch('django.db.models.QuerySet.bulk_create') as mock_bulk_create:
-                mock_bulk_create.return_value = [upsert_obj]
-
-                # Perform upsert using category as unique field (this will use _id field handling)
-                result = TriggerModel.objects.bulk_create(
-                    [upsert_obj],
-                    update_conflicts=True,
-                    update_fields=['value'],
-                    unique_fields=['category']  # Use ForeignKey as unique field
-                )
-
-                # Verify the _id field handling was executed (lines 105-106, 142, 148)
-                # This should trigger the update path since we're matching by category
-                self.assertIn(('before_update', 1), trigger_calls)
-
-        finally:
-            clear_triggers()
-
-    def test_bulk_create_after_triggers_upsert_mock(self):
-        """
-        Test AFTER triggers for upsert operations using mocks (covers lines 240-241).
-
-        This specifically tests the AFTER trigger logic for mixed create/update operations.
-        """
-        trigger_calls = []
-
-        @bulk_trigger(TriggerModel, AFTER_CREATE)
-        def after_create_trigger(new_instances, original_instances):
-            trigger_calls.append(('after_create', len(new_instances)))
-
-        @bulk_trigger(TriggerModel, AFTER_UPDATE)
-        def after_update_trigger(new_instances, original_instances):
-            trigger_calls.append(('after_update', len(new_instances)))
-
-        try:
-            # Create an existing record
-            existing_obj = TriggerModel.objects.create(
-                name="Existing After Test",
-                value=100,
-                category=self.category1
-            )
-
-            # Create objects for upsert
-            upsert_objects = [
-                TriggerModel(name="Existing After Test", value=200, category=self.category1),  # Update
-                TriggerModel(name="New After Test", value=300, category=self.category2)        # Create
-            ]
-
-            # Mock Django's bulk_create to simulate successful operation
-            with patch('django.db.models.QuerySet.bulk_create') as mock_bulk_create:
-                mock_bulk_create.return_value = upsert_objects
-
-                # Perform upsert - this should trigger AFTER triggers for both operations
-                result = TriggerModel.objects.bulk_create(
-                    upsert_objects,
-                    update_conflicts=True,
-                    update_fields=['value'],
-                    unique_fields=['name']
-                )
-
-                # Verify AFTER triggers were called for both operations
-                self.assertIn(('after_create', 1), trigger_calls)  # New record
-                self.assertIn(('after_update', 1), trigger_calls)  # Existing record
-
-        finally:
-            clear_triggers()
-
-    def test_bulk_create_upsert_no_unique_fields(self):
-        """
-        Test bulk_create upsert with no unique_fields specified (covers line 169).
-
-        This tests the case where no unique fields are provided, so all records are treated as new.
-        """
-        trigger_calls = []
-
-        @bulk_trigger(TriggerModel, BEFORE_CREATE)
-        def before_create_trigger(new_instances, original_instances):
-            trigger_calls.append(('before_create', len(new_instances)))
-
-        try:
-            # Create objects for upsert but don't specify unique_fields
-            upsert_objects = [
-                TriggerModel(name="No Unique 1", value=100, category=self.category1),
-                TriggerModel(name="No Unique 2", value=200, category=self.category2)
-            ]
-
-            # Mock Django's bulk_create to simulate successful operation
-            with patch('django.db.models.QuerySet.bulk_create') as mock_bulk_create:
-                mock_bulk_create.return_value = upsert_objects
-
-                # Perform upsert operation without unique_fields - should treat all as new
-                result = TriggerModel.objects.bulk_create(
-                    upsert_objects,
-                    update_conflicts=True,
-                    update_fields=['value']
-                    # Note: no unique_fields specified
-                )
-
-                # Verify all records were treated as new (line 169)
-                self.assertIn(('before_create', 2), trigger_calls)  # All objects treated as creates
-
-        finally:
-            clear_triggers()
-
-    def test_bulk_delete_no_valid_pks_return_zero(self):
-        """
-        Test bulk_delete when objects have no valid primary keys (covers line 306).
-
-        This tests the delete_operation function return path when no objects have valid pks.
-        """
-        from django_bulk_triggers.bulk_operations import BulkOperationsMixin
-
-        # Create a mock queryset with the mixin
-        class MockQuerySet(BulkOperationsMixin):
-            def __init__(self):
-                self.model = TriggerModel
-
-        queryset = MockQuerySet()
-
-        # Create objects with no primary keys
-        obj1 = TriggerModel(name="No PK Delete 1", value=100, category=self.category1)
-        obj2 = TriggerModel(name="No PK Delete 2", value=200, category=self.category2)
-        obj1.pk = None
-        obj2.pk = None
-
-        # Create the delete_operation function (this is the inner function from bulk_delete)
-        def delete_operation():
-            pks = [obj.pk for obj in [obj1, obj2] if obj.pk is not None]
-            if pks:
-                # Use the base manager to avoid recursion
-                return queryset.model._base_manager.filter(pk__in=pks).delete()[0]
-            else:
-                return 0  # This covers line 306
-
-        # Test the delete_operation function directly
-        result = delete_operation()
-
-        # Verify result is 0 when no objects have valid pks
-        self.assertEqual(result, 0)
-
-    def test_bulk_create_upsert_foreign_key_id_fields(self):
-        """
-        Test upsert logic with ForeignKey _id field handling (covers lines 105-106, 142, 148).
-
-        This tests the _id field handling for ForeignKey relationships in upsert classification.
-        """
-        trigger_calls = []
-
-        @bulk_trigger(TriggerModel, BEFORE_UPDATE)
-        def before_update_trigger(new_instances, original_instances):
-            trigger_calls.append(('before_update', len(new_instances)))
-
-        try:
-            # Create an existing record
-            existing_obj = TriggerModel.objects.create(
-                name="FK ID Test",
-                value=100,
-                category=self.category1,
-                created_by=self.user1
-            )
-
-            # Create upsert object with ForeignKey field set
-            upsert_obj = TriggerModel(
-                name="FK ID Test",  # Same name to match existing
-                value=200,
-                category=self.category1,
-                created_by=self.user1  # Same user
-            )
-
-            # Ensure the ForeignKey _id field is accessible
-            self.assertEqual(upsert_obj.category_id, self.category1.pk)
-            self.assertEqual(upsert_obj.created_by_id, self.user1.pk)
-
-            # Mock Django's bulk_create to simulate successful operation
-            with patch('django.db.models.QuerySet.bulk_create') as mock_bulk_create:
-                mock_bulk_create.return_value = [upsert_obj]
-
-                # Perform upsert using category as unique field (this will use _id field handling)
-                result = TriggerModel.objects.bulk_create(
-                    [upsert_obj],
-                    update_conflicts=True,
-                    update_fields=['value'],
-                    unique_fields=['category']  # Use ForeignKey as unique field
-                )
-
-                # Verify the _id field handling was executed (lines 105-106, 142, 148)
-                # This should trigger the update path since we're matching by category
-                self.assertIn(('before_update', 1), trigger_calls)
-
-        finally:
-            clear_triggers()
-
-    def test_bulk_create_mti_path_mock(self):
-        """
-        Test MTI bulk_create path using mocks (covers line 192).
-
-        This tests the MTI branch in bulk_create when update_conflicts=True.
-        """
-        trigger_calls = []
-
-        @bulk_trigger(TriggerModel, BEFORE_CREATE)
-        def before_create_trigger(new_instances, original_instances):
-            trigger_calls.append(('before_create', len(new_instances)))
-
-        try:
-            # Mock _is_multi_table_inheritance to return True
-            with patch('django_bulk_triggers.queryset.TriggerQuerySetMixin._is_multi_table_inheritance', return_value=True):
-                # Mock _mti_bulk_create to track calls
-                with patch('django_bulk_triggers.queryset.TriggerQuerySetMixin._mti_bulk_create') as mock_mti_create:
-                    mock_mti_create.return_value = [
-                        TriggerModel(name="MTI Mock Test 1", value=100, category=self.category1),
-                        TriggerModel(name="MTI Mock Test 2", value=200, category=self.category2)
-                    ]
-
-                    upsert_objects = [
-                        TriggerModel(name="MTI Mock Test 1", value=100, category=self.category1),
-                        TriggerModel(name="MTI Mock Test 2", value=200, category=self.category2)
-                    ]
-
-                    # This should call the MTI path with upsert parameters
-                    result = TriggerModel.objects.bulk_create(
-                        upsert_objects,
-                        update_conflicts=True,
-                        update_fields=['value'],
-                        unique_fields=['name']
-                    )
-
-                    # Verify _mti_bulk_create was called with upsert parameters
-                    mock_mti_create.assert_called_once()
-                    call_args = mock_mti_create.call_args
-                    self.assertEqual(call_args[0][0], upsert_objects)  # First arg is objects
-                    self.assertIn('existing_records', call_args[1])
-                    self.assertIn('new_records', call_args[1])
-                    self.assertEqual(call_args[1]['update_conflicts'], True)
-                    self.assertEqual(call_args[1]['unique_fields'], ['name'])
-
-        finally:
-            clear_triggers()
-
-    def test_bulk_create_upsert_no_unique_fields(self):
-        """
-        Test bulk_create upsert with no unique_fields specified (covers line 169).
-
-        This tests the case where no unique fields are provided, so all records are treated as new.
-        """
-        trigger_calls = []
-
-        @bulk_trigger(TriggerModel, BEFORE_CREATE)
-        def before_create_trigger(new_instances, original_instances):
-            trigger_calls.append(('before_create', len(new_instances)))
-
-        try:
-            # Create objects for upsert but don't specify unique_fields
-            upsert_objects = [
-                TriggerModel(name="No Unique 1", value=100, category=self.category1),
-                TriggerModel(name="No Unique 2", value=200, category=self.category2)
-            ]
-
-            # Mock Django's bulk_create to simulate successful operation
-            with patch('django.db.models.QuerySet.bulk_create') as mock_bulk_create:
-                mock_bulk_create.return_value = upsert_objects
-
-                # Perform upsert operation without unique_fields - should treat all as new
-                result = TriggerModel.objects.bulk_create(
-                    upsert_objects,
-                    update_conflicts=True,
-                    update_fields=['value']
-                    # Note: no unique_fields specified
-                )
-
-                # Verify all records were treated as new (line 169)
-                self.assertIn(('before_create', 2), trigger_calls)  # All objects treated as creates
-
-        finally:
-            clear_triggers()
-
-    def test_bulk_delete_no_valid_pks_return_zero(self):
-        """
-        Test bulk_delete when objects have no valid primary keys (covers line 306).
-
-        This tests the delete_operation function return path when no objects have valid pks.
-        """
-        from django_bulk_triggers.bulk_operations import BulkOperationsMixin
-
-        # Create a mock queryset with the mixin
-        class MockQuerySet(BulkOperationsMixin):
-            def __init__(self):
-                self.model = TriggerModel
-
-        queryset = MockQuerySet()
-
-        # Create objects with no primary keys
-        obj1 = TriggerModel(name="No PK Delete 1", value=100, category=self.category1)
-        obj2 = TriggerModel(name="No PK Delete 2", value=200, category=self.category2)
-        obj1.pk = None
-        obj2.pk = None
-
-        # Create the delete_operation function (this is the inner function from bulk_delete)
-        def delete_operation():
-            pks = [obj.pk for obj in [obj1, obj2] if obj.pk is not None]
-            if pks:
-                # Use the base manager to avoid recursion
-                return queryset.model._base_manager.filter(pk__in=pks).delete()[0]
-            else:
-                return 0  # This covers line 306
-
-        # Test the delete_operation function directly
-        result = delete_operation()
-
-        # Verify result is 0 when no objects have valid pks
-        self.assertEqual(result, 0)
-
-    def test_bulk_create_upsert_foreign_key_id_fields(self):
-        """
-        Test upsert logic with ForeignKey _id field handling (covers lines 105-106, 142, 148).
-
-        This tests the _id field handling for ForeignKey relationships in upsert classification.
-        """
-        trigger_calls = []
-
-        @bulk_trigger(TriggerModel, BEFORE_UPDATE)
-        def before_update_trigger(new_instances, original_instances):
-            trigger_calls.append(('before_update', len(new_instances)))
-
-        try:
-            # Create an existing record
-            existing_obj = TriggerModel.objects.create(
-                name="FK ID Test",
-                value=100,
-                category=self.category1,
-                created_by=self.user1
-            )
-
-            # Create upsert object with ForeignKey field set
-            upsert_obj = TriggerModel(
-                name="FK ID Test",  # Same name to match existing
-                value=200,
-                category=self.category1,
-                created_by=self.user1  # Same user
-            )
-
-            # Ensure the ForeignKey _id field is accessible
-            self.assertEqual(upsert_obj.category_id, self.category1.pk)
-            self.assertEqual(upsert_obj.created_by_id, self.user1.pk)
-
-            # Mock Django's bulk_create to simulate successful operation
-            with patch('django.db.models.QuerySet.bulk_create') as mock_bulk_create:
-                mock_bulk_create.return_value = [upsert_obj]
-
-                # Perform upsert using category as unique field (this will use _id field handling)
-                result = TriggerModel.objects.bulk_create(
-                    [upsert_obj],
-                    update_conflicts=True,
-                    update_fields=['value'],
-                    unique_fields=['category']  # Use ForeignKey as unique field
-                )
-
-                # Verify the _id field handling was executed (lines 105-106, 142, 148)
-                # This should trigger the update path since we're matching by category
-                self.assertIn(('before_update', 1), trigger_calls)
-
-        finally:
-            clear_triggers()
-
-    def test_bulk_create_upsert_after_triggers_mixed(self):
-        """
-        Test AFTER triggers for upsert operations with both created and updated records (lines 240-241).
-
-        This specifically tests the case where both existing_records and new_records exist.
-        """
-        # Mock Django's bulk_create to avoid database-specific upsert requirements
-
-        trigger_calls = []
-
-        @bulk_trigger(TriggerModel, AFTER_CREATE)
-        def after_create_trigger(new_instances, original_instances):
-            trigger_calls.append(('after_create', len(new_instances)))
-
-        @bulk_trigger(TriggerModel, AFTER_UPDATE)
-        def after_update_trigger(new_instances, original_instances):
-            trigger_calls.append(('after_update', len(new_instances)))
-
-        try:
-            # Create an existing record
-            existing_obj = TriggerModel.objects.create(
-                name="Mixed Upsert Test",
-                value=100,
-                category=self.category1
-            )
-
-            # Create objects for upsert
-            upsert_objects = [
-                TriggerModel(name="Mixed Upsert Test", value=200, category=self.category1),  # Update
-                TriggerModel(name="New Mixed Test", value=300, category=self.category2)      # Create
-            ]
-
-            # Mock Django's bulk_create to simulate upsert behavior
-            with patch('django.db.models.QuerySet.bulk_create') as mock_bulk_create:
-                mock_bulk_create.return_value = upsert_objects
-
-                # Perform upsert
-                result = TriggerModel.objects.bulk_create(
-                    upsert_objects,
-                    update_conflicts=True,
-                    update_fields=['value'],
-                    unique_fields=['name']
-                )
-
-                # Verify AFTER triggers were called for both operations
-                self.assertIn(('after_create', 1), trigger_calls)  # New record
-                self.assertIn(('after_update', 1), trigger_calls)  # Existing record
-
-        finally:
-            clear_triggers()
-
-    def test_bulk_create_upsert_no_unique_fields(self):
-        """
-        Test bulk_create upsert with no unique_fields specified (covers line 169).
-
-        This tests the case where no unique fields are provided, so all records are treated as new.
-        """
-        trigger_calls = []
-
-        @bulk_trigger(TriggerModel, BEFORE_CREATE)
-        def before_create_trigger(new_instances, original_instances):
-            trigger_calls.append(('before_create', len(new_instances)))
-
-        try:
-            # Create objects for upsert but don't specify unique_fields
-            upsert_objects = [
-                TriggerModel(name="No Unique 1", value=100, category=self.category1),
-                TriggerModel(name="No Unique 2", value=200, category=self.category2)
-            ]
-
-            # Mock Django's bulk_create to simulate successful operation
-            with patch('django.db.models.QuerySet.bulk_create') as mock_bulk_create:
-                mock_bulk_create.return_value = upsert_objects
-
-                # Perform upsert operation without unique_fields - should treat all as new
-                result = TriggerModel.objects.bulk_create(
-                    upsert_objects,
-                    update_conflicts=True,
-                    update_fields=['value']
-                    # Note: no unique_fields specified
-                )
-
-                # Verify all records were treated as new (line 169)
-                self.assertIn(('before_create', 2), trigger_calls)  # All objects treated as creates
-
-        finally:
-            clear_triggers()
-
-    def test_bulk_delete_no_valid_pks_return_zero(self):
-        """
-        Test bulk_delete when objects have no valid primary keys (covers line 306).
-
-        This tests the delete_operation function return path when no objects have valid pks.
-        """
-        from django_bulk_triggers.bulk_operations import BulkOperationsMixin
-
-        # Create a mock queryset with the mixin
-        class MockQuerySet(BulkOperationsMixin):
-            def __init__(self):
-                self.model = TriggerModel
-
-        queryset = MockQuerySet()
-
-        # Create objects with no primary keys
-        obj1 = TriggerModel(name="No PK Delete 1", value=100, category=self.category1)
-        obj2 = TriggerModel(name="No PK Delete 2", value=200, category=self.category2)
-        obj1.pk = None
-        obj2.pk = None
-
-        # Create the delete_operation function (this is the inner function from bulk_delete)
-        def delete_operation():
-            pks = [obj.pk for obj in [obj1, obj2] if obj.pk is not None]
-            if pks:
-                # Use the base manager to avoid recursion
-                return queryset.model._base_manager.filter(pk__in=pks).delete()[0]
-            else:
-                return 0  # This covers line 306
-
-        # Test the delete_operation function directly
-        result = delete_operation()
-
-        # Verify result is 0 when no objects have valid pks
-        self.assertEqual(result, 0)
-
-    def test_bulk_create_upsert_foreign_key_id_fields(self):
-        """
-        Test upsert logic with ForeignKey _id field handling (covers lines 105-106, 142, 148).
-
-        This tests the _id field handling for ForeignKey relationships in upsert classification.
-        """
-        trigger_calls = []
-
-        @bulk_trigger(TriggerModel, BEFORE_UPDATE)
-        def before_update_trigger(new_instances, original_instances):
-            trigger_calls.append(('before_update', len(new_instances)))
-
-        try:
-            # Create an existing record
-            existing_obj = TriggerModel.objects.create(
-                name="FK ID Test",
-                value=100,
-                category=self.category1,
-                created_by=self.user1
-            )
-
-            # Create upsert object with ForeignKey field set
-            upsert_obj = TriggerModel(
-                name="FK ID Test",  # Same name to match existing
-                value=200,
-                category=self.category1,
-                created_by=self.user1  # Same user
-            )
-
-            # Ensure the ForeignKey _id field is accessible
-            self.assertEqual(upsert_obj.category_id, self.category1.pk)
-            self.assertEqual(upsert_obj.created_by_id, self.user1.pk)
-
-            # Mock Django's bulk_create to simulate successful operation
-            with patch('django.db.models.QuerySet.bulk_create') as mock_bulk_create:
-                mock_bulk_create.return_value = [upsert_obj]
-
-                # Perform upsert using category as unique field (this will use _id field handling)
-                result = TriggerModel.objects.bulk_create(
-                    [upsert_obj],
-                    update_conflicts=True,
-                    update_fields=['value'],
-                    unique_fields=['category']  # Use ForeignKey as unique field
-                )
-
-                # Verify the _id field handling was executed (lines 105-106, 142, 148)
-                # This should trigger the update path since we're matching by category
-                self.assertIn(('before_update', 1), trigger_calls)
-
-        finally:
-            clear_triggers()
-
-    def test_bulk_create_upsert_logic_mock_database(self):
-        """
-        Test bulk_create upsert logic using mocks to cover lines 93-181.
-
-        This tests the upsert classification logic without requiring database upsert support.
-        """
-        trigger_calls = []
-
-        @bulk_trigger(TriggerModel, BEFORE_CREATE)
-        def before_create_trigger(new_instances, original_instances):
-            trigger_calls.append(('before_create', len(new_instances)))
-
-        @bulk_trigger(TriggerModel, BEFORE_UPDATE)
-        def before_update_trigger(new_instances, original_instances):
-            trigger_calls.append(('before_update', len(new_instances)))
-
-        @bulk_trigger(TriggerModel, VALIDATE_CREATE)
-        def validate_create_trigger(new_instances, original_instances):
-            trigger_calls.append(('validate_create', len(new_instances)))
-
-        @bulk_trigger(TriggerModel, VALIDATE_UPDATE)
-        def validate_update_trigger(new_instances, original_instances):
-            trigger_calls.append(('validate_update', len(new_instances)))
-
-        try:
-            # Create an existing record
-            existing_obj = TriggerModel.objects.create(
-                name="Existing Mock",
-                value=100,
-                category=self.category1
-            )
-
-            # Create objects for upsert - one existing (by name), one new
-            upsert_objects = [
-                TriggerModel(
-                    name="Existing Mock",  # This will be classified as existing
-                    value=999,
-                    category=self.category1
-                ),
-                TriggerModel(
-                    name="New Mock",  # This will be classified as new
-                    value=200,
-                    category=self.category2
-                )
-            ]
-
-            # Mock Django's bulk_create to avoid database-specific upsert requirements
-            with patch('django.db.models.QuerySet.bulk_create') as mock_bulk_create:
-                mock_bulk_create.return_value = upsert_objects
-
-                # Perform upsert operation - this will trigger the classification logic
-                result = TriggerModel.objects.bulk_create(
-                    upsert_objects,
-                    update_conflicts=True,
-                    update_fields=['value'],
-                    unique_fields=['name']  # Use name as unique field
-                )
-
-                # Verify the classification logic was executed
-                # We should have triggers for both create and update operations
-                self.assertIn(('validate_create', 1), trigger_calls)  # New object
-                self.assertIn(('validate_update', 1), trigger_calls)  # Existing object
-                self.assertIn(('before_create', 1), trigger_calls)    # New object
-                self.assertIn(('before_update', 1), trigger_calls)    # Existing object
-
-        finally:
-            clear_triggers()
-
-    def test_bulk_create_upsert_no_unique_fields(self):
-        """
-        Test bulk_create upsert with no unique_fields specified (covers line 169).
-
-        This tests the case where no unique fields are provided, so all records are treated as new.
-        """
-        trigger_calls = []
-
-        @bulk_trigger(TriggerModel, BEFORE_CREATE)
-        def before_create_trigger(new_instances, original_instances):
-            trigger_calls.append(('before_create', len(new_instances)))
-
-        try:
-            # Create objects for upsert but don't specify unique_fields
-            upsert_objects = [
-                TriggerModel(name="No Unique 1", value=100, category=self.category1),
-                TriggerModel(name="No Unique 2", value=200, category=self.category2)
-            ]
-
-            # Mock Django's bulk_create to simulate successful operation
-            with patch('django.db.models.QuerySet.bulk_create') as mock_bulk_create:
-                mock_bulk_create.return_value = upsert_objects
-
-                # Perform upsert operation without unique_fields - should treat all as new
-                result = TriggerModel.objects.bulk_create(
-                    upsert_objects,
-                    update_conflicts=True,
-                    update_fields=['value']
-                    # Note: no unique_fields specified
-                )
-
-                # Verify all records were treated as new (line 169)
-                self.assertIn(('before_create', 2), trigger_calls)  # All objects treated as creates
-
-        finally:
-            clear_triggers()
-
-    def test_bulk_delete_no_valid_pks_return_zero(self):
-        """
-        Test bulk_delete when objects have no valid primary keys (covers line 306).
-
-        This tests the delete_operation function return path when no objects have valid pks.
-        """
-        from django_bulk_triggers.bulk_operations import BulkOperationsMixin
-
-        # Create a mock queryset with the mixin
-        class MockQuerySet(BulkOperationsMixin):
-            def __init__(self):
-                self.model = TriggerModel
-
-        queryset = MockQuerySet()
-
-        # Create objects with no primary keys
-        obj1 = TriggerModel(name="No PK Delete 1", value=100, category=self.category1)
-        obj2 = TriggerModel(name="No PK Delete 2", value=200, category=self.category2)
-        obj1.pk = None
-        obj2.pk = None
-
-        # Create the delete_operation function (this is the inner function from bulk_delete)
-        def delete_operation():
-            pks = [obj.pk for obj in [obj1, obj2] if obj.pk is not None]
-            if pks:
-                # Use the base manager to avoid recursion
-                return queryset.model._base_manager.filter(pk__in=pks).delete()[0]
-            else:
-                return 0  # This covers line 306
-
-        # Test the delete_operation function directly
-        result = delete_operation()
-
-        # Verify result is 0 when no objects have valid pks
-        self.assertEqual(result, 0)
-
-    def test_bulk_create_upsert_foreign_key_id_fields(self):
-        """
-        Test upsert logic with ForeignKey _id field handling (covers lines 105-106, 142, 148).
-
-        This tests the _id field handling for ForeignKey relationships in upsert classification.
-        """
-        trigger_calls = []
-
-        @bulk_trigger(TriggerModel, BEFORE_UPDATE)
-        def before_update_trigger(new_instances, original_instances):
-            trigger_calls.append(('before_update', len(new_instances)))
-
-        try:
-            # Create an existing record
-            existing_obj = TriggerModel.objects.create(
-                name="FK ID Test",
-                value=100,
-                category=self.category1,
-                created_by=self.user1
-            )
-
-            # Create upsert object with ForeignKey field set
-            upsert_obj = TriggerModel(
-                name="FK ID Test",  # Same name to match existing
-                value=200,
-                category=self.category1,
-                created_by=self.user1  # Same user
-            )
-
-            # Ensure the ForeignKey _id field is accessible
-            self.assertEqual(upsert_obj.category_id, self.category1.pk)
-            self.assertEqual(upsert_obj.created_by_id, self.user1.pk)
-
-            # Mock Django's bulk_create to simulate successful operation
-            with patch('django.db.models.QuerySet.bulk_create') as mock_bulk_create:
-                mock_bulk_create.return_value = [upsert_obj]
-
-                # Perform upsert using category as unique field (this will use _id field handling)
-                result = TriggerModel.objects.bulk_create(
-                    [upsert_obj],
-                    update_conflicts=True,
-                    update_fields=['value'],
-                    unique_fields=['category']  # Use ForeignKey as unique field
-                )
-
-                # Verify the _id field handling was executed (lines 105-106, 142, 148)
-                # This should trigger the update path since we're matching by category
-                self.assertIn(('before_update', 1), trigger_calls)
-
-        finally:
-            clear_triggers()
-
-    def test_bulk_create_after_triggers_upsert_mock(self):
-        """
-        Test AFTER triggers for upsert operations using mocks (covers lines 240-241).
-
-        This specifically tests the AFTER trigger logic for mixed create/update operations.
-        """
-        trigger_calls = []
-
-        @bulk_trigger(TriggerModel, AFTER_CREATE)
-        def after_create_trigger(new_instances, original_instances):
-            trigger_calls.append(('after_create', len(new_instances)))
-
-        @bulk_trigger(TriggerModel, AFTER_UPDATE)
-        def after_update_trigger(new_instances, original_instances):
-            trigger_calls.append(('after_update', len(new_instances)))
-
-        try:
-            # Create an existing record
-            existing_obj = TriggerModel.objects.create(
-                name="Existing After Test",
-                value=100,
-                category=self.category1
-            )
-
-            # Create objects for upsert
-            upsert_objects = [
-                TriggerModel(name="Existing After Test", value=200, category=self.category1),  # Update
-                TriggerModel(name="New After Test", value=300, category=self.category2)        # Create
-            ]
-
-            # Mock Django's bulk_create to simulate successful operation
-            with patch('django.db.models.QuerySet.bulk_create') as mock_bulk_create:
-                mock_bulk_create.return_value = upsert_objects
-
-                # Perform upsert - this should trigger AFTER triggers for both operations
-                result = TriggerModel.objects.bulk_create(
-                    upsert_objects,
-                    update_conflicts=True,
-                    update_fields=['value'],
-                    unique_fields=['name']
-                )
-
-                # Verify AFTER triggers were called for both operations
-                self.assertIn(('after_create', 1), trigger_calls)  # New record
-                self.assertIn(('after_update', 1), trigger_calls)  # Existing record
-
-        finally:
-            clear_triggers()
-
-    def test_bulk_create_upsert_no_unique_fields(self):
-        """
-        Test bulk_create upsert with no unique_fields specified (covers line 169).
-
-        This tests the case where no unique fields are provided, so all records are treated as new.
-        """
-        trigger_calls = []
-
-        @bulk_trigger(TriggerModel, BEFORE_CREATE)
-        def before_create_trigger(new_instances, original_instances):
-            trigger_calls.append(('before_create', len(new_instances)))
-
-        try:
-            # Create objects for upsert but don't specify unique_fields
-            upsert_objects = [
-                TriggerModel(name="No Unique 1", value=100, category=self.category1),
-                TriggerModel(name="No Unique 2", value=200, category=self.category2)
-            ]
-
-            # Mock Django's bulk_create to simulate successful operation
-            with patch('django.db.models.QuerySet.bulk_create') as mock_bulk_create:
-                mock_bulk_create.return_value = upsert_objects
-
-                # Perform upsert operation without unique_fields - should treat all as new
-                result = TriggerModel.objects.bulk_create(
-                    upsert_objects,
-                    update_conflicts=True,
-                    update_fields=['value']
-                    # Note: no unique_fields specified
-                )
-
-                # Verify all records were treated as new (line 169)
-                self.assertIn(('before_create', 2), trigger_calls)  # All objects treated as creates
-
-        finally:
-            clear_triggers()
-
-    def test_bulk_delete_no_valid_pks_return_zero(self):
-        """
-        Test bulk_delete when objects have no valid primary keys (covers line 306).
-
-        This tests the delete_operation function return path when no objects have valid pks.
-        """
-        from django_bulk_triggers.bulk_operations import BulkOperationsMixin
-
-        # Create a mock queryset with the mixin
-        class MockQuerySet(BulkOperationsMixin):
-            def __init__(self):
-                self.model = TriggerModel
-
-        queryset = MockQuerySet()
-
-        # Create objects with no primary keys
-        obj1 = TriggerModel(name="No PK Delete 1", value=100, category=self.category1)
-        obj2 = TriggerModel(name="No PK Delete 2", value=200, category=self.category2)
-        obj1.pk = None
-        obj2.pk = None
-
-        # Create the delete_operation function (this is the inner function from bulk_delete)
-        def delete_operation():
-            pks = [obj.pk for obj in [obj1, obj2] if obj.pk is not None]
-            if pks:
-                # Use the base manager to avoid recursion
-                return queryset.model._base_manager.filter(pk__in=pks).delete()[0]
-            else:
-                return 0  # This covers line 306
-
-        # Test the delete_operation function directly
-        result = delete_operation()
-
-        # Verify result is 0 when no objects have valid pks
-        self.assertEqual(result, 0)
-
-    def test_bulk_create_upsert_foreign_key_id_fields(self):
-        """
-        Test upsert logic with ForeignKey _id field handling (covers lines 105-106, 142, 148).
-
-        This tests the _id field handling for ForeignKey relationships in upsert classification.
-        """
-        trigger_calls = []
-
-        @bulk_trigger(TriggerModel, BEFORE_UPDATE)
-        def before_update_trigger(new_instances, original_instances):
-            trigger_calls.append(('before_update', len(new_instances)))
-
-        try:
-            # Create an existing record
-            existing_obj = TriggerModel.objects.create(
-                name="FK ID Test",
-                value=100,
-                category=self.category1,
-                created_by=self.user1
-            )
-
-            # Create upsert object with ForeignKey field set
-            upsert_obj = TriggerModel(
-                name="FK ID Test",  # Same name to match existing
-                value=200,
-                category=self.category1,
-                created_by=self.user1  # Same user
-            )
-
-            # Ensure the ForeignKey _id field is accessible
-            self.assertEqual(upsert_obj.category_id, self.category1.pk)
-            self.assertEqual(upsert_obj.created_by_id, self.user1.pk)
-
-            # Mock Django's bulk_create to simulate successful operation
-            with patch('django.db.models.QuerySet.bulk_create') as mock_bulk_create:
-                mock_bulk_create.return_value = [upsert_obj]
-
-                # Perform upsert using category as unique field (this will use _id field handling)
-                result = TriggerModel.objects.bulk_create(
-                    [upsert_obj],
-                    update_conflicts=True,
-                    update_fields=['value'],
-                    unique_fields=['category']  # Use ForeignKey as unique field
-                )
-
-                # Verify the _id field handling was executed (lines 105-106, 142, 148)
-                # This should trigger the update path since we're matching by category
-                self.assertIn(('before_update', 1), trigger_calls)
-
-        finally:
-            clear_triggers()
-
-    def test_bulk_create_mti_path_mock(self):
-        """
-        Test MTI bulk_create path using mocks (covers line 192).
-
-        This tests the MTI branch in bulk_create when update_conflicts=True.
-        """
-        trigger_calls = []
-
-        @bulk_trigger(TriggerModel, BEFORE_CREATE)
-        def before_create_trigger(new_instances, original_instances):
-            trigger_calls.append(('before_create', len(new_instances)))
-
-        try:
-            # Mock _is_multi_table_inheritance to return True
-            with patch('django_bulk_triggers.queryset.TriggerQuerySetMixin._is_multi_table_inheritance', return_value=True):
-                # Mock _mti_bulk_create to track calls
-                with patch('django_bulk_triggers.queryset.TriggerQuerySetMixin._mti_bulk_create') as mock_mti_create:
-                    mock_mti_create.return_value = [
-                        TriggerModel(name="MTI Mock Test 1", value=100, category=self.category1),
-                        TriggerModel(name="MTI Mock Test 2", value=200, category=self.category2)
-                    ]
-
-                    upsert_objects = [
-                        TriggerModel(name="MTI Mock Test 1", value=100, category=self.category1),
-                        TriggerModel(name="MTI Mock Test 2", value=200, category=self.category2)
-                    ]
-
-                    # This should call the MTI path with upsert parameters
-                    result = TriggerModel.objects.bulk_create(
-                        upsert_objects,
-                        update_conflicts=True,
-                        update_fields=['value'],
-                        unique_fields=['name']
-                    )
-
-                    # Verify _mti_bulk_create was called with upsert parameters
-                    mock_mti_create.assert_called_once()
-                    call_args = mock_mti_create.call_args
-                    self.assertEqual(call_args[0][0], upsert_objects)  # First arg is objects
-                    self.assertIn('existing_records', call_args[1])
-                    self.assertIn('new_records', call_args[1])
-                    self.assertEqual(call_args[1]['update_conflicts'], True)
-                    self.assertEqual(call_args[1]['unique_fields'], ['name'])
-
-        finally:
-            clear_triggers()
-
-    def test_bulk_create_upsert_no_unique_fields(self):
-        """
-        Test bulk_create upsert with no unique_fields specified (covers line 169).
-
-        This tests the case where no unique fields are provided, so all records are treated as new.
-        """
-        trigger_calls = []
-
-        @bulk_trigger(TriggerModel, BEFORE_CREATE)
-        def before_create_trigger(new_instances, original_instances):
-            trigger_calls.append(('before_create', len(new_instances)))
-
-        try:
-            # Create objects for upsert but don't specify unique_fields
-            upsert_objects = [
-                TriggerModel(name="No Unique 1", value=100, category=self.category1),
-                TriggerModel(name="No Unique 2", value=200, category=self.category2)
-            ]
-
-            # Mock Django's bulk_create to simulate successful operation
-            with patch('django.db.models.QuerySet.bulk_create') as mock_bulk_create:
-                mock_bulk_create.return_value = upsert_objects
-
-                # Perform upsert operation without unique_fields - should treat all as new
-                result = TriggerModel.objects.bulk_create(
-                    upsert_objects,
-                    update_conflicts=True,
-                    update_fields=['value']
-                    # Note: no unique_fields specified
-                )
-
-                # Verify all records were treated as new (line 169)
-                self.assertIn(('before_create', 2), trigger_calls)  # All objects treated as creates
-
-        finally:
-            clear_triggers()
-
-    def test_bulk_delete_no_valid_pks_return_zero(self):
-        """
-        Test bulk_delete when objects have no valid primary keys (covers line 306).
-
-        This tests the delete_operation function return path when no objects have valid pks.
-        """
-        from django_bulk_triggers.bulk_operations import BulkOperationsMixin
-
-        # Create a mock queryset with the mixin
-        class MockQuerySet(BulkOperationsMixin):
-            def __init__(self):
-                self.model = TriggerModel
-
-        queryset = MockQuerySet()
-
-        # Create objects with no primary keys
-        obj1 = TriggerModel(name="No PK Delete 1", value=100, category=self.category1)
-        obj2 = TriggerModel(name="No PK Delete 2", value=200, category=self.category2)
-        obj1.pk = None
-        obj2.pk = None
-
-        # Create the delete_operation function (this is the inner function from bulk_delete)
-        def delete_operation():
-            pks = [obj.pk for obj in [obj1, obj2] if obj.pk is not None]
-            if pks:
-                # Use the base manager to avoid recursion
-                return queryset.model._base_manager.filter(pk__in=pks).delete()[0]
-            else:
-                return 0  # This covers line 306
-
-        # Test the delete_operation function directly
-        result = delete_operation()
-
-        # Verify result is 0 when no objects have valid pks
-        self.assertEqual(result, 0)
-
-    def test_bulk_create_upsert_foreign_key_id_fields(self):
-        """
-        Test upsert logic with ForeignKey _id field handling (covers lines 105-106, 142, 148).
-
-        This tests the _id field handling for ForeignKey relationships in upsert classification.
-        """
-        trigger_calls = []
-
-        @bulk_trigger(TriggerModel, BEFORE_UPDATE)
-        def before_update_trigger(new_instances, original_instances):
-            trigger_calls.append(('before_update', len(new_instances)))
-
-        try:
-            # Create an existing record
-            existing_obj = TriggerModel.objects.create(
-                name="FK ID Test",
-                value=100,
-                category=self.category1,
-                created_by=self.user1
-            )
-
-            # Create upsert object with ForeignKey field set
-            upsert_obj = TriggerModel(
-                name="FK ID Test",  # Same name to match existing
-                value=200,
-                category=self.category1,
-                created_by=self.user1  # Same user
-            )
-
-            # Ensure the ForeignKey _id field is accessible
-            self.assertEqual(upsert_obj.category_id, self.category1.pk)
-            self.assertEqual(upsert_obj.created_by_id, self.user1.pk)
-
-            # Mock Django's bulk_create to simulate successful operation
-            with patch('django.db.models.QuerySet.bulk_create') as mock_bulk_create:
-                mock_bulk_create.return_value = [upsert_obj]
-
-                # Perform upsert using category as unique field (this will use _id field handling)
-                result = TriggerModel.objects.bulk_create(
-                    [upsert_obj],
-                    update_conflicts=True,
-                    update_fields=['value'],
-                    unique_fields=['category']  # Use ForeignKey as unique field
-                )
-
-                # Verify the _id field handling was executed (lines 105-106, 142, 148)
-                # This should trigger the update path since we're matching by category
-                self.assertIn(('before_update', 1), trigger_calls)
-
-        finally:
-            clear_triggers()
-
-    def test_bulk_create_mti_path_with_upsert(self):
-        """
-        Test MTI bulk_create path with upsert parameters (covers line 192).
-
-        This tests the MTI branch when update_conflicts and unique_fields are provided.
-        """
-        # Mock Django's bulk_create to avoid database-specific upsert requirements
-
-        trigger_calls = []
-
-        @bulk_trigger(TriggerModel, BEFORE_CREATE)
-        def before_create_trigger(new_instances, original_instances):
-            trigger_calls.append(('before_create', len(new_instances)))
-
-        try:
-            # Mock _is_multi_table_inheritance to return True
-            with patch('django_bulk_triggers.queryset.TriggerQuerySetMixin._is_multi_table_inheritance', return_value=True):
-                # Mock _mti_bulk_create to track calls
-                with patch('django_bulk_triggers.queryset.TriggerQuerySetMixin._mti_bulk_create') as mock_mti_create:
-                    mock_mti_create.return_value = [
-                        TriggerModel(name="MTI Test 1", value=100, category=self.category1),
-                        TriggerModel(name="MTI Test 2", value=200, category=self.category2)
-                    ]
-
-                    upsert_objects = [
-                        TriggerModel(name="MTI Test 1", value=100, category=self.category1),
-                        TriggerModel(name="MTI Test 2", value=200, category=self.category2)
-                    ]
-
-                    # This should call the MTI path with upsert parameters
-                    result = TriggerModel.objects.bulk_create(
-                        upsert_objects,
-                        update_conflicts=True,
-                        update_fields=['value'],
-                        unique_fields=['name']
-                    )
-
-                    # Verify _mti_bulk_create was called with upsert parameters
-                    mock_mti_create.assert_called_once()
-                    call_args = mock_mti_create.call_args
-                    self.assertEqual(call_args[0][0], upsert_objects)  # First arg is objects
-                    self.assertIn('existing_records', call_args[1])
-                    self.assertIn('new_records', call_args[1])
-                    self.assertEqual(call_args[1]['update_conflicts'], True)
-                    self.assertEqual(call_args[1]['unique_fields'], ['name'])
-
-        finally:
-            clear_triggers()
-
-    def test_bulk_create_upsert_no_unique_fields(self):
-        """
-        Test bulk_create upsert with no unique_fields specified (covers line 169).
-
-        This tests the case where no unique fields are provided, so all records are treated as new.
-        """
-        trigger_calls = []
-
-        @bulk_trigger(TriggerModel, BEFORE_CREATE)
-        def before_create_trigger(new_instances, original_instances):
-            trigger_calls.append(('before_create', len(new_instances)))
-
-        try:
-            # Create objects for upsert but don't specify unique_fields
-            upsert_objects = [
-                TriggerModel(name="No Unique 1", value=100, category=self.category1),
-                TriggerModel(name="No Unique 2", value=200, category=self.category2)
-            ]
-
-            # Mock Django's bulk_create to simulate successful operation
-            with patch('django.db.models.QuerySet.bulk_create') as mock_bulk_create:
-                mock_bulk_create.return_value = upsert_objects
-
-                # Perform upsert operation without unique_fields - should treat all as new
-                result = TriggerModel.objects.bulk_create(
-                    upsert_objects,
-                    update_conflicts=True,
-                    update_fields=['value']
-                    # Note: no unique_fields specified
-                )
-
-                # Verify all records were treated as new (line 169)
-                self.assertIn(('before_create', 2), trigger_calls)  # All objects treated as creates
-
-        finally:
-            clear_triggers()
-
-    def test_bulk_delete_no_valid_pks_return_zero(self):
-        """
-        Test bulk_delete when objects have no valid primary keys (covers line 306).
-
-        This tests the delete_operation function return path when no objects have valid pks.
-        """
-        from django_bulk_triggers.bulk_operations import BulkOperationsMixin
-
-        # Create a mock queryset with the mixin
-        class MockQuerySet(BulkOperationsMixin):
-            def __init__(self):
-                self.model = TriggerModel
-
-        queryset = MockQuerySet()
-
-        # Create objects with no primary keys
-        obj1 = TriggerModel(name="No PK Delete 1", value=100, category=self.category1)
-        obj2 = TriggerModel(name="No PK Delete 2", value=200, category=self.category2)
-        obj1.pk = None
-        obj2.pk = None
-
-        # Create the delete_operation function (this is the inner function from bulk_delete)
-        def delete_operation():
-            pks = [obj.pk for obj in [obj1, obj2] if obj.pk is not None]
-            if pks:
-                # Use the base manager to avoid recursion
-                return queryset.model._base_manager.filter(pk__in=pks).delete()[0]
-            else:
-                return 0  # This covers line 306
-
-        # Test the delete_operation function directly
-        result = delete_operation()
-
-        # Verify result is 0 when no objects have valid pks
-        self.assertEqual(result, 0)
-
-    def test_bulk_create_upsert_foreign_key_id_fields(self):
-        """
-        Test upsert logic with ForeignKey _id field handling (covers lines 105-106, 142, 148).
-
-        This tests the _id field handling for ForeignKey relationships in upsert classification.
-        """
-        trigger_calls = []
-
-        @bulk_trigger(TriggerModel, BEFORE_UPDATE)
-        def before_update_trigger(new_instances, original_instances):
-            trigger_calls.append(('before_update', len(new_instances)))
-
-        try:
-            # Create an existing record
-            existing_obj = TriggerModel.objects.create(
-                name="FK ID Test",
-                value=100,
-                category=self.category1,
-                created_by=self.user1
-            )
-
-            # Create upsert object with ForeignKey field set
-            upsert_obj = TriggerModel(
-                name="FK ID Test",  # Same name to match existing
-                value=200,
-                category=self.category1,
-                created_by=self.user1  # Same user
-            )
-
-            # Ensure the ForeignKey _id field is accessible
-            self.assertEqual(upsert_obj.category_id, self.category1.pk)
-            self.assertEqual(upsert_obj.created_by_id, self.user1.pk)
-
-            # Mock Django's bulk_create to simulate successful operation
-            with patch('django.db.models.QuerySet.bulk_create') as mock_bulk_create:
-                mock_bulk_create.return_value = [upsert_obj]
-
-                # Perform upsert using category as unique field (this will use _id field handling)
-                result = TriggerModel.objects.bulk_create(
-                    [upsert_obj],
-                    update_conflicts=True,
-                    update_fields=['value'],
-                    unique_fields=['category']  # Use ForeignKey as unique field
-                )
-
-                # Verify the _id field handling was executed (lines 105-106, 142, 148)
-                # This should trigger the update path since we're matching by category
-                self.assertIn(('before_update', 1), trigger_calls)
-
-        finally:
-            clear_triggers()
-
-    def test_bulk_create_upsert_logic_mock_database(self):
-        """
-        Test bulk_create upsert logic using mocks to cover lines 93-181.
-
-        This tests the upsert classification logic without requiring database upsert support.
-        """
-        trigger_calls = []
-
-        @bulk_trigger(TriggerModel, BEFORE_CREATE)
-        def before_create_trigger(new_instances, original_instances):
-            trigger_calls.append(('before_create', len(new_instances)))
-
-        @bulk_trigger(TriggerModel, BEFORE_UPDATE)
-        def before_update_trigger(new_instances, original_instances):
-            trigger_calls.append(('before_update', len(new_instances)))
-
-        @bulk_trigger(TriggerModel, VALIDATE_CREATE)
-        def validate_create_trigger(new_instances, original_instances):
-            trigger_calls.append(('validate_create', len(new_instances)))
-
-        @bulk_trigger(TriggerModel, VALIDATE_UPDATE)
-        def validate_update_trigger(new_instances, original_instances):
-            trigger_calls.append(('validate_update', len(new_instances)))
-
-        try:
-            # Create an existing record
-            existing_obj = TriggerModel.objects.create(
-                name="Existing Mock",
-                value=100,
-                category=self.category1
-            )
-
-            # Create objects for upsert - one existing (by name), one new
-            upsert_objects = [
-                TriggerModel(
-                    name="Existing Mock",  # This will be classified as existing
-                    value=999,
-                    category=self.category1
-                ),
-                TriggerModel(
-                    name="New Mock",  # This will be classified as new
-                    value=200,
-                    category=self.category2
-                )
-            ]
-
-            # Mock Django's bulk_create to avoid database-specific upsert requirements
-            with patch('django.db.models.QuerySet.bulk_create') as mock_bulk_create:
-                mock_bulk_create.return_value = upsert_objects
-
-                # Perform upsert operation - this will trigger the classification logic
-                result = TriggerModel.objects.bulk_create(
-                    upsert_objects,
-                    update_conflicts=True,
-                    update_fields=['value'],
-                    unique_fields=['name']  # Use name as unique field
-                )
-
-                # Verify the classification logic was executed
-                # We should have triggers for both create and update operations
-                self.assertIn(('validate_create', 1), trigger_calls)  # New object
-                self.assertIn(('validate_update', 1), trigger_calls)  # Existing object
-                self.assertIn(('before_create', 1), trigger_calls)    # New object
-                self.assertIn(('before_update', 1), trigger_calls)    # Existing object
-
-        finally:
-            clear_triggers()
-
-    def test_bulk_create_upsert_no_unique_fields(self):
-        """
-        Test bulk_create upsert with no unique_fields specified (covers line 169).
-
-        This tests the case where no unique fields are provided, so all records are treated as new.
-        """
-        trigger_calls = []
-
-        @bulk_trigger(TriggerModel, BEFORE_CREATE)
-        def before_create_trigger(new_instances, original_instances):
-            trigger_calls.append(('before_create', len(new_instances)))
-
-        try:
-            # Create objects for upsert but don't specify unique_fields
-            upsert_objects = [
-                TriggerModel(name="No Unique 1", value=100, category=self.category1),
-                TriggerModel(name="No Unique 2", value=200, category=self.category2)
-            ]
-
-            # Mock Django's bulk_create to simulate successful operation
-            with patch('django.db.models.QuerySet.bulk_create') as mock_bulk_create:
-                mock_bulk_create.return_value = upsert_objects
-
-                # Perform upsert operation without unique_fields - should treat all as new
-                result = TriggerModel.objects.bulk_create(
-                    upsert_objects,
-                    update_conflicts=True,
-                    update_fields=['value']
-                    # Note: no unique_fields specified
-                )
-
-                # Verify all records were treated as new (line 169)
-                self.assertIn(('before_create', 2), trigger_calls)  # All objects treated as creates
-
-        finally:
-            clear_triggers()
-
-    def test_bulk_delete_no_valid_pks_return_zero(self):
-        """
-        Test bulk_delete when objects have no valid primary keys (covers line 306).
-
-        This tests the delete_operation function return path when no objects have valid pks.
-        """
-        from django_bulk_triggers.bulk_operations import BulkOperationsMixin
-
-        # Create a mock queryset with the mixin
-        class MockQuerySet(BulkOperationsMixin):
-            def __init__(self):
-                self.model = TriggerModel
-
-        queryset = MockQuerySet()
-
-        # Create objects with no primary keys
-        obj1 = TriggerModel(name="No PK Delete 1", value=100, category=self.category1)
-        obj2 = TriggerModel(name="No PK Delete 2", value=200, category=self.category2)
-        obj1.pk = None
-        obj2.pk = None
-
-        # Create the delete_operation function (this is the inner function from bulk_delete)
-        def delete_operation():
-            pks = [obj.pk for obj in [obj1, obj2] if obj.pk is not None]
-            if pks:
-                # Use the base manager to avoid recursion
-                return queryset.model._base_manager.filter(pk__in=pks).delete()[0]
-            else:
-                return 0  # This covers line 306
-
-        # Test the delete_operation function directly
-        result = delete_operation()
-
-        # Verify result is 0 when no objects have valid pks
-        self.assertEqual(result, 0)
-
-    def test_bulk_create_upsert_foreign_key_id_fields(self):
-        """
-        Test upsert logic with ForeignKey _id field handling (covers lines 105-106, 142, 148).
-
-        This tests the _id field handling for ForeignKey relationships in upsert classification.
-        """
-        trigger_calls = []
-
-        @bulk_trigger(TriggerModel, BEFORE_UPDATE)
-        def before_update_trigger(new_instances, original_instances):
-            trigger_calls.append(('before_update', len(new_instances)))
-
-        try:
-            # Create an existing record
-            existing_obj = TriggerModel.objects.create(
-                name="FK ID Test",
-                value=100,
-                category=self.category1,
-                created_by=self.user1
-            )
-
-            # Create upsert object with ForeignKey field set
-            upsert_obj = TriggerModel(
-                name="FK ID Test",  # Same name to match existing
-                value=200,
-                category=self.category1,
-                created_by=self.user1  # Same user
-            )
-
-            # Ensure the ForeignKey _id field is accessible
-            self.assertEqual(upsert_obj.category_id, self.category1.pk)
-            self.assertEqual(upsert_obj.created_by_id, self.user1.pk)
-
-            # Mock Django's bulk_create to simulate successful operation
-            with patch('django.db.models.QuerySet.bulk_create') as mock_bulk_create:
-                mock_bulk_create.return_value = [upsert_obj]
-
-                # Perform upsert using category as unique field (this will use _id field handling)
-                result = TriggerModel.objects.bulk_create(
-                    [upsert_obj],
-                    update_conflicts=True,
-                    update_fields=['value'],
-                    unique_fields=['category']  # Use ForeignKey as unique field
-                )
-
-                # Verify the _id field handling was executed (lines 105-106, 142, 148)
-                # This should trigger the update path since we're matching by category
-                self.assertIn(('before_update', 1), trigger_calls)
-
-        finally:
-            clear_triggers()
-
-    def test_bulk_create_after_triggers_upsert_mock(self):
-        """
-        Test AFTER triggers for upsert operations using mocks (covers lines 240-241).
-
-        This specifically tests the AFTER trigger logic for mixed create/update operations.
-        """
-        trigger_calls = []
-
-        @bulk_trigger(TriggerModel, AFTER_CREATE)
-        def after_create_trigger(new_instances, original_instances):
-            trigger_calls.append(('after_create', len(new_instances)))
-
-        @bulk_trigger(TriggerModel, AFTER_UPDATE)
-        def after_update_trigger(new_instances, original_instances):
-            trigger_calls.append(('after_update', len(new_instances)))
-
-        try:
-            # Create an existing record
-            existing_obj = TriggerModel.objects.create(
-                name="Existing After Test",
-                value=100,
-                category=self.category1
-            )
-
-            # Create objects for upsert
-            upsert_objects = [
-                TriggerModel(name="Existing After Test", value=200, category=self.category1),  # Update
-                TriggerModel(name="New After Test", value=300, category=self.category2)        # Create
-            ]
-
-            # Mock Django's bulk_create to simulate successful operation
-            with patch('django.db.models.QuerySet.bulk_create') as mock_bulk_create:
-                mock_bulk_create.return_value = upsert_objects
-
-                # Perform upsert - this should trigger AFTER triggers for both operations
-                result = TriggerModel.objects.bulk_create(
-                    upsert_objects,
-                    update_conflicts=True,
-                    update_fields=['value'],
-                    unique_fields=['name']
-                )
-
-                # Verify AFTER triggers were called for both operations
-                self.assertIn(('after_create', 1), trigger_calls)  # New record
-                self.assertIn(('after_update', 1), trigger_calls)  # Existing record
-
-        finally:
-            clear_triggers()
-
-    def test_bulk_create_upsert_no_unique_fields(self):
-        """
-        Test bulk_create upsert with no unique_fields specified (covers line 169).
-
-        This tests the case where no unique fields are provided, so all records are treated as new.
-        """
-        trigger_calls = []
-
-        @bulk_trigger(TriggerModel, BEFORE_CREATE)
-        def before_create_trigger(new_instances, original_instances):
-            trigger_calls.append(('before_create', len(new_instances)))
-
-        try:
-            # Create objects for upsert but don't specify unique_fields
-            upsert_objects = [
-                TriggerModel(name="No Unique 1", value=100, category=self.category1),
-                TriggerModel(name="No Unique 2", value=200, category=self.category2)
-            ]
-
-            # Mock Django's bulk_create to simulate successful operation
-            with patch('django.db.models.QuerySet.bulk_create') as mock_bulk_create:
-                mock_bulk_create.return_value = upsert_objects
-
-                # Perform upsert operation without unique_fields - should treat all as new
-                result = TriggerModel.objects.bulk_create(
-                    upsert_objects,
-                    update_conflicts=True,
-                    update_fields=['value']
-                    # Note: no unique_fields specified
-                )
-
-                # Verify all records were treated as new (line 169)
-                self.assertIn(('before_create', 2), trigger_calls)  # All objects treated as creates
-
-        finally:
-            clear_triggers()
-
-    def test_bulk_delete_no_valid_pks_return_zero(self):
-        """
-        Test bulk_delete when objects have no valid primary keys (covers line 306).
-
-        This tests the delete_operation function return path when no objects have valid pks.
-        """
-        from django_bulk_triggers.bulk_operations import BulkOperationsMixin
-
-        # Create a mock queryset with the mixin
-        class MockQuerySet(BulkOperationsMixin):
-            def __init__(self):
-                self.model = TriggerModel
-
-        queryset = MockQuerySet()
-
-        # Create objects with no primary keys
-        obj1 = TriggerModel(name="No PK Delete 1", value=100, category=self.category1)
-        obj2 = TriggerModel(name="No PK Delete 2", value=200, category=self.category2)
-        obj1.pk = None
-        obj2.pk = None
-
-        # Create the delete_operation function (this is the inner function from bulk_delete)
-        def delete_operation():
-            pks = [obj.pk for obj in [obj1, obj2] if obj.pk is not None]
-            if pks:
-                # Use the base manager to avoid recursion
-                return queryset.model._base_manager.filter(pk__in=pks).delete()[0]
-            else:
-                return 0  # This covers line 306
-
-        # Test the delete_operation function directly
-        result = delete_operation()
-
-        # Verify result is 0 when no objects have valid pks
-        self.assertEqual(result, 0)
-
-    def test_bulk_create_upsert_foreign_key_id_fields(self):
-        """
-        Test upsert logic with ForeignKey _id field handling (covers lines 105-106, 142, 148).
-
-        This tests the _id field handling for ForeignKey relationships in upsert classification.
-        """
-        trigger_calls = []
-
-        @bulk_trigger(TriggerModel, BEFORE_UPDATE)
-        def before_update_trigger(new_instances, original_instances):
-            trigger_calls.append(('before_update', len(new_instances)))
-
-        try:
-            # Create an existing record
-            existing_obj = TriggerModel.objects.create(
-                name="FK ID Test",
-                value=100,
-                category=self.category1,
-                created_by=self.user1
-            )
-
-            # Create upsert object with ForeignKey field set
-            upsert_obj = TriggerModel(
-                name="FK ID Test",  # Same name to match existing
-                value=200,
-                category=self.category1,
-                created_by=self.user1  # Same user
-            )
-
-            # Ensure the ForeignKey _id field is accessible
-            self.assertEqual(upsert_obj.category_id, self.category1.pk)
-            self.assertEqual(upsert_obj.created_by_id, self.user1.pk)
-
-            # Mock Django's bulk_create to simulate successful operation
-            with patch('django.db.models.QuerySet.bulk_create') as mock_bulk_create:
-                mock_bulk_create.return_value = [upsert_obj]
-
-                # Perform upsert using category as unique field (this will use _id field handling)
-                result = TriggerModel.objects.bulk_create(
-                    [upsert_obj],
-                    update_conflicts=True,
-                    update_fields=['value'],
-                    unique_fields=['category']  # Use ForeignKey as unique field
-                )
-
-                # Verify the _id field handling was executed (lines 105-106, 142, 148)
-                # This should trigger the update path since we're matching by category
-                self.assertIn(('before_update', 1), trigger_calls)
-
-        finally:
-            clear_triggers()
-
-    def test_bulk_create_mti_path_mock(self):
-        """
-        Test MTI bulk_create path using mocks (covers line 192).
-
-        This tests the MTI branch in bulk_create when update_conflicts=True.
-        """
-        trigger_calls = []
-
-        @bulk_trigger(TriggerModel, BEFORE_CREATE)
-        def before_create_trigger(new_instances, original_instances):
-            trigger_calls.append(('before_create', len(new_instances)))
-
-        try:
-            # Mock _is_multi_table_inheritance to return True
-            with patch('django_bulk_triggers.queryset.TriggerQuerySetMixin._is_multi_table_inheritance', return_value=True):
-                # Mock _mti_bulk_create to track calls
-                with patch('django_bulk_triggers.queryset.TriggerQuerySetMixin._mti_bulk_create') as mock_mti_create:
-                    mock_mti_create.return_value = [
-                        TriggerModel(name="MTI Mock Test 1", value=100, category=self.category1),
-                        TriggerModel(name="MTI Mock Test 2", value=200, category=self.category2)
-                    ]
-
-                    upsert_objects = [
-                        TriggerModel(name="MTI Mock Test 1", value=100, category=self.category1),
-                        TriggerModel(name="MTI Mock Test 2", value=200, category=self.category2)
-                    ]
-
-                    # This should call the MTI path with upsert parameters
-                    result = TriggerModel.objects.bulk_create(
-                        upsert_objects,
-                        update_conflicts=True,
-                        update_fields=['value'],
-                        unique_fields=['name']
-                    )
-
-                    # Verify _mti_bulk_create was called with upsert parameters
-                    mock_mti_create.assert_called_once()
-                    call_args = mock_mti_create.call_args
-                    self.assertEqual(call_args[0][0], upsert_objects)  # First arg is objects
-                    self.assertIn('existing_records', call_args[1])
-                    self.assertIn('new_records', call_args[1])
-                    self.assertEqual(call_args[1]['update_conflicts'], True)
-                    self.assertEqual(call_args[1]['unique_fields'], ['name'])
-
-        finally:
-            clear_triggers()
-
-    def test_bulk_create_upsert_no_unique_fields(self):
-        """
-        Test bulk_create upsert with no unique_fields specified (covers line 169).
-
-        This tests the case where no unique fields are provided, so all records are treated as new.
-        """
-        trigger_calls = []
-
-        @bulk_trigger(TriggerModel, BEFORE_CREATE)
-        def before_create_trigger(new_instances, original_instances):
-            trigger_calls.append(('before_create', len(new_instances)))
-
-        try:
-            # Create objects for upsert but don't specify unique_fields
-            upsert_objects = [
-                TriggerModel(name="No Unique 1", value=100, category=self.category1),
-                TriggerModel(name="No Unique 2", value=200, category=self.category2)
-            ]
-
-            # Mock Django's bulk_create to simulate successful operation
-            with patch('django.db.models.QuerySet.bulk_create') as mock_bulk_create:
-                mock_bulk_create.return_value = upsert_objects
-
-                # Perform upsert operation without unique_fields - should treat all as new
-                result = TriggerModel.objects.bulk_create(
-                    upsert_objects,
-                    update_conflicts=True,
-                    update_fields=['value']
-                    # Note: no unique_fields specified
-                )
-
-                # Verify all records were treated as new (line 169)
-                self.assertIn(('before_create', 2), trigger_calls)  # All objects treated as creates
-
-        finally:
-            clear_triggers()
-
-    def test_bulk_delete_no_valid_pks_return_zero(self):
-        """
-        Test bulk_delete when objects have no valid primary keys (covers line 306).
-
-        This tests the delete_operation function return path when no objects have valid pks.
-        """
-        from django_bulk_triggers.bulk_operations import BulkOperationsMixin
-
-        # Create a mock queryset with the mixin
-        class MockQuerySet(BulkOperationsMixin):
-            def __init__(self):
-                self.model = TriggerModel
-
-        queryset = MockQuerySet()
-
-        # Create objects with no primary keys
-        obj1 = TriggerModel(name="No PK Delete 1", value=100, category=self.category1)
-        obj2 = TriggerModel(name="No PK Delete 2", value=200, category=self.category2)
-        obj1.pk = None
-        obj2.pk = None
-
-        # Create the delete_operation function (this is the inner function from bulk_delete)
-        def delete_operation():
-            pks = [obj.pk for obj in [obj1, obj2] if obj.pk is not None]
-            if pks:
-                # Use the base manager to avoid recursion
-                return queryset.model._base_manager.filter(pk__in=pks).delete()[0]
-            else:
-                return 0  # This covers line 306
-
-        # Test the delete_operation function directly
-        result = delete_operation()
-
-        # Verify result is 0 when no objects have valid pks
-        self.assertEqual(result, 0)
-
-    def test_bulk_create_upsert_foreign_key_id_fields(self):
-        """
-        Test upsert logic with ForeignKey _id field handling (covers lines 105-106, 142, 148).
-
-        This tests the _id field handling for ForeignKey relationships in upsert classification.
-        """
-        trigger_calls = []
-
-        @bulk_trigger(TriggerModel, BEFORE_UPDATE)
-        def before_update_trigger(new_instances, original_instances):
-            trigger_calls.append(('before_update', len(new_instances)))
-
-        try:
-            # Create an existing record
-            existing_obj = TriggerModel.objects.create(
-                name="FK ID Test",
-                value=100,
-                category=self.category1,
-                created_by=self.user1
-            )
-
-            # Create upsert object with ForeignKey field set
-            upsert_obj = TriggerModel(
-                name="FK ID Test",  # Same name to match existing
-                value=200,
-                category=self.category1,
-                created_by=self.user1  # Same user
-            )
-
-            # Ensure the ForeignKey _id field is accessible
-            self.assertEqual(upsert_obj.category_id, self.category1.pk)
-            self.assertEqual(upsert_obj.created_by_id, self.user1.pk)
-
-            # Mock Django's bulk_create to simulate successful operation
-            with patch('django.db.models.QuerySet.bulk_create') as mock_bulk_create:
-                mock_bulk_create.return_value = [upsert_obj]
-
-                # Perform upsert using category as unique field (this will use _id field handling)
-                result = TriggerModel.objects.bulk_create(
-                    [upsert_obj],
-                    update_conflicts=True,
-                    update_fields=['value'],
-                    unique_fields=['category']  # Use ForeignKey as unique field
-                )
-
-                # Verify the _id field handling was executed (lines 105-106, 142, 148)
-                # This should trigger the update path since we're matching by category
-                self.assertIn(('before_update', 1), trigger_calls)
-
-        finally:
-            clear_triggers()
-
-    def test_bulk_update_mti_path(self):
-        """
-        Test bulk_update MTI path (covers line 269).
-
-        This tests the MTI branch in bulk_update method.
-        """
-        trigger_calls = []
-
-        @bulk_trigger(TriggerModel, BEFORE_UPDATE)
-        def before_update_trigger(new_instances, original_instances):
-            trigger_calls.append(('before_update', len(new_instances)))
-
-        try:
-            # Create test objects
-            obj1 = TriggerModel.objects.create(name="MTI Update 1", value=100, category=self.category1)
-            obj2 = TriggerModel.objects.create(name="MTI Update 2", value=200, category=self.category2)
-
-            # Mock _is_multi_table_inheritance method on the queryset
-            with patch('django_bulk_triggers.queryset.TriggerQuerySetMixin._is_multi_table_inheritance', return_value=True):
-                # Mock _mti_bulk_update to track calls
-                with patch('django_bulk_triggers.queryset.TriggerQuerySetMixin._mti_bulk_update') as mock_mti_update:
-                    mock_mti_update.return_value = 2
-
-                    # Modify objects for update
-                    obj1.value = 150
-                    obj2.value = 250
-
-                    # This should call the MTI bulk_update path
-                    result = TriggerModel.objects.bulk_update([obj1, obj2])
-
-                    # Verify _mti_bulk_update was called
-                    mock_mti_update.assert_called_once()
-                    call_args = mock_mti_update.call_args
-                    self.assertEqual(call_args[0][0], [obj1, obj2])  # Objects
-                    self.assertIsInstance(call_args[0][1], list)     # Fields list
-
-                    # Verify result
-                    self.assertEqual(result, 2)
-
-        finally:
-            clear_triggers()
-
-    def test_bulk_create_upsert_no_unique_fields(self):
-        """
-        Test bulk_create upsert with no unique_fields specified (covers line 169).
-
-        This tests the case where no unique fields are provided, so all records are treated as new.
-        """
-        trigger_calls = []
-
-        @bulk_trigger(TriggerModel, BEFORE_CREATE)
-        def before_create_trigger(new_instances, original_instances):
-            trigger_calls.append(('before_create', len(new_instances)))
-
-        try:
-            # Create objects for upsert but don't specify unique_fields
-            upsert_objects = [
-                TriggerModel(name="No Unique 1", value=100, category=self.category1),
-                TriggerModel(name="No Unique 2", value=200, category=self.category2)
-            ]
-
-            # Mock Django's bulk_create to simulate successful operation
-            with patch('django.db.models.QuerySet.bulk_create') as mock_bulk_create:
-                mock_bulk_create.return_value = upsert_objects
-
-                # Perform upsert operation without unique_fields - should treat all as new
-                result = TriggerModel.objects.bulk_create(
-                    upsert_objects,
-                    update_conflicts=True,
-                    update_fields=['value']
-                    # Note: no unique_fields specified
-                )
-
-                # Verify all records were treated as new (line 169)
-                self.assertIn(('before_create', 2), trigger_calls)  # All objects treated as creates
-
-        finally:
-            clear_triggers()
-
-    def test_bulk_delete_no_valid_pks_return_zero(self):
-        """
-        Test bulk_delete when objects have no valid primary keys (covers line 306).
-
-        This tests the delete_operation function return path when no objects have valid pks.
-        """
-        from django_bulk_triggers.bulk_operations import BulkOperationsMixin
-
-        # Create a mock queryset with the mixin
-        class MockQuerySet(BulkOperationsMixin):
-            def __init__(self):
-                self.model = TriggerModel
-
-        queryset = MockQuerySet()
-
-        # Create objects with no primary keys
-        obj1 = TriggerModel(name="No PK Delete 1", value=100, category=self.category1)
-        obj2 = TriggerModel(name="No PK Delete 2", value=200, category=self.category2)
-        obj1.pk = None
-        obj2.pk = None
-
-        # Create the delete_operation function (this is the inner function from bulk_delete)
-        def delete_operation():
-            pks = [obj.pk for obj in [obj1, obj2] if obj.pk is not None]
-            if pks:
-                # Use the base manager to avoid recursion
-                return queryset.model._base_manager.filter(pk__in=pks).delete()[0]
-            else:
-                return 0  # This covers line 306
-
-        # Test the delete_operation function directly
-        result = delete_operation()
-
-        # Verify result is 0 when no objects have valid pks
-        self.assertEqual(result, 0)
-
-    def test_bulk_create_upsert_foreign_key_id_fields(self):
-        """
-        Test upsert logic with ForeignKey _id field handling (covers lines 105-106, 142, 148).
-
-        This tests the _id field handling for ForeignKey relationships in upsert classification.
-        """
-        trigger_calls = []
-
-        @bulk_trigger(TriggerModel, BEFORE_UPDATE)
-        def before_update_trigger(new_instances, original_instances):
-            trigger_calls.append(('before_update', len(new_instances)))
-
-        try:
-            # Create an existing record
-            existing_obj = TriggerModel.objects.create(
-                name="FK ID Test",
-                value=100,
-                category=self.category1,
-                created_by=self.user1
-            )
-
-            # Create upsert object with ForeignKey field set
-            upsert_obj = TriggerModel(
-                name="FK ID Test",  # Same name to match existing
-                value=200,
-                category=self.category1,
-                created_by=self.user1  # Same user
-            )
-
-            # Ensure the ForeignKey _id field is accessible
-            self.assertEqual(upsert_obj.category_id, self.category1.pk)
-            self.assertEqual(upsert_obj.created_by_id, self.user1.pk)
-
-            # Mock Django's bulk_create to simulate successful operation
-            with patch('django.db.models.QuerySet.bulk_create') as mock_bulk_create:
-                mock_bulk_create.return_value = [upsert_obj]
-
-                # Perform upsert using category as unique field (this will use _id field handling)
-                result = TriggerModel.objects.bulk_create(
-                    [upsert_obj],
-                    update_conflicts=True,
-                    update_fields=['value'],
-                    unique_fields=['category']  # Use ForeignKey as unique field
-                )
-
-                # Verify the _id field handling was executed (lines 105-106, 142, 148)
-                # This should trigger the update path since we're matching by category
-                self.assertIn(('before_update', 1), trigger_calls)
-
-        finally:
-            clear_triggers()
-
-    def test_bulk_create_upsert_logic_mock_database(self):
-        """
-        Test bulk_create upsert logic using mocks to cover lines 93-181.
-
-        This tests the upsert classification logic without requiring database upsert support.
-        """
-        trigger_calls = []
-
-        @bulk_trigger(TriggerModel, BEFORE_CREATE)
-        def before_create_trigger(new_instances, original_instances):
-            trigger_calls.append(('before_create', len(new_instances)))
-
-        @bulk_trigger(TriggerModel, BEFORE_UPDATE)
-        def before_update_trigger(new_instances, original_instances):
-            trigger_calls.append(('before_update', len(new_instances)))
-
-        @bulk_trigger(TriggerModel, VALIDATE_CREATE)
-        def validate_create_trigger(new_instances, original_instances):
-            trigger_calls.append(('validate_create', len(new_instances)))
-
-        @bulk_trigger(TriggerModel, VALIDATE_UPDATE)
-        def validate_update_trigger(new_instances, original_instances):
-            trigger_calls.append(('validate_update', len(new_instances)))
-
-        try:
-            # Create an existing record
-            existing_obj = TriggerModel.objects.create(
-                name="Existing Mock",
-                value=100,
-                category=self.category1
-            )
-
-            # Create objects for upsert - one existing (by name), one new
-            upsert_objects = [
-                TriggerModel(
-                    name="Existing Mock",  # This will be classified as existing
-                    value=999,
-                    category=self.category1
-                ),
-                TriggerModel(
-                    name="New Mock",  # This will be classified as new
-                    value=200,
-                    category=self.category2
-                )
-            ]
-
-            # Mock Django's bulk_create to avoid database-specific upsert requirements
-            with patch('django.db.models.QuerySet.bulk_create') as mock_bulk_create:
-                mock_bulk_create.return_value = upsert_objects
-
-                # Perform upsert operation - this will trigger the classification logic
-                result = TriggerModel.objects.bulk_create(
-                    upsert_objects,
-                    update_conflicts=True,
-                    update_fields=['value'],
-                    unique_fields=['name']  # Use name as unique field
-                )
-
-                # Verify the classification logic was executed
-                # We should have triggers for both create and update operations
-                self.assertIn(('validate_create', 1), trigger_calls)  # New object
-                self.assertIn(('validate_update', 1), trigger_calls)  # Existing object
-                self.assertIn(('before_create', 1), trigger_calls)    # New object
-                self.assertIn(('before_update', 1), trigger_calls)    # Existing object
-
-        finally:
-            clear_triggers()
-
-    def test_bulk_create_upsert_no_unique_fields(self):
-        """
-        Test bulk_create upsert with no unique_fields specified (covers line 169).
-
-        This tests the case where no unique fields are provided, so all records are treated as new.
-        """
-        trigger_calls = []
-
-        @bulk_trigger(TriggerModel, BEFORE_CREATE)
-        def before_create_trigger(new_instances, original_instances):
-            trigger_calls.append(('before_create', len(new_instances)))
-
-        try:
-            # Create objects for upsert but don't specify unique_fields
-            upsert_objects = [
-                TriggerModel(name="No Unique 1", value=100, category=self.category1),
-                TriggerModel(name="No Unique 2", value=200, category=self.category2)
-            ]
-
-            # Mock Django's bulk_create to simulate successful operation
-            with patch('django.db.models.QuerySet.bulk_create') as mock_bulk_create:
-                mock_bulk_create.return_value = upsert_objects
-
-                # Perform upsert operation without unique_fields - should treat all as new
-                result = TriggerModel.objects.bulk_create(
-                    upsert_objects,
-                    update_conflicts=True,
-                    update_fields=['value']
-                    # Note: no unique_fields specified
-                )
-
-                # Verify all records were treated as new (line 169)
-                self.assertIn(('before_create', 2), trigger_calls)  # All objects treated as creates
-
-        finally:
-            clear_triggers()
-
-    def test_bulk_delete_no_valid_pks_return_zero(self):
-        """
-        Test bulk_delete when objects have no valid primary keys (covers line 306).
-
-        This tests the delete_operation function return path when no objects have valid pks.
-        """
-        from django_bulk_triggers.bulk_operations import BulkOperationsMixin
-
-        # Create a mock queryset with the mixin
-        class MockQuerySet(BulkOperationsMixin):
-            def __init__(self):
-                self.model = TriggerModel
-
-        queryset = MockQuerySet()
-
-        # Create objects with no primary keys
-        obj1 = TriggerModel(name="No PK Delete 1", value=100, category=self.category1)
-        obj2 = TriggerModel(name="No PK Delete 2", value=200, category=self.category2)
-        obj1.pk = None
-        obj2.pk = None
-
-        # Create the delete_operation function (this is the inner function from bulk_delete)
-        def delete_operation():
-            pks = [obj.pk for obj in [obj1, obj2] if obj.pk is not None]
-            if pks:
-                # Use the base manager to avoid recursion
-                return queryset.model._base_manager.filter(pk__in=pks).delete()[0]
-            else:
-                return 0  # This covers line 306
-
-        # Test the delete_operation function directly
-        result = delete_operation()
-
-        # Verify result is 0 when no objects have valid pks
-        self.assertEqual(result, 0)
-
-    def test_bulk_create_upsert_foreign_key_id_fields(self):
-        """
-        Test upsert logic with ForeignKey _id field handling (covers lines 105-106, 142, 148).
-
-        This tests the _id field handling for ForeignKey relationships in upsert classification.
-        """
-        trigger_calls = []
-
-        @bulk_trigger(TriggerModel, BEFORE_UPDATE)
-        def before_update_trigger(new_instances, original_instances):
-            trigger_calls.append(('before_update', len(new_instances)))
-
-        try:
-            # Create an existing record
-            existing_obj = TriggerModel.objects.create(
-                name="FK ID Test",
-                value=100,
-                category=self.category1,
-                created_by=self.user1
-            )
-
-            # Create upsert object with ForeignKey field set
-            upsert_obj = TriggerModel(
-                name="FK ID Test",  # Same name to match existing
-                value=200,
-                category=self.category1,
-                created_by=self.user1  # Same user
-            )
-
-            # Ensure the ForeignKey _id field is accessible
-            self.assertEqual(upsert_obj.category_id, self.category1.pk)
-            self.assertEqual(upsert_obj.created_by_id, self.user1.pk)
-
-            # Mock Django's bulk_create to simulate successful operation
-            with patch('django.db.models.QuerySet.bulk_create') as mock_bulk_create:
-                mock_bulk_create.return_value = [upsert_obj]
-
-                # Perform upsert using category as unique field (this will use _id field handling)
-                result = TriggerModel.objects.bulk_create(
-                    [upsert_obj],
-                    update_conflicts=True,
-                    update_fields=['value'],
-                    unique_fields=['category']  # Use ForeignKey as unique field
-                )
-
-                # Verify the _id field handling was executed (lines 105-106, 142, 148)
-                # This should trigger the update path since we're matching by category
-                self.assertIn(('before_update', 1), trigger_calls)
-
-        finally:
-            clear_triggers()
-
-    def test_bulk_create_after_triggers_upsert_mock(self):
-        """
-        Test AFTER triggers for upsert operations using mocks (covers lines 240-241).
-
-        This specifically tests the AFTER trigger logic for mixed create/update operations.
-        """
-        trigger_calls = []
-
-        @bulk_trigger(TriggerModel, AFTER_CREATE)
-        def after_create_trigger(new_instances, original_instances):
-            trigger_calls.append(('after_create', len(new_instances)))
-
-        @bulk_trigger(TriggerModel, AFTER_UPDATE)
-        def after_update_trigger(new_instances, original_instances):
-            trigger_calls.append(('after_update', len(new_instances)))
-
-        try:
-            # Create an existing record
-            existing_obj = TriggerModel.objects.create(
-                name="Existing After Test",
-                value=100,
-                category=self.category1
-            )
-
-            # Create objects for upsert
-            upsert_objects = [
-                TriggerModel(name="Existing After Test", value=200, category=self.category1),  # Update
-                TriggerModel(name="New After Test", value=300, category=self.category2)        # Create
-            ]
-
-            # Mock Django's bulk_create to simulate successful operation
-            with patch('django.db.models.QuerySet.bulk_create') as mock_bulk_create:
-                mock_bulk_create.return_value = upsert_objects
-
-                # Perform upsert - this should trigger AFTER triggers for both operations
-                result = TriggerModel.objects.bulk_create(
-                    upsert_objects,
-                    update_conflicts=True,
-                    update_fields=['value'],
-                    unique_fields=['name']
-                )
-
-                # Verify AFTER triggers were called for both operations
-                self.assertIn(('after_create', 1), trigger_calls)  # New record
-                self.assertIn(('after_update', 1), trigger_calls)  # Existing record
-
-        finally:
-            clear_triggers()
-
-    def test_bulk_create_upsert_no_unique_fields(self):
-        """
-        Test bulk_create upsert with no unique_fields specified (covers line 169).
-
-        This tests the case where no unique fields are provided, so all records are treated as new.
-        """
-        trigger_calls = []
-
-        @bulk_trigger(TriggerModel, BEFORE_CREATE)
-        def before_create_trigger(new_instances, original_instances):
-            trigger_calls.append(('before_create', len(new_instances)))
-
-        try:
-            # Create objects for upsert but don't specify unique_fields
-            upsert_objects = [
-                TriggerModel(name="No Unique 1", value=100, category=self.category1),
-                TriggerModel(name="No Unique 2", value=200, category=self.category2)
-            ]
-
-            # Mock Django's bulk_create to simulate successful operation
-            with patch('django.db.models.QuerySet.bulk_create') as mock_bulk_create:
-                mock_bulk_create.return_value = upsert_objects
-
-                # Perform upsert operation without unique_fields - should treat all as new
-                result = TriggerModel.objects.bulk_create(
-                    upsert_objects,
-                    update_conflicts=True,
-                    update_fields=['value']
-                    # Note: no unique_fields specified
-                )
-
-                # Verify all records were treated as new (line 169)
-                self.assertIn(('before_create', 2), trigger_calls)  # All objects treated as creates
-
-        finally:
-            clear_triggers()
-
-    def test_bulk_delete_no_valid_pks_return_zero(self):
-        """
-        Test bulk_delete when objects have no valid primary keys (covers line 306).
-
-        This tests the delete_operation function return path when no objects have valid pks.
-        """
-        from django_bulk_triggers.bulk_operations import BulkOperationsMixin
-
-        # Create a mock queryset with the mixin
-        class MockQuerySet(BulkOperationsMixin):
-            def __init__(self):
-                self.model = TriggerModel
-
-        queryset = MockQuerySet()
-
-        # Create objects with no primary keys
-        obj1 = TriggerModel(name="No PK Delete 1", value=100, category=self.category1)
-        obj2 = TriggerModel(name="No PK Delete 2", value=200, category=self.category2)
-        obj1.pk = None
-        obj2.pk = None
-
-        # Create the delete_operation function (this is the inner function from bulk_delete)
-        def delete_operation():
-            pks = [obj.pk for obj in [obj1, obj2] if obj.pk is not None]
-            if pks:
-                # Use the base manager to avoid recursion
-                return queryset.model._base_manager.filter(pk__in=pks).delete()[0]
-            else:
-                return 0  # This covers line 306
-
-        # Test the delete_operation function directly
-        result = delete_operation()
-
-        # Verify result is 0 when no objects have valid pks
-        self.assertEqual(result, 0)
-
-    def test_bulk_create_upsert_foreign_key_id_fields(self):
-        """
-        Test upsert logic with ForeignKey _id field handling (covers lines 105-106, 142, 148).
-
-        This tests the _id field handling for ForeignKey relationships in upsert classification.
-        """
-        trigger_calls = []
-
-        @bulk_trigger(TriggerModel, BEFORE_UPDATE)
-        def before_update_trigger(new_instances, original_instances):
-            trigger_calls.append(('before_update', len(new_instances)))
-
-        try:
-            # Create an existing record
-            existing_obj = TriggerModel.objects.create(
-                name="FK ID Test",
-                value=100,
-                category=self.category1,
-                created_by=self.user1
-            )
-
-            # Create upsert object with ForeignKey field set
-            upsert_obj = TriggerModel(
-                name="FK ID Test",  # Same name to match existing
-                value=200,
-                category=self.category1,
-                created_by=self.user1  # Same user
-            )
-
-            # Ensure the ForeignKey _id field is accessible
-            self.assertEqual(upsert_obj.category_id, self.category1.pk)
-            self.assertEqual(upsert_obj.created_by_id, self.user1.pk)
-
-            # Mock Django's bulk_create to simulate successful operation
-            with patch('django.db.models.QuerySet.bulk_create') as mock_bulk_create:
-                mock_bulk_create.return_value = [upsert_obj]
-
-                # Perform upsert using category as unique field (this will use _id field handling)
-                result = TriggerModel.objects.bulk_create(
-                    [upsert_obj],
-                    update_conflicts=True,
-                    update_fields=['value'],
-                    unique_fields=['category']  # Use ForeignKey as unique field
-                )
-
-                # Verify the _id field handling was executed (lines 105-106, 142, 148)
-                # This should trigger the update path since we're matching by category
-                self.assertIn(('before_update', 1), trigger_calls)
-
-        finally:
-            clear_triggers()
-
-    def test_bulk_create_mti_path_mock(self):
-        """
-        Test MTI bulk_create path using mocks (covers line 192).
-
-        This tests the MTI branch in bulk_create when update_conflicts=True.
-        """
-        trigger_calls = []
-
-        @bulk_trigger(TriggerModel, BEFORE_CREATE)
-        def before_create_trigger(new_instances, original_instances):
-            trigger_calls.append(('before_create', len(new_instances)))
-
-        try:
-            # Mock _is_multi_table_inheritance to return True
-            with patch('django_bulk_triggers.queryset.TriggerQuerySetMixin._is_multi_table_inheritance', return_value=True):
-                # Mock _mti_bulk_create to track calls
-                with patch('django_bulk_triggers.queryset.TriggerQuerySetMixin._mti_bulk_create') as mock_mti_create:
-                    mock_mti_create.return_value = [
-                        TriggerModel(name="MTI Mock Test 1", value=100, category=self.category1),
-                        TriggerModel(name="MTI Mock Test 2", value=200, category=self.category2)
-                    ]
-
-                    upsert_objects = [
-                        TriggerModel(name="MTI Mock Test 1", value=100, category=self.category1),
-                        TriggerModel(name="MTI Mock Test 2", value=200, category=self.category2)
-                    ]
-
-                    # This should call the MTI path with upsert parameters
-                    result = TriggerModel.objects.bulk_create(
-                        upsert_objects,
-                        update_conflicts=True,
-                        update_fields=['value'],
-                        unique_fields=['name']
-                    )
-
-                    # Verify _mti_bulk_create was called with upsert parameters
-                    mock_mti_create.assert_called_once()
-                    call_args = mock_mti_create.call_args
-                    self.assertEqual(call_args[0][0], upsert_objects)  # First arg is objects
-                    self.assertIn('existing_records', call_args[1])
-                    self.assertIn('new_records', call_args[1])
-                    self.assertEqual(call_args[1]['update_conflicts'], True)
-                    self.assertEqual(call_args[1]['unique_fields'], ['name'])
-
-        finally:
-            clear_triggers()
-
-    def test_bulk_create_upsert_no_unique_fields(self):
-        """
-        Test bulk_create upsert with no unique_fields specified (covers line 169).
-
-        This tests the case where no unique fields are provided, so all records are treated as new.
-        """
-        trigger_calls = []
-
-        @bulk_trigger(TriggerModel, BEFORE_CREATE)
-        def before_create_trigger(new_instances, original_instances):
-            trigger_calls.append(('before_create', len(new_instances)))
-
-        try:
-            # Create objects for upsert but don't specify unique_fields
-            upsert_objects = [
-                TriggerModel(name="No Unique 1", value=100, category=self.category1),
-                TriggerModel(name="No Unique 2", value=200, category=self.category2)
-            ]
-
-            # Mock Django's bulk_create to simulate successful operation
-            with patch('django.db.models.QuerySet.bulk_create') as mock_bulk_create:
-                mock_bulk_create.return_value = upsert_objects
-
-                # Perform upsert operation without unique_fields - should treat all as new
-                result = TriggerModel.objects.bulk_create(
-                    upsert_objects,
-                    update_conflicts=True,
-                    update_fields=['value']
-                    # Note: no unique_fields specified
-                )
-
-                # Verify all records were treated as new (line 169)
-                self.assertIn(('before_create', 2), trigger_calls)  # All objects treated as creates
-
-        finally:
-            clear_triggers()
-
-    def test_bulk_delete_no_valid_pks_return_zero(self):
-        """
-        Test bulk_delete when objects have no valid primary keys (covers line 306).
-
-        This tests the delete_operation function return path when no objects have valid pks.
-        """
-        from django_bulk_triggers.bulk_operations import BulkOperationsMixin
-
-        # Create a mock queryset with the mixin
-        class MockQuerySet(BulkOperationsMixin):
-            def __init__(self):
-                self.model = TriggerModel
-
-        queryset = MockQuerySet()
-
-        # Create objects with no primary keys
-        obj1 = TriggerModel(name="No PK Delete 1", value=100, category=self.category1)
-        obj2 = TriggerModel(name="No PK Delete 2", value=200, category=self.category2)
-        obj1.pk = None
-        obj2.pk = None
-
-        # Create the delete_operation function (this is the inner function from bulk_delete)
-        def delete_operation():
-            pks = [obj.pk for obj in [obj1, obj2] if obj.pk is not None]
-            if pks:
-                # Use the base manager to avoid recursion
-                return queryset.model._base_manager.filter(pk__in=pks).delete()[0]
-            else:
-                return 0  # This covers line 306
-
-        # Test the delete_operation function directly
-        result = delete_operation()
-
-        # Verify result is 0 when no objects have valid pks
-        self.assertEqual(result, 0)
-
-    def test_bulk_create_upsert_foreign_key_id_fields(self):
-        """
-        Test upsert logic with ForeignKey _id field handling (covers lines 105-106, 142, 148).
-
-        This tests the _id field handling for ForeignKey relationships in upsert classification.
-        """
-        trigger_calls = []
-
-        @bulk_trigger(TriggerModel, BEFORE_UPDATE)
-        def before_update_trigger(new_instances, original_instances):
-            trigger_calls.append(('before_update', len(new_instances)))
-
-        try:
-            # Create an existing record
-            existing_obj = TriggerModel.objects.create(
-                name="FK ID Test",
-                value=100,
-                category=self.category1,
-                created_by=self.user1
-            )
-
-            # Create upsert object with ForeignKey field set
-            upsert_obj = TriggerModel(
-                name="FK ID Test",  # Same name to match existing
-                value=200,
-                category=self.category1,
-                created_by=self.user1  # Same user
-            )
-
-            # Ensure the ForeignKey _id field is accessible
-            self.assertEqual(upsert_obj.category_id, self.category1.pk)
-            self.assertEqual(upsert_obj.created_by_id, self.user1.pk)
-
-            # Mock Django's bulk_create to simulate successful operation
-            with patch('django.db.models.QuerySet.bulk_create') as mock_bulk_create:
-                mock_bulk_create.return_value = [upsert_obj]
-
-                # Perform upsert using category as unique field (this will use _id field handling)
-                result = TriggerModel.objects.bulk_create(
-                    [upsert_obj],
-                    update_conflicts=True,
-                    update_fields=['value'],
-                    unique_fields=['category']  # Use ForeignKey as unique field
-                )
-
-                # Verify the _id field handling was executed (lines 105-106, 142, 148)
-                # This should trigger the update path since we're matching by category
-                self.assertIn(('before_update', 1), trigger_calls)
-
-        finally:
-            clear_triggers()
-
-    def test_bulk_delete_no_objects_return_zero(self):
-        """
-        Test bulk_delete return value when no objects provided (covers line 300).
-
-        This tests the case where the pks list is empty by passing an empty list.
-        """
-        trigger_calls = []
-
-        @bulk_trigger(TriggerModel, BEFORE_DELETE)
-        def before_delete_trigger(new_instances, original_instances):
-            trigger_calls.append(('before_delete', len(new_instances)))
-
-        try:
-            # Test with empty list - should return 0 and not call triggers
-            result = TriggerModel.objects.bulk_delete([])
-
-            # Verify result is 0
-            self.assertEqual(result, 0)
-
-            # Verify no triggers were called
-            self.assertEqual(len(trigger_calls), 0)
-
-        finally:
-            clear_triggers()
-
-    def test_bulk_create_upsert_no_unique_fields(self):
-        """
-        Test bulk_create upsert with no unique_fields specified (covers line 169).
-
-        This tests the case where no unique fields are provided, so all records are treated as new.
-        """
-        trigger_calls = []
-
-        @bulk_trigger(TriggerModel, BEFORE_CREATE)
-        def before_create_trigger(new_instances, original_instances):
-            trigger_calls.append(('before_create', len(new_instances)))
-
-        try:
-            # Create objects for upsert but don't specify unique_fields
-            upsert_objects = [
-                TriggerModel(name="No Unique 1", value=100, category=self.category1),
-                TriggerModel(name="No Unique 2", value=200, category=self.category2)
-            ]
-
-            # Mock Django's bulk_create to simulate successful operation
-            with patch('django.db.models.QuerySet.bulk_create') as mock_bulk_create:
-                mock_bulk_create.return_value = upsert_objects
-
-                # Perform upsert operation without unique_fields - should treat all as new
-                result = TriggerModel.objects.bulk_create(
-                    upsert_objects,
-                    update_conflicts=True,
-                    update_fields=['value']
-                    # Note: no unique_fields specified
-                )
-
-                # Verify all records were treated as new (line 169)
-                self.assertIn(('before_create', 2), trigger_calls)  # All objects treated as creates
-
-        finally:
-            clear_triggers()
-
-    def test_bulk_delete_no_valid_pks_return_zero(self):
-        """
-        Test bulk_delete when objects have no valid primary keys (covers line 306).
-
-        This tests the delete_operation function return path when no objects have valid pks.
-        """
-        from django_bulk_triggers.bulk_operations import BulkOperationsMixin
-
-        # Create a mock queryset with the mixin
-        class MockQuerySet(BulkOperationsMixin):
-            def __init__(self):
-                self.model = TriggerModel
-
-        queryset = MockQuerySet()
-
-        # Create objects with no primary keys
-        obj1 = TriggerModel(name="No PK Delete 1", value=100, category=self.category1)
-        obj2 = TriggerModel(name="No PK Delete 2", value=200, category=self.category2)
-        obj1.pk = None
-        obj2.pk = None
-
-        # Create the delete_operation function (this is the inner function from bulk_delete)
-        def delete_operation():
-            pks = [obj.pk for obj in [obj1, obj2] if obj.pk is not None]
-            if pks:
-                # Use the base manager to avoid recursion
-                return queryset.model._base_manager.filter(pk__in=pks).delete()[0]
-            else:
-                return 0  # This covers line 306
-
-        # Test the delete_operation function directly
-        result = delete_operation()
-
-        # Verify result is 0 when no objects have valid pks
-        self.assertEqual(result, 0)
-
-    def test_bulk_create_upsert_foreign_key_id_fields(self):
-        """
-        Test upsert logic with ForeignKey _id field handling (covers lines 105-106, 142, 148).
-
-        This tests the _id field handling for ForeignKey relationships in upsert classification.
-        """
-        trigger_calls = []
-
-        @bulk_trigger(TriggerModel, BEFORE_UPDATE)
-        def before_update_trigger(new_instances, original_instances):
-            trigger_calls.append(('before_update', len(new_instances)))
-
-        try:
-            # Create an existing record
-            existing_obj = TriggerModel.objects.create(
-                name="FK ID Test",
-                value=100,
-                category=self.category1,
-                created_by=self.user1
-            )
-
-            # Create upsert object with ForeignKey field set
-            upsert_obj = TriggerModel(
-                name="FK ID Test",  # Same name to match existing
-                value=200,
-                category=self.category1,
-                created_by=self.user1  # Same user
-            )
-
-            # Ensure the ForeignKey _id field is accessible
-            self.assertEqual(upsert_obj.category_id, self.category1.pk)
-            self.assertEqual(upsert_obj.created_by_id, self.user1.pk)
-
-            # Mock Django's bulk_create to simulate successful operation
-            with patch('django.db.models.QuerySet.bulk_create') as mock_bulk_create:
-                mock_bulk_create.return_value = [upsert_obj]
-
-                # Perform upsert using category as unique field (this will use _id field handling)
-                result = TriggerModel.objects.bulk_create(
-                    [upsert_obj],
-                    update_conflicts=True,
-                    update_fields=['value'],
-                    unique_fields=['category']  # Use ForeignKey as unique field
-                )
-
-                # Verify the _id field handling was executed (lines 105-106, 142, 148)
-                # This should trigger the update path since we're matching by category
-                self.assertIn(('before_update', 1), trigger_calls)
-
-        finally:
-            clear_triggers()
-
-    def test_bulk_create_upsert_logic_mock_database(self):
-        """
-        Test bulk_create upsert logic using mocks to cover lines 93-181.
-
-        This tests the upsert classification logic without requiring database upsert support.
-        """
-        trigger_calls = []
-
-        @bulk_trigger(TriggerModel, BEFORE_CREATE)
-        def before_create_trigger(new_instances, original_instances):
-            trigger_calls.append(('before_create', len(new_instances)))
-
-        @bulk_trigger(TriggerModel, BEFORE_UPDATE)
-        def before_update_trigger(new_instances, original_instances):
-            trigger_calls.append(('before_update', len(new_instances)))
-
-        @bulk_trigger(TriggerModel, VALIDATE_CREATE)
-        def validate_create_trigger(new_instances, original_instances):
-            trigger_calls.append(('validate_create', len(new_instances)))
-
-        @bulk_trigger(TriggerModel, VALIDATE_UPDATE)
-        def validate_update_trigger(new_instances, original_instances):
-            trigger_calls.append(('validate_update', len(new_instances)))
-
-        try:
-            # Create an existing record
-            existing_obj = TriggerModel.objects.create(
-                name="Existing Mock",
-                value=100,
-                category=self.category1
-            )
-
-            # Create objects for upsert - one existing (by name), one new
-            upsert_objects = [
-                TriggerModel(
-                    name="Existing Mock",  # This will be classified as existing
-                    value=999,
-                    category=self.category1
-                ),
-                TriggerModel(
-                    name="New Mock",  # This will be classified as new
-                    value=200,
-                    category=self.category2
-                )
-            ]
-
-            # Mock Django's bulk_create to avoid database-specific upsert requirements
-            with patch('django.db.models.QuerySet.bulk_create') as mock_bulk_create:
-                mock_bulk_create.return_value = upsert_objects
-
-                # Perform upsert operation - this will trigger the classification logic
-                result = TriggerModel.objects.bulk_create(
-                    upsert_objects,
-                    update_conflicts=True,
-                    update_fields=['value'],
-                    unique_fields=['name']  # Use name as unique field
-                )
-
-                # Verify the classification logic was executed
-                # We should have triggers for both create and update operations
-                self.assertIn(('validate_create', 1), trigger_calls)  # New object
-                self.assertIn(('validate_update', 1), trigger_calls)  # Existing object
-                self.assertIn(('before_create', 1), trigger_calls)    # New object
-                self.assertIn(('before_update', 1), trigger_calls)    # Existing object
-
-        finally:
-            clear_triggers()
-
-    def test_bulk_create_upsert_no_unique_fields(self):
-        """
-        Test bulk_create upsert with no unique_fields specified (covers line 169).
-
-        This tests the case where no unique fields are provided, so all records are treated as new.
-        """
-        trigger_calls = []
-
-        @bulk_trigger(TriggerModel, BEFORE_CREATE)
-        def before_create_trigger(new_instances, original_instances):
-            trigger_calls.append(('before_create', len(new_instances)))
-
-        try:
-            # Create objects for upsert but don't specify unique_fields
-            upsert_objects = [
-                TriggerModel(name="No Unique 1", value=100, category=self.category1),
-                TriggerModel(name="No Unique 2", value=200, category=self.category2)
-            ]
-
-            # Mock Django's bulk_create to simulate successful operation
-            with patch('django.db.models.QuerySet.bulk_create') as mock_bulk_create:
-                mock_bulk_create.return_value = upsert_objects
-
-                # Perform upsert operation without unique_fields - should treat all as new
-                result = TriggerModel.objects.bulk_create(
-                    upsert_objects,
-                    update_conflicts=True,
-                    update_fields=['value']
-                    # Note: no unique_fields specified
-                )
-
-                # Verify all records were treated as new (line 169)
-                self.assertIn(('before_create', 2), trigger_calls)  # All objects treated as creates
-
-        finally:
-            clear_triggers()
-
-    def test_bulk_delete_no_valid_pks_return_zero(self):
-        """
-        Test bulk_delete when objects have no valid primary keys (covers line 306).
-
-        This tests the delete_operation function return path when no objects have valid pks.
-        """
-        from django_bulk_triggers.bulk_operations import BulkOperationsMixin
-
-        # Create a mock queryset with the mixin
-        class MockQuerySet(BulkOperationsMixin):
-            def __init__(self):
-                self.model = TriggerModel
-
-        queryset = MockQuerySet()
-
-        # Create objects with no primary keys
-        obj1 = TriggerModel(name="No PK Delete 1", value=100, category=self.category1)
-        obj2 = TriggerModel(name="No PK Delete 2", value=200, category=self.category2)
-        obj1.pk = None
-        obj2.pk = None
-
-        # Create the delete_operation function (this is the inner function from bulk_delete)
-        def delete_operation():
-            pks = [obj.pk for obj in [obj1, obj2] if obj.pk is not None]
-            if pks:
-                # Use the base manager to avoid recursion
-                return queryset.model._base_manager.filter(pk__in=pks).delete()[0]
-            else:
-                return 0  # This covers line 306
-
-        # Test the delete_operation function directly
-        result = delete_operation()
-
-        # Verify result is 0 when no objects have valid pks
-        self.assertEqual(result, 0)
-
-    def test_bulk_create_upsert_foreign_key_id_fields(self):
-        """
-        Test upsert logic with ForeignKey _id field handling (covers lines 105-106, 142, 148).
-
-        This tests the _id field handling for ForeignKey relationships in upsert classification.
-        """
-        trigger_calls = []
-
-        @bulk_trigger(TriggerModel, BEFORE_UPDATE)
-        def before_update_trigger(new_instances, original_instances):
-            trigger_calls.append(('before_update', len(new_instances)))
-
-        try:
-            # Create an existing record
-            existing_obj = TriggerModel.objects.create(
-                name="FK ID Test",
-                value=100,
-                category=self.category1,
-                created_by=self.user1
-            )
-
-            # Create upsert object with ForeignKey field set
-            upsert_obj = TriggerModel(
-                name="FK ID Test",  # Same name to match existing
-                value=200,
-                category=self.category1,
-                created_by=self.user1  # Same user
-            )
-
-            # Ensure the ForeignKey _id field is accessible
-            self.assertEqual(upsert_obj.category_id, self.category1.pk)
-            self.assertEqual(upsert_obj.created_by_id, self.user1.pk)
-
-            # Mock Django's bulk_create to simulate successful operation
-            with patch('django.db.models.QuerySet.bulk_create') as mock_bulk_create:
-                mock_bulk_create.return_value = [upsert_obj]
-
-                # Perform upsert using category as unique field (this will use _id field handling)
-                result = TriggerModel.objects.bulk_create(
-                    [upsert_obj],
-                    update_conflicts=True,
-                    update_fields=['value'],
-                    unique_fields=['category']  # Use ForeignKey as unique field
-                )
-
-                # Verify the _id field handling was executed (lines 105-106, 142, 148)
-                # This should trigger the update path since we're matching by category
-                self.assertIn(('before_update', 1), trigger_calls)
-
-        finally:
-            clear_triggers()
-
-    def test_bulk_create_after_triggers_upsert_mock(self):
-        """
-        Test AFTER triggers for upsert operations using mocks (covers lines 240-241).
-
-        This specifically tests the AFTER trigger logic for mixed create/update operations.
-        """
-        trigger_calls = []
-
-        @bulk_trigger(TriggerModel, AFTER_CREATE)
-        def after_create_trigger(new_instances, original_instances):
-            trigger_calls.append(('after_create', len(new_instances)))
-
-        @bulk_trigger(TriggerModel, AFTER_UPDATE)
-        def after_update_trigger(new_instances, original_instances):
-            trigger_calls.append(('after_update', len(new_instances)))
-
-        try:
-            # Create an existing record
-            existing_obj = TriggerModel.objects.create(
-                name="Existing After Test",
-                value=100,
-                category=self.category1
-            )
-
-            # Create objects for upsert
-            upsert_objects = [
-                TriggerModel(name="Existing After Test", value=200, category=self.category1),  # Update
-                TriggerModel(name="New After Test", value=300, category=self.category2)        # Create
-            ]
-
-            # Mock Django's bulk_create to simulate successful operation
-            with patch('django.db.models.QuerySet.bulk_create') as mock_bulk_create:
-                mock_bulk_create.return_value = upsert_objects
-
-                # Perform upsert - this should trigger AFTER triggers for both operations
-                result = TriggerModel.objects.bulk_create(
-                    upsert_objects,
-                    update_conflicts=True,
-                    update_fields=['value'],
-                    unique_fields=['name']
-                )
-
-                # Verify AFTER triggers were called for both operations
-                self.assertIn(('after_create', 1), trigger_calls)  # New record
-                self.assertIn(('after_update', 1), trigger_calls)  # Existing record
-
-        finally:
-            clear_triggers()
-
-    def test_bulk_create_upsert_no_unique_fields(self):
-        """
-        Test bulk_create upsert with no unique_fields specified (covers line 169).
-
-        This tests the case where no unique fields are provided, so all records are treated as new.
-        """
-        trigger_calls = []
-
-        @bulk_trigger(TriggerModel, BEFORE_CREATE)
-        def before_create_trigger(new_instances, original_instances):
-            trigger_calls.append(('before_create', len(new_instances)))
-
-        try:
-            # Create objects for upsert but don't specify unique_fields
-            upsert_objects = [
-                TriggerModel(name="No Unique 1", value=100, category=self.category1),
-                TriggerModel(name="No Unique 2", value=200, category=self.category2)
-            ]
-
-            # Mock Django's bulk_create to simulate successful operation
-            with patch('django.db.models.QuerySet.bulk_create') as mock_bulk_create:
-                mock_bulk_create.return_value = upsert_objects
-
-                # Perform upsert operation without unique_fields - should treat all as new
-                result = TriggerModel.objects.bulk_create(
-                    upsert_objects,
-                    update_conflicts=True,
-                    update_fields=['value']
-                    # Note: no unique_fields specified
-                )
-
-                # Verify all records were treated as new (line 169)
-                self.assertIn(('before_create', 2), trigger_calls)  # All objects treated as creates
-
-        finally:
-            clear_triggers()
-
-    def test_bulk_delete_no_valid_pks_return_zero(self):
-        """
-        Test bulk_delete when objects have no valid primary keys (covers line 306).
-
-        This tests the delete_operation function return path when no objects have valid pks.
-        """
-        from django_bulk_triggers.bulk_operations import BulkOperationsMixin
-
-        # Create a mock queryset with the mixin
-        class MockQuerySet(BulkOperationsMixin):
-            def __init__(self):
-                self.model = TriggerModel
-
-        queryset = MockQuerySet()
-
-        # Create objects with no primary keys
-        obj1 = TriggerModel(name="No PK Delete 1", value=100, category=self.category1)
-        obj2 = TriggerModel(name="No PK Delete 2", value=200, category=self.category2)
-        obj1.pk = None
-        obj2.pk = None
-
-        # Create the delete_operation function (this is the inner function from bulk_delete)
-        def delete_operation():
-            pks = [obj.pk for obj in [obj1, obj2] if obj.pk is not None]
-            if pks:
-                # Use the base manager to avoid recursion
-                return queryset.model._base_manager.filter(pk__in=pks).delete()[0]
-            else:
-                return 0  # This covers line 306
-
-        # Test the delete_operation function directly
-        result = delete_operation()
-
-        # Verify result is 0 when no objects have valid pks
-        self.assertEqual(result, 0)
-
-    def test_bulk_create_upsert_foreign_key_id_fields(self):
-        """
-        Test upsert logic with ForeignKey _id field handling (covers lines 105-106, 142, 148).
-
-        This tests the _id field handling for ForeignKey relationships in upsert classification.
-        """
-        trigger_calls = []
-
-        @bulk_trigger(TriggerModel, BEFORE_UPDATE)
-        def before_update_trigger(new_instances, original_instances):
-            trigger_calls.append(('before_update', len(new_instances)))
-
-        try:
-            # Create an existing record
-            existing_obj = TriggerModel.objects.create(
-                name="FK ID Test",
-                value=100,
-                category=self.category1,
-                created_by=self.user1
-            )
-
-            # Create upsert object with ForeignKey field set
-            upsert_obj = TriggerModel(
-                name="FK ID Test",  # Same name to match existing
-                value=200,
-                category=self.category1,
-                created_by=self.user1  # Same user
-            )
-
-            # Ensure the ForeignKey _id field is accessible
-            self.assertEqual(upsert_obj.category_id, self.category1.pk)
-            self.assertEqual(upsert_obj.created_by_id, self.user1.pk)
-
-            # Mock Django's bulk_create to simulate successful operation
-            with patch('django.db.models.QuerySet.bulk_create') as mock_bulk_create:
-                mock_bulk_create.return_value = [upsert_obj]
-
-                # Perform upsert using category as unique field (this will use _id field handling)
-                result = TriggerModel.objects.bulk_create(
-                    [upsert_obj],
-                    update_conflicts=True,
-                    update_fields=['value'],
-                    unique_fields=['category']  # Use ForeignKey as unique field
-                )
-
-                # Verify the _id field handling was executed (lines 105-106, 142, 148)
-                # This should trigger the update path since we're matching by category
-                self.assertIn(('before_update', 1), trigger_calls)
-
-        finally:
-            clear_triggers()
-
-    def test_bulk_create_mti_path_mock(self):
-        """
-        Test MTI bulk_create path using mocks (covers line 192).
-
-        This tests the MTI branch in bulk_create when update_conflicts=True.
-        """
-        trigger_calls = []
-
-        @bulk_trigger(TriggerModel, BEFORE_CREATE)
-        def before_create_trigger(new_instances, original_instances):
-            trigger_calls.append(('before_create', len(new_instances)))
-
-        try:
-            # Mock _is_multi_table_inheritance to return True
-            with patch('django_bulk_triggers.queryset.TriggerQuerySetMixin._is_multi_table_inheritance', return_value=True):
-                # Mock _mti_bulk_create to track calls
-                with patch('django_bulk_triggers.queryset.TriggerQuerySetMixin._mti_bulk_create') as mock_mti_create:
-                    mock_mti_create.return_value = [
-                        TriggerModel(name="MTI Mock Test 1", value=100, category=self.category1),
-                        TriggerModel(name="MTI Mock Test 2", value=200, category=self.category2)
-                    ]
-
-                    upsert_objects = [
-                        TriggerModel(name="MTI Mock Test 1", value=100, category=self.category1),
-                        TriggerModel(name="MTI Mock Test 2", value=200, category=self.category2)
-                    ]
-
-                    # This should call the MTI path with upsert parameters
-                    result = TriggerModel.objects.bulk_create(
-                        upsert_objects,
-                        update_conflicts=True,
-                        update_fields=['value'],
-                        unique_fields=['name']
-                    )
-
-                    # Verify _mti_bulk_create was called with upsert parameters
-                    mock_mti_create.assert_called_once()
-                    call_args = mock_mti_create.call_args
-                    self.assertEqual(call_args[0][0], upsert_objects)  # First arg is objects
-                    self.assertIn('existing_records', call_args[1])
-                    self.assertIn('new_records', call_args[1])
-                    self.assertEqual(call_args[1]['update_conflicts'], True)
-                    self.assertEqual(call_args[1]['unique_fields'], ['name'])
-
-        finally:
-            clear_triggers()
-
-    def test_bulk_create_upsert_no_unique_fields(self):
-        """
-        Test bulk_create upsert with no unique_fields specified (covers line 169).
-
-        This tests the case where no unique fields are provided, so all records are treated as new.
-        """
-        trigger_calls = []
-
-        @bulk_trigger(TriggerModel, BEFORE_CREATE)
-        def before_create_trigger(new_instances, original_instances):
-            trigger_calls.append(('before_create', len(new_instances)))
-
-        try:
-            # Create objects for upsert but don't specify unique_fields
-            upsert_objects = [
-                TriggerModel(name="No Unique 1", value=100, category=self.category1),
-                TriggerModel(name="No Unique 2", value=200, category=self.category2)
-            ]
-
-            # Mock Django's bulk_create to simulate successful operation
-            with patch('django.db.models.QuerySet.bulk_create') as mock_bulk_create:
-                mock_bulk_create.return_value = upsert_objects
-
-                # Perform upsert operation without unique_fields - should treat all as new
-                result = TriggerModel.objects.bulk_create(
-                    upsert_objects,
-                    update_conflicts=True,
-                    update_fields=['value']
-                    # Note: no unique_fields specified
-                )
-
-                # Verify all records were treated as new (line 169)
-                self.assertIn(('before_create', 2), trigger_calls)  # All objects treated as creates
-
-        finally:
-            clear_triggers()
-
-    def test_bulk_delete_no_valid_pks_return_zero(self):
-        """
-        Test bulk_delete when objects have no valid primary keys (covers line 306).
-
-        This tests the delete_operation function return path when no objects have valid pks.
-        """
-        from django_bulk_triggers.bulk_operations import BulkOperationsMixin
-
-        # Create a mock queryset with the mixin
-        class MockQuerySet(BulkOperationsMixin):
-            def __init__(self):
-                self.model = TriggerModel
-
-        queryset = MockQuerySet()
-
-        # Create objects with no primary keys
-        obj1 = TriggerModel(name="No PK Delete 1", value=100, category=self.category1)
-        obj2 = TriggerModel(name="No PK Delete 2", value=200, category=self.category2)
-        obj1.pk = None
-        obj2.pk = None
-
-        # Create the delete_operation function (this is the inner function from bulk_delete)
-        def delete_operation():
-            pks = [obj.pk for obj in [obj1, obj2] if obj.pk is not None]
-            if pks:
-                # Use the base manager to avoid recursion
-                return queryset.model._base_manager.filter(pk__in=pks).delete()[0]
-            else:
-                return 0  # This covers line 306
-
-        # Test the delete_operation function directly
-        result = delete_operation()
-
-        # Verify result is 0 when no objects have valid pks
-        self.assertEqual(result, 0)
-
-    def test_bulk_create_upsert_foreign_key_id_fields(self):
-        """
-        Test upsert logic with ForeignKey _id field handling (covers lines 105-106, 142, 148).
-
-        This tests the _id field handling for ForeignKey relationships in upsert classification.
-        """
-        trigger_calls = []
-
-        @bulk_trigger(TriggerModel, BEFORE_UPDATE)
-        def before_update_trigger(new_instances, original_instances):
-            trigger_calls.append(('before_update', len(new_instances)))
-
-        try:
-            # Create an existing record
-            existing_obj = TriggerModel.objects.create(
-                name="FK ID Test",
-                value=100,
-                category=self.category1,
-                created_by=self.user1
-            )
-
-            # Create upsert object with ForeignKey field set
-            upsert_obj = TriggerModel(
-                name="FK ID Test",  # Same name to match existing
-                value=200,
-                category=self.category1,
-                created_by=self.user1  # Same user
-            )
-
-            # Ensure the ForeignKey _id field is accessible
-            self.assertEqual(upsert_obj.category_id, self.category1.pk)
-            self.assertEqual(upsert_obj.created_by_id, self.user1.pk)
-
-            # Mock Django's bulk_create to simulate successful operation
-            with patch('django.db.models.QuerySet.bulk_create') as mock_bulk_create:
-                mock_bulk_create.return_value = [upsert_obj]
-
-                # Perform upsert using category as unique field (this will use _id field handling)
-                result = TriggerModel.objects.bulk_create(
-                    [upsert_obj],
-                    update_conflicts=True,
-                    update_fields=['value'],
-                    unique_fields=['category']  # Use ForeignKey as unique field
-                )
-
-                # Verify the _id field handling was executed (lines 105-106, 142, 148)
-                # This should trigger the update path since we're matching by category
-                self.assertIn(('before_update', 1), trigger_calls)
-
-        finally:
-            clear_triggers()
-
-    def test_apply_custom_update_fields_empty_list(self):
-        """
-        Test _apply_custom_update_fields with empty custom_update_fields (covers line 323).
-
-        This tests the early return when custom_update_fields is empty.
-        """
-        from django_bulk_triggers.bulk_operations import BulkOperationsMixin
-
-        # Create a mock queryset with the mixin
-        class MockQuerySet(BulkOperationsMixin):
-            def __init__(self):
-                self.model = TriggerModel
-
-        queryset = MockQuerySet()
-
-        # Create test objects
-        obj1 = TriggerModel.objects.create(name="Custom Fields Test 1", value=100, category=self.category1)
-        obj2 = TriggerModel.objects.create(name="Custom Fields Test 2", value=200, category=self.category2)
-
-        # Test with empty custom_update_fields - should return immediately
-        fields_set = {'value', 'name'}
-        result = queryset._apply_custom_update_fields([obj1, obj2], [], fields_set)
-
-        # Verify method returns None (early return)
-        self.assertIsNone(result)
-
-        # Verify fields_set was not modified
-        self.assertEqual(fields_set, {'value', 'name'})
-
-    def test_bulk_create_upsert_with_all_new_records(self):
-        """
-        Test bulk_create upsert logic when all records are new (covers lines 168-169).
-
-        This tests the case where no existing records are found.
-        """
-        # Mock Django's bulk_create to avoid database-specific upsert requirements
-
-        trigger_calls = []
-
-        @bulk_trigger(TriggerModel, BEFORE_CREATE)
-        def before_create_trigger(new_instances, original_instances):
-            trigger_calls.append(('before_create', len(new_instances)))
-
-        try:
-            # Create objects that don't exist in database
-            upsert_objects = [
-                TriggerModel(name="All New 1", value=100, category=self.category1),
-                TriggerModel(name="All New 2", value=200, category=self.category2)
-            ]
-
-            # Mock Django's bulk_create to simulate upsert behavior
-            with patch('django.db.models.QuerySet.bulk_create') as mock_bulk_create:
-                mock_bulk_create.return_value = upsert_objects
-
-                # Perform upsert - all records should be treated as new
-                result = TriggerModel.objects.bulk_create(
-                    upsert_objects,
-                    update_conflicts=True,
-                    update_fields=['value'],
-                    unique_fields=['name']
-                )
-
-                # Verify only BEFORE_CREATE trigger was called (all records are new)
-                self.assertEqual(len(trigger_calls), 1)
-                self.assertEqual(trigger_calls[0], ('before_create', 2))
-
-        finally:
-            clear_triggers()
-
-    def test_bulk_create_upsert_no_unique_fields(self):
-        """
-        Test bulk_create upsert with no unique_fields specified (covers line 169).
-
-        This tests the case where no unique fields are provided, so all records are treated as new.
-        """
-        trigger_calls = []
-
-        @bulk_trigger(TriggerModel, BEFORE_CREATE)
-        def before_create_trigger(new_instances, original_instances):
-            trigger_calls.append(('before_create', len(new_instances)))
-
-        try:
-            # Create objects for upsert but don't specify unique_fields
-            upsert_objects = [
-                TriggerModel(name="No Unique 1", value=100, category=self.category1),
-                TriggerModel(name="No Unique 2", value=200, category=self.category2)
-            ]
-
-            # Mock Django's bulk_create to simulate successful operation
-            with patch('django.db.models.QuerySet.bulk_create') as mock_bulk_create:
-                mock_bulk_create.return_value = upsert_objects
-
-                # Perform upsert operation without unique_fields - should treat all as new
-                result = TriggerModel.objects.bulk_create(
-                    upsert_objects,
-                    update_conflicts=True,
-                    update_fields=['value']
-                    # Note: no unique_fields specified
-                )
-
-                # Verify all records were treated as new (line 169)
-                self.assertIn(('before_create', 2), trigger_calls)  # All objects treated as creates
-
-        finally:
-            clear_triggers()
-
-    def test_bulk_delete_no_valid_pks_return_zero(self):
-        """
-        Test bulk_delete when objects have no valid primary keys (covers line 306).
-
-        This tests the delete_operation function return path when no objects have valid pks.
-        """
-        from django_bulk_triggers.bulk_operations import BulkOperationsMixin
-
-        # Create a mock queryset with the mixin
-        class MockQuerySet(BulkOperationsMixin):
-            def __init__(self):
-                self.model = TriggerModel
-
-        queryset = MockQuerySet()
-
-        # Create objects with no primary keys
-        obj1 = TriggerModel(name="No PK Delete 1", value=100, category=self.category1)
-        obj2 = TriggerModel(name="No PK Delete 2", value=200, category=self.category2)
-        obj1.pk = None
-        obj2.pk = None
-
-        # Create the delete_operation function (this is the inner function from bulk_delete)
-        def delete_operation():
-            pks = [obj.pk for obj in [obj1, obj2] if obj.pk is not None]
-            if pks:
-                # Use the base manager to avoid recursion
-                return queryset.model._base_manager.filter(pk__in=pks).delete()[0]
-            else:
-                return 0  # This covers line 306
-
-        # Test the delete_operation function directly
-        result = delete_operation()
-
-        # Verify result is 0 when no objects have valid pks
-        self.assertEqual(result, 0)
-
-    def test_bulk_create_upsert_foreign_key_id_fields(self):
-        """
-        Test upsert logic with ForeignKey _id field handling (covers lines 105-106, 142, 148).
-
-        This tests the _id field handling for ForeignKey relationships in upsert classification.
-        """
-        trigger_calls = []
-
-        @bulk_trigger(TriggerModel, BEFORE_UPDATE)
-        def before_update_trigger(new_instances, original_instances):
-            trigger_calls.append(('before_update', len(new_instances)))
-
-        try:
-            # Create an existing record
-            existing_obj = TriggerModel.objects.create(
-                name="FK ID Test",
-                value=100,
-                category=self.category1,
-                created_by=self.user1
-            )
-
-            # Create upsert object with ForeignKey field set
-            upsert_obj = TriggerModel(
-                name="FK ID Test",  # Same name to match existing
-                value=200,
-                category=self.category1,
-                created_by=self.user1  # Same user
-            )
-
-            # Ensure the ForeignKey _id field is accessible
-            self.assertEqual(upsert_obj.category_id, self.category1.pk)
-            self.assertEqual(upsert_obj.created_by_id, self.user1.pk)
-
-            # Mock Django's bulk_create to simulate successful operation
-            with patch('django.db.models.QuerySet.bulk_create') as mock_bulk_create:
-                mock_bulk_create.return_value = [upsert_obj]
-
-                # Perform upsert using category as unique field (this will use _id field handling)
-                result = TriggerModel.objects.bulk_create(
-                    [upsert_obj],
-                    update_conflicts=True,
-                    update_fields=['value'],
-                    unique_fields=['category']  # Use ForeignKey as unique field
-                )
-
-                # Verify the _id field handling was executed (lines 105-106, 142, 148)
-                # This should trigger the update path since we're matching by category
-                self.assertIn(('before_update', 1), trigger_calls)
-
-        finally:
-            clear_triggers()
-
-    def test_bulk_create_upsert_logic_mock_database(self):
-        """
-        Test bulk_create upsert logic using mocks to cover lines 93-181.
-
-        This tests the upsert classification logic without requiring database upsert support.
-        """
-        trigger_calls = []
-
-        @bulk_trigger(TriggerModel, BEFORE_CREATE)
-        def before_create_trigger(new_instances, original_instances):
-            trigger_calls.append(('before_create', len(new_instances)))
-
-        @bulk_trigger(TriggerModel, BEFORE_UPDATE)
-        def before_update_trigger(new_instances, original_instances):
-            trigger_calls.append(('before_update', len(new_instances)))
-
-        @bulk_trigger(TriggerModel, VALIDATE_CREATE)
-        def validate_create_trigger(new_instances, original_instances):
-            trigger_calls.append(('validate_create', len(new_instances)))
-
-        @bulk_trigger(TriggerModel, VALIDATE_UPDATE)
-        def validate_update_trigger(new_instances, original_instances):
-            trigger_calls.append(('validate_update', len(new_instances)))
-
-        try:
-            # Create an existing record
-            existing_obj = TriggerModel.objects.create(
-                name="Existing Mock",
-                value=100,
-                category=self.category1
-            )
-
-            # Create objects for upsert - one existing (by name), one new
-            upsert_objects = [
-                TriggerModel(
-                    name="Existing Mock",  # This will be classified as existing
-                    value=999,
-                    category=self.category1
-                ),
-                TriggerModel(
-                    name="New Mock",  # This will be classified as new
-                    value=200,
-                    category=self.category2
-                )
-            ]
-
-            # Mock Django's bulk_create to avoid database-specific upsert requirements
-            with patch('django.db.models.QuerySet.bulk_create') as mock_bulk_create:
-                mock_bulk_create.return_value = upsert_objects
-
-                # Perform upsert operation - this will trigger the classification logic
-                result = TriggerModel.objects.bulk_create(
-                    upsert_objects,
-                    update_conflicts=True,
-                    update_fields=['value'],
-                    unique_fields=['name']  # Use name as unique field
-                )
-
-                # Verify the classification logic was executed
-                # We should have triggers for both create and update operations
-                self.assertIn(('validate_create', 1), trigger_calls)  # New object
-                self.assertIn(('validate_update', 1), trigger_calls)  # Existing object
-                self.assertIn(('before_create', 1), trigger_calls)    # New object
-                self.assertIn(('before_update', 1), trigger_calls)    # Existing object
-
-        finally:
-            clear_triggers()
-
-    def test_bulk_create_upsert_no_unique_fields(self):
-        """
-        Test bulk_create upsert with no unique_fields specified (covers line 169).
-
-        This tests the case where no unique fields are provided, so all records are treated as new.
-        """
-        trigger_calls = []
-
-        @bulk_trigger(TriggerModel, BEFORE_CREATE)
-        def before_create_trigger(new_instances, original_instances):
-            trigger_calls.append(('before_create', len(new_instances)))
-
-        try:
-            # Create objects for upsert but don't specify unique_fields
-            upsert_objects = [
-                TriggerModel(name="No Unique 1", value=100, category=self.category1),
-                TriggerModel(name="No Unique 2", value=200, category=self.category2)
-            ]
-
-            # Mock Django's bulk_create to simulate successful operation
-            with patch('django.db.models.QuerySet.bulk_create') as mock_bulk_create:
-                mock_bulk_create.return_value = upsert_objects
-
-                # Perform upsert operation without unique_fields - should treat all as new
-                result = TriggerModel.objects.bulk_create(
-                    upsert_objects,
-                    update_conflicts=True,
-                    update_fields=['value']
-                    # Note: no unique_fields specified
-                )
-
-                # Verify all records were treated as new (line 169)
-                self.assertIn(('before_create', 2), trigger_calls)  # All objects treated as creates
-
-        finally:
-            clear_triggers()
-
-    def test_bulk_delete_no_valid_pks_return_zero(self):
-        """
-        Test bulk_delete when objects have no valid primary keys (covers line 306).
-
-        This tests the delete_operation function return path when no objects have valid pks.
-        """
-        from django_bulk_triggers.bulk_operations import BulkOperationsMixin
-
-        # Create a mock queryset with the mixin
-        class MockQuerySet(BulkOperationsMixin):
-            def __init__(self):
-                self.model = TriggerModel
-
-        queryset = MockQuerySet()
-
-        # Create objects with no primary keys
-        obj1 = TriggerModel(name="No PK Delete 1", value=100, category=self.category1)
-        obj2 = TriggerModel(name="No PK Delete 2", value=200, category=self.category2)
-        obj1.pk = None
-        obj2.pk = None
-
-        # Create the delete_operation function (this is the inner function from bulk_delete)
-        def delete_operation():
-            pks = [obj.pk for obj in [obj1, obj2] if obj.pk is not None]
-            if pks:
-                # Use the base manager to avoid recursion
-                return queryset.model._base_manager.filter(pk__in=pks).delete()[0]
-            else:
-                return 0  # This covers line 306
-
-        # Test the delete_operation function directly
-        result = delete_operation()
-
-        # Verify result is 0 when no objects have valid pks
-        self.assertEqual(result, 0)
-
-    def test_bulk_create_upsert_foreign_key_id_fields(self):
-        """
-        Test upsert logic with ForeignKey _id field handling (covers lines 105-106, 142, 148).
-
-        This tests the _id field handling for ForeignKey relationships in upsert classification.
-        """
-        trigger_calls = []
-
-        @bulk_trigger(TriggerModel, BEFORE_UPDATE)
-        def before_update_trigger(new_instances, original_instances):
-            trigger_calls.append(('before_update', len(new_instances)))
-
-        try:
-            # Create an existing record
-            existing_obj = TriggerModel.objects.create(
-                name="FK ID Test",
-                value=100,
-                category=self.category1,
-                created_by=self.user1
-            )
-
-            # Create upsert object with ForeignKey field set
-            upsert_obj = TriggerModel(
-                name="FK ID Test",  # Same name to match existing
-                value=200,
-                category=self.category1,
-                created_by=self.user1  # Same user
-            )
-
-            # Ensure the ForeignKey _id field is accessible
-            self.assertEqual(upsert_obj.category_id, self.category1.pk)
-            self.assertEqual(upsert_obj.created_by_id, self.user1.pk)
-
-            # Mock Django's bulk_create to simulate successful operation
-            with patch('django.db.models.QuerySet.bulk_create') as mock_bulk_create:
-                mock_bulk_create.return_value = [upsert_obj]
-
-                # Perform upsert using category as unique field (this will use _id field handling)
-                result = TriggerModel.objects.bulk_create(
-                    [upsert_obj],
-                    update_conflicts=True,
-                    update_fields=['value'],
-                    unique_fields=['category']  # Use ForeignKey as unique field
-                )
-
-                # Verify the _id field handling was executed (lines 105-106, 142, 148)
-                # This should trigger the update path since we're matching by category
-                self.assertIn(('before_update', 1), trigger_calls)
-
-        finally:
-            clear_triggers()
-
-    def test_bulk_create_after_triggers_upsert_mock(self):
-        """
-        Test AFTER triggers for upsert operations using mocks (covers lines 240-241).
-
-        This specifically tests the AFTER trigger logic for mixed create/update operations.
-        """
-        trigger_calls = []
-
-        @bulk_trigger(TriggerModel, AFTER_CREATE)
-        def after_create_trigger(new_instances, original_instances):
-            trigger_calls.append(('after_create', len(new_instances)))
-
-        @bulk_trigger(TriggerModel, AFTER_UPDATE)
-        def after_update_trigger(new_instances, original_instances):
-            trigger_calls.append(('after_update', len(new_instances)))
-
-        try:
-            # Create an existing record
-            existing_obj = TriggerModel.objects.create(
-                name="Existing After Test",
-                value=100,
-                category=self.category1
-            )
-
-            # Create objects for upsert
-            upsert_objects = [
-                TriggerModel(name="Existing After Test", value=200, category=self.category1),  # Update
-                TriggerModel(name="New After Test", value=300, category=self.category2)        # Create
-            ]
-
-            # Mock Django's bulk_create to simulate successful operation
-            with patch('django.db.models.QuerySet.bulk_create') as mock_bulk_create:
-                mock_bulk_create.return_value = upsert_objects
-
-                # Perform upsert - this should trigger AFTER triggers for both operations
-                result = TriggerModel.objects.bulk_create(
-                    upsert_objects,
-                    update_conflicts=True,
-                    update_fields=['value'],
-                    unique_fields=['name']
-                )
-
-                # Verify AFTER triggers were called for both operations
-                self.assertIn(('after_create', 1), trigger_calls)  # New record
-                self.assertIn(('after_update', 1), trigger_calls)  # Existing record
-
-        finally:
-            clear_triggers()
-
-    def test_bulk_create_upsert_no_unique_fields(self):
-        """
-        Test bulk_create upsert with no unique_fields specified (covers line 169).
-
-        This tests the case where no unique fields are provided, so all records are treated as new.
-        """
-        trigger_calls = []
-
-        @bulk_trigger(TriggerModel, BEFORE_CREATE)
-        def before_create_trigger(new_instances, original_instances):
-            trigger_calls.append(('before_create', len(new_instances)))
-
-        try:
-            # Create objects for upsert but don't specify unique_fields
-            upsert_objects = [
-                TriggerModel(name="No Unique 1", value=100, category=self.category1),
-                TriggerModel(name="No Unique 2", value=200, category=self.category2)
-            ]
-
-            # Mock Django's bulk_create to simulate successful operation
-            with patch('django.db.models.QuerySet.bulk_create') as mock_bulk_create:
-                mock_bulk_create.return_value = upsert_objects
-
-                # Perform upsert operation without unique_fields - should treat all as new
-                result = TriggerModel.objects.bulk_create(
-                    upsert_objects,
-                    update_conflicts=True,
-                    update_fields=['value']
-                    # Note: no unique_fields specified
-                )
-
-                # Verify all records were treated as new (line 169)
-                self.assertIn(('before_create', 2), trigger_calls)  # All objects treated as creates
-
-        finally:
-            clear_triggers()
-
-    def test_bulk_delete_no_valid_pks_return_zero(self):
-        """
-        Test bulk_delete when objects have no valid primary keys (covers line 306).
-
-        This tests the delete_operation function return path when no objects have valid pks.
-        """
-        from django_bulk_triggers.bulk_operations import BulkOperationsMixin
-
-        # Create a mock queryset with the mixin
-        class MockQuerySet(BulkOperationsMixin):
-            def __init__(self):
-                self.model = TriggerModel
-
-        queryset = MockQuerySet()
-
-        # Create objects with no primary keys
-        obj1 = TriggerModel(name="No PK Delete 1", value=100, category=self.category1)
-        obj2 = TriggerModel(name="No PK Delete 2", value=200, category=self.category2)
-        obj1.pk = None
-        obj2.pk = None
-
-        # Create the delete_operation function (this is the inner function from bulk_delete)
-        def delete_operation():
-            pks = [obj.pk for obj in [obj1, obj2] if obj.pk is not None]
-            if pks:
-                # Use the base manager to avoid recursion
-                return queryset.model._base_manager.filter(pk__in=pks).delete()[0]
-            else:
-                return 0  # This covers line 306
-
-        # Test the delete_operation function directly
-        result = delete_operation()
-
-        # Verify result is 0 when no objects have valid pks
-        self.assertEqual(result, 0)
-
-    def test_bulk_create_upsert_foreign_key_id_fields(self):
-        """
-        Test upsert logic with ForeignKey _id field handling (covers lines 105-106, 142, 148).
-
-        This tests the _id field handling for ForeignKey relationships in upsert classification.
-        """
-        trigger_calls = []
-
-        @bulk_trigger(TriggerModel, BEFORE_UPDATE)
-        def before_update_trigger(new_instances, original_instances):
-            trigger_calls.append(('before_update', len(new_instances)))
-
-        try:
-            # Create an existing record
-            existing_obj = TriggerModel.objects.create(
-                name="FK ID Test",
-                value=100,
-                category=self.category1,
-                created_by=self.user1
-            )
-
-            # Create upsert object with ForeignKey field set
-            upsert_obj = TriggerModel(
-                name="FK ID Test",  # Same name to match existing
-                value=200,
-                category=self.category1,
-                created_by=self.user1  # Same user
-            )
-
-            # Ensure the ForeignKey _id field is accessible
-            self.assertEqual(upsert_obj.category_id, self.category1.pk)
-            self.assertEqual(upsert_obj.created_by_id, self.user1.pk)
-
-            # Mock Django's bulk_create to simulate successful operation
-            with patch('django.db.models.QuerySet.bulk_create') as mock_bulk_create:
-                mock_bulk_create.return_value = [upsert_obj]
-
-                # Perform upsert using category as unique field (this will use _id field handling)
-                result = TriggerModel.objects.bulk_create(
-                    [upsert_obj],
-                    update_conflicts=True,
-                    update_fields=['value'],
-                    unique_fields=['category']  # Use ForeignKey as unique field
-                )
-
-                # Verify the _id field handling was executed (lines 105-106, 142, 148)
-                # This should trigger the update path since we're matching by category
-                self.assertIn(('before_update', 1), trigger_calls)
-
-        finally:
-            clear_triggers()
-
-    def test_bulk_create_mti_path_mock(self):
-        """
-        Test MTI bulk_create path using mocks (covers line 192).
-
-        This tests the MTI branch in bulk_create when update_conflicts=True.
-        """
-        trigger_calls = []
-
-        @bulk_trigger(TriggerModel, BEFORE_CREATE)
-        def before_create_trigger(new_instances, original_instances):
-            trigger_calls.append(('before_create', len(new_instances)))
-
-        try:
-            # Mock _is_multi_table_inheritance to return True
-            with patch('django_bulk_triggers.queryset.TriggerQuerySetMixin._is_multi_table_inheritance', return_value=True):
-                # Mock _mti_bulk_create to track calls
-                with patch('django_bulk_triggers.queryset.TriggerQuerySetMixin._mti_bulk_create') as mock_mti_create:
-                    mock_mti_create.return_value = [
-                        TriggerModel(name="MTI Mock Test 1", value=100, category=self.category1),
-                        TriggerModel(name="MTI Mock Test 2", value=200, category=self.category2)
-                    ]
-
-                    upsert_objects = [
-                        TriggerModel(name="MTI Mock Test 1", value=100, category=self.category1),
-                        TriggerModel(name="MTI Mock Test 2", value=200, category=self.category2)
-                    ]
-
-                    # This should call the MTI path with upsert parameters
-                    result = TriggerModel.objects.bulk_create(
-                        upsert_objects,
-                        update_conflicts=True,
-                        update_fields=['value'],
-                        unique_fields=['name']
-                    )
-
-                    # Verify _mti_bulk_create was called with upsert parameters
-                    mock_mti_create.assert_called_once()
-                    call_args = mock_mti_create.call_args
-                    self.assertEqual(call_args[0][0], upsert_objects)  # First arg is objects
-                    self.assertIn('existing_records', call_args[1])
-                    self.assertIn('new_records', call_args[1])
-                    self.assertEqual(call_args[1]['update_conflicts'], True)
-                    self.assertEqual(call_args[1]['unique_fields'], ['name'])
-
-        finally:
-            clear_triggers()
-
-    def test_bulk_create_upsert_no_unique_fields(self):
-        """
-        Test bulk_create upsert with no unique_fields specified (covers line 169).
-
-        This tests the case where no unique fields are provided, so all records are treated as new.
-        """
-        trigger_calls = []
-
-        @bulk_trigger(TriggerModel, BEFORE_CREATE)
-        def before_create_trigger(new_instances, original_instances):
-            trigger_calls.append(('before_create', len(new_instances)))
-
-        try:
-            # Create objects for upsert but don't specify unique_fields
-            upsert_objects = [
-                TriggerModel(name="No Unique 1", value=100, category=self.category1),
-                TriggerModel(name="No Unique 2", value=200, category=self.category2)
-            ]
-
-            # Mock Django's bulk_create to simulate successful operation
-            with patch('django.db.models.QuerySet.bulk_create') as mock_bulk_create:
-                mock_bulk_create.return_value = upsert_objects
-
-                # Perform upsert operation without unique_fields - should treat all as new
-                result = TriggerModel.objects.bulk_create(
-                    upsert_objects,
-                    update_conflicts=True,
-                    update_fields=['value']
-                    # Note: no unique_fields specified
-                )
-
-                # Verify all records were treated as new (line 169)
-                self.assertIn(('before_create', 2), trigger_calls)  # All objects treated as creates
-
-        finally:
-            clear_triggers()
-
-    def test_bulk_delete_no_valid_pks_return_zero(self):
-        """
-        Test bulk_delete when objects have no valid primary keys (covers line 306).
-
-        This tests the delete_operation function return path when no objects have valid pks.
-        """
-        from django_bulk_triggers.bulk_operations import BulkOperationsMixin
-
-        # Create a mock queryset with the mixin
-        class MockQuerySet(BulkOperationsMixin):
-            def __init__(self):
-                self.model = TriggerModel
-
-        queryset = MockQuerySet()
-
-        # Create objects with no primary keys
-        obj1 = TriggerModel(name="No PK Delete 1", value=100, category=self.category1)
-        obj2 = TriggerModel(name="No PK Delete 2", value=200, category=self.category2)
-        obj1.pk = None
-        obj2.pk = None
-
-        # Create the delete_operation function (this is the inner function from bulk_delete)
-        def delete_operation():
-            pks = [obj.pk for obj in [obj1, obj2] if obj.pk is not None]
-            if pks:
-                # Use the base manager to avoid recursion
-                return queryset.model._base_manager.filter(pk__in=pks).delete()[0]
-            else:
-                return 0  # This covers line 306
-
-        # Test the delete_operation function directly
-        result = delete_operation()
-
-        # Verify result is 0 when no objects have valid pks
-        self.assertEqual(result, 0)
-
-    def test_bulk_create_upsert_foreign_key_id_fields(self):
-        """
-        Test upsert logic with ForeignKey _id field handling (covers lines 105-106, 142, 148).
-
-        This tests the _id field handling for ForeignKey relationships in upsert classification.
-        """
-        trigger_calls = []
-
-        @bulk_trigger(TriggerModel, BEFORE_UPDATE)
-        def before_update_trigger(new_instances, original_instances):
-            trigger_calls.append(('before_update', len(new_instances)))
-
-        try:
-            # Create an existing record
-            existing_obj = TriggerModel.objects.create(
-                name="FK ID Test",
-                value=100,
-                category=self.category1,
-                created_by=self.user1
-            )
-
-            # Create upsert object with ForeignKey field set
-            upsert_obj = TriggerModel(
-                name="FK ID Test",  # Same name to match existing
-                value=200,
-                category=self.category1,
-                created_by=self.user1  # Same user
-            )
-
-            # Ensure the ForeignKey _id field is accessible
-            self.assertEqual(upsert_obj.category_id, self.category1.pk)
-            self.assertEqual(upsert_obj.created_by_id, self.user1.pk)
-
-            # Mock Django's bulk_create to simulate successful operation
-            with patch('django.db.models.QuerySet.bulk_create') as mock_bulk_create:
-                mock_bulk_create.return_value = [upsert_obj]
-
-                # Perform upsert using category as unique field (this will use _id field handling)
-                result = TriggerModel.objects.bulk_create(
-                    [upsert_obj],
-                    update_conflicts=True,
-                    update_fields=['value'],
-                    unique_fields=['category']  # Use ForeignKey as unique field
-                )
-
-                # Verify the _id field handling was executed (lines 105-106, 142, 148)
-                # This should trigger the update path since we're matching by category
-                self.assertIn(('before_update', 1), trigger_calls)
-
-        finally:
-            clear_triggers()
-
-    def test_bulk_create_upsert_with_all_existing_records(self):
-        """
-        Test bulk_create upsert logic when all records already exist (covers existing_records path).
-
-        This tests the case where all records are classified as existing.
-        """
-        # Mock Django's bulk_create to avoid database-specific upsert requirements
-
-        trigger_calls = []
-
-        @bulk_trigger(TriggerModel, BEFORE_UPDATE)
-        def before_update_trigger(new_instances, original_instances):
-            trigger_calls.append(('before_update', len(new_instances)))
-
-        try:
-            # Create existing records first
-            existing1 = TriggerModel.objects.create(name="All Existing 1", value=100, category=self.category1)
-            existing2 = TriggerModel.objects.create(name="All Existing 2", value=200, category=self.category2)
-
-            # Create objects with same unique fields (should update existing)
-            upsert_objects = [
-                TriggerModel(name="All Existing 1", value=150, category=self.category1),
-                TriggerModel(name="All Existing 2", value=250, category=self.category2)
-            ]
-
-            # Mock Django's bulk_create to simulate upsert behavior
-            with patch('django.db.models.QuerySet.bulk_create') as mock_bulk_create:
-                mock_bulk_create.return_value = upsert_objects
-
-                # Perform upsert - all records should be treated as updates
-                result = TriggerModel.objects.bulk_create(
-                    upsert_objects,
-                    update_conflicts=True,
-                    update_fields=['value'],
-                    unique_fields=['name']
-                )
-
-                # Verify only BEFORE_UPDATE trigger was called (all records are updates)
-                self.assertEqual(len(trigger_calls), 1)
-                self.assertEqual(trigger_calls[0], ('before_update', 2))
-
-        finally:
-            clear_triggers()
-
-    def test_bulk_create_upsert_no_unique_fields(self):
-        """
-        Test bulk_create upsert with no unique_fields specified (covers line 169).
-
-        This tests the case where no unique fields are provided, so all records are treated as new.
-        """
-        trigger_calls = []
-
-        @bulk_trigger(TriggerModel, BEFORE_CREATE)
-        def before_create_trigger(new_instances, original_instances):
-            trigger_calls.append(('before_create', len(new_instances)))
-
-        try:
-            # Create objects for upsert but don't specify unique_fields
-            upsert_objects = [
-                TriggerModel(name="No Unique 1", value=100, category=self.category1),
-                TriggerModel(name="No Unique 2", value=200, category=self.category2)
-            ]
-
-            # Mock Django's bulk_create to simulate successful operation
-            with patch('django.db.models.QuerySet.bulk_create') as mock_bulk_create:
-                mock_bulk_create.return_value = upsert_objects
-
-                # Perform upsert operation without unique_fields - should treat all as new
-                result = TriggerModel.objects.bulk_create(
-                    upsert_objects,
-                    update_conflicts=True,
-                    update_fields=['value']
-                    # Note: no unique_fields specified
-                )
-
-                # Verify all records were treated as new (line 169)
-                self.assertIn(('before_create', 2), trigger_calls)  # All objects treated as creates
-
-        finally:
-            clear_triggers()
-
-    def test_bulk_delete_no_valid_pks_return_zero(self):
-        """
-        Test bulk_delete when objects have no valid primary keys (covers line 306).
-
-        This tests the delete_operation function return path when no objects have valid pks.
-        """
-        from django_bulk_triggers.bulk_operations import BulkOperationsMixin
-
-        # Create a mock queryset with the mixin
-        class MockQuerySet(BulkOperationsMixin):
-            def __init__(self):
-                self.model = TriggerModel
-
-        queryset = MockQuerySet()
-
-        # Create objects with no primary keys
-        obj1 = TriggerModel(name="No PK Delete 1", value=100, category=self.category1)
-        obj2 = TriggerModel(name="No PK Delete 2", value=200, category=self.category2)
-        obj1.pk = None
-        obj2.pk = None
-
-        # Create the delete_operation function (this is the inner function from bulk_delete)
-        def delete_operation():
-            pks = [obj.pk for obj in [obj1, obj2] if obj.pk is not None]
-            if pks:
-                # Use the base manager to avoid recursion
-                return queryset.model._base_manager.filter(pk__in=pks).delete()[0]
-            else:
-                return 0  # This covers line 306
-
-        # Test the delete_operation function directly
-        result = delete_operation()
-
-        # Verify result is 0 when no objects have valid pks
-        self.assertEqual(result, 0)
-
-    def test_bulk_create_upsert_foreign_key_id_fields(self):
-        """
-        Test upsert logic with ForeignKey _id field handling (covers lines 105-106, 142, 148).
-
-        This tests the _id field handling for ForeignKey relationships in upsert classification.
-        """
-        trigger_calls = []
-
-        @bulk_trigger(TriggerModel, BEFORE_UPDATE)
-        def before_update_trigger(new_instances, original_instances):
-            trigger_calls.append(('before_update', len(new_instances)))
-
-        try:
-            # Create an existing record
-            existing_obj = TriggerModel.objects.create(
-                name="FK ID Test",
-                value=100,
-                category=self.category1,
-                created_by=self.user1
-            )
-
-            # Create upsert object with ForeignKey field set
-            upsert_obj = TriggerModel(
-                name="FK ID Test",  # Same name to match existing
-                value=200,
-                category=self.category1,
-                created_by=self.user1  # Same user
-            )
-
-            # Ensure the ForeignKey _id field is accessible
-            self.assertEqual(upsert_obj.category_id, self.category1.pk)
-            self.assertEqual(upsert_obj.created_by_id, self.user1.pk)
-
-            # Mock Django's bulk_create to simulate successful operation
-            with patch('django.db.models.QuerySet.bulk_create') as mock_bulk_create:
-                mock_bulk_create.return_value = [upsert_obj]
-
-                # Perform upsert using category as unique field (this will use _id field handling)
-                result = TriggerModel.objects.bulk_create(
-                    [upsert_obj],
-                    update_conflicts=True,
-                    update_fields=['value'],
-                    unique_fields=['category']  # Use ForeignKey as unique field
-                )
-
-                # Verify the _id field handling was executed (lines 105-106, 142, 148)
-                # This should trigger the update path since we're matching by category
-                self.assertIn(('before_update', 1), trigger_calls)
-
-        finally:
-            clear_triggers()
-
-    def test_bulk_create_upsert_logic_mock_database(self):
-        """
-        Test bulk_create upsert logic using mocks to cover lines 93-181.
-
-        This tests the upsert classification logic without requiring database upsert support.
-        """
-        trigger_calls = []
-
-        @bulk_trigger(TriggerModel, BEFORE_CREATE)
-        def before_create_trigger(new_instances, original_instances):
-            trigger_calls.append(('before_create', len(new_instances)))
-
-        @bulk_trigger(TriggerModel, BEFORE_UPDATE)
-        def before_update_trigger(new_instances, original_instances):
-            trigger_calls.append(('before_update', len(new_instances)))
-
-        @bulk_trigger(TriggerModel, VALIDATE_CREATE)
-        def validate_create_trigger(new_instances, original_instances):
-            trigger_calls.append(('validate_create', len(new_instances)))
-
-        @bulk_trigger(TriggerModel, VALIDATE_UPDATE)
-        def validate_update_trigger(new_instances, original_instances):
-            trigger_calls.append(('validate_update', len(new_instances)))
-
-        try:
-            # Create an existing record
-            existing_obj = TriggerModel.objects.create(
-                name="Existing Mock",
-                value=100,
-                category=self.category1
-            )
-
-            # Create objects for upsert - one existing (by name), one new
-            upsert_objects = [
-                TriggerModel(
-                    name="Existing Mock",  # This will be classified as existing
-                    value=999,
-                    category=self.category1
-                ),
-                TriggerModel(
-                    name="New Mock",  # This will be classified as new
-                    value=200,
-                    category=self.category2
-                )
-            ]
-
-            # Mock Django's bulk_create to avoid database-specific upsert requirements
-            with patch('django.db.models.QuerySet.bulk_create') as mock_bulk_create:
-                mock_bulk_create.return_value = upsert_objects
-
-                # Perform upsert operation - this will trigger the classification logic
-                result = TriggerModel.objects.bulk_create(
-                    upsert_objects,
-                    update_conflicts=True,
-                    update_fields=['value'],
-                    unique_fields=['name']  # Use name as unique field
-                )
-
-                # Verify the classification logic was executed
-                # We should have triggers for both create and update operations
-                self.assertIn(('validate_create', 1), trigger_calls)  # New object
-                self.assertIn(('validate_update', 1), trigger_calls)  # Existing object
-                self.assertIn(('before_create', 1), trigger_calls)    # New object
-                self.assertIn(('before_update', 1), trigger_calls)    # Existing object
-
-        finally:
-            clear_triggers()
-
-    def test_bulk_create_upsert_no_unique_fields(self):
-        """
-        Test bulk_create upsert with no unique_fields specified (covers line 169).
-
-        This tests the case where no unique fields are provided, so all records are treated as new.
-        """
-        trigger_calls = []
-
-        @bulk_trigger(TriggerModel, BEFORE_CREATE)
-        def before_create_trigger(new_instances, original_instances):
-            trigger_calls.append(('before_create', len(new_instances)))
-
-        try:
-            # Create objects for upsert but don't specify unique_fields
-            upsert_objects = [
-                TriggerModel(name="No Unique 1", value=100, category=self.category1),
-                TriggerModel(name="No Unique 2", value=200, category=self.category2)
-            ]
-
-            # Mock Django's bulk_create to simulate successful operation
-            with patch('django.db.models.QuerySet.bulk_create') as mock_bulk_create:
-                mock_bulk_create.return_value = upsert_objects
-
-                # Perform upsert operation without unique_fields - should treat all as new
-                result = TriggerModel.objects.bulk_create(
-                    upsert_objects,
-                    update_conflicts=True,
-                    update_fields=['value']
-                    # Note: no unique_fields specified
-                )
-
-                # Verify all records were treated as new (line 169)
-                self.assertIn(('before_create', 2), trigger_calls)  # All objects treated as creates
-
-        finally:
-            clear_triggers()
-
-    def test_bulk_delete_no_valid_pks_return_zero(self):
-        """
-        Test bulk_delete when objects have no valid primary keys (covers line 306).
-
-        This tests the delete_operation function return path when no objects have valid pks.
-        """
-        from django_bulk_triggers.bulk_operations import BulkOperationsMixin
-
-        # Create a mock queryset with the mixin
-        class MockQuerySet(BulkOperationsMixin):
-            def __init__(self):
-                self.model = TriggerModel
-
-        queryset = MockQuerySet()
-
-        # Create objects with no primary keys
-        obj1 = TriggerModel(name="No PK Delete 1", value=100, category=self.category1)
-        obj2 = TriggerModel(name="No PK Delete 2", value=200, category=self.category2)
-        obj1.pk = None
-        obj2.pk = None
-
-        # Create the delete_operation function (this is the inner function from bulk_delete)
-        def delete_operation():
-            pks = [obj.pk for obj in [obj1, obj2] if obj.pk is not None]
-            if pks:
-                # Use the base manager to avoid recursion
-                return queryset.model._base_manager.filter(pk__in=pks).delete()[0]
-            else:
-                return 0  # This covers line 306
-
-        # Test the delete_operation function directly
-        result = delete_operation()
-
-        # Verify result is 0 when no objects have valid pks
-        self.assertEqual(result, 0)
-
-    def test_bulk_create_upsert_foreign_key_id_fields(self):
-        """
-        Test upsert logic with ForeignKey _id field handling (covers lines 105-106, 142, 148).
-
-        This tests the _id field handling for ForeignKey relationships in upsert classification.
-        """
-        trigger_calls = []
-
-        @bulk_trigger(TriggerModel, BEFORE_UPDATE)
-        def before_update_trigger(new_instances, original_instances):
-            trigger_calls.append(('before_update', len(new_instances)))
-
-        try:
-            # Create an existing record
-            existing_obj = TriggerModel.objects.create(
-                name="FK ID Test",
-                value=100,
-                category=self.category1,
-                created_by=self.user1
-            )
-
-            # Create upsert object with ForeignKey field set
-            upsert_obj = TriggerModel(
-                name="FK ID Test",  # Same name to match existing
-                value=200,
-                category=self.category1,
-                created_by=self.user1  # Same user
-            )
-
-            # Ensure the ForeignKey _id field is accessible
-            self.assertEqual(upsert_obj.category_id, self.category1.pk)
-            self.assertEqual(upsert_obj.created_by_id, self.user1.pk)
-
-            # Mock Django's bulk_create to simulate successful operation
-            with patch('django.db.models.QuerySet.bulk_create') as mock_bulk_create:
-                mock_bulk_create.return_value = [upsert_obj]
-
-                # Perform upsert using category as unique field (this will use _id field handling)
-                result = TriggerModel.objects.bulk_create(
-                    [upsert_obj],
-                    update_conflicts=True,
-                    update_fields=['value'],
-                    unique_fields=['category']  # Use ForeignKey as unique field
-                )
-
-                # Verify the _id field handling was executed (lines 105-106, 142, 148)
-                # This should trigger the update path since we're matching by category
-                self.assertIn(('before_update', 1), trigger_calls)
-
-        finally:
-            clear_triggers()
-
-    def test_bulk_create_after_triggers_upsert_mock(self):
-        """
-        Test AFTER triggers for upsert operations using mocks (covers lines 240-241).
-
-        This specifically tests the AFTER trigger logic for mixed create/update operations.
-        """
-        trigger_calls = []
-
-        @bulk_trigger(TriggerModel, AFTER_CREATE)
-        def after_create_trigger(new_instances, original_instances):
-            trigger_calls.append(('after_create', len(new_instances)))
-
-        @bulk_trigger(TriggerModel, AFTER_UPDATE)
-        def after_update_trigger(new_instances, original_instances):
-            trigger_calls.append(('after_update', len(new_instances)))
-
-        try:
-            # Create an existing record
-            existing_obj = TriggerModel.objects.create(
-                name="Existing After Test",
-                value=100,
-                category=self.category1
-            )
-
-            # Create objects for upsert
-            upsert_objects = [
-                TriggerModel(name="Existing After Test", value=200, category=self.category1),  # Update
-                TriggerModel(name="New After Test", value=300, category=self.category2)        # Create
-            ]
-
-            # Mock Django's bulk_create to simulate successful operation
-            with patch('django.db.models.QuerySet.bulk_create') as mock_bulk_create:
-                mock_bulk_create.return_value = upsert_objects
-
-                # Perform upsert - this should trigger AFTER triggers for both operations
-                result = TriggerModel.objects.bulk_create(
-                    upsert_objects,
-                    update_conflicts=True,
-                    update_fields=['value'],
-                    unique_fields=['name']
-                )
-
-                # Verify AFTER triggers were called for both operations
-                self.assertIn(('after_create', 1), trigger_calls)  # New record
-                self.assertIn(('after_update', 1), trigger_calls)  # Existing record
-
-        finally:
-            clear_triggers()
-
-    def test_bulk_create_upsert_no_unique_fields(self):
-        """
-        Test bulk_create upsert with no unique_fields specified (covers line 169).
-
-        This tests the case where no unique fields are provided, so all records are treated as new.
-        """
-        trigger_calls = []
-
-        @bulk_trigger(TriggerModel, BEFORE_CREATE)
-        def before_create_trigger(new_instances, original_instances):
-            trigger_calls.append(('before_create', len(new_instances)))
-
-        try:
-            # Create objects for upsert but don't specify unique_fields
-            upsert_objects = [
-                TriggerModel(name="No Unique 1", value=100, category=self.category1),
-                TriggerModel(name="No Unique 2", value=200, category=self.category2)
-            ]
-
-            # Mock Django's bulk_create to simulate successful operation
-            with patch('django.db.models.QuerySet.bulk_create') as mock_bulk_create:
-                mock_bulk_create.return_value = upsert_objects
-
-                # Perform upsert operation without unique_fields - should treat all as new
-                result = TriggerModel.objects.bulk_create(
-                    upsert_objects,
-                    update_conflicts=True,
-                    update_fields=['value']
-                    # Note: no unique_fields specified
-                )
-
-                # Verify all records were treated as new (line 169)
-                self.assertIn(('before_create', 2), trigger_calls)  # All objects treated as creates
-
-        finally:
-            clear_triggers()
-
-    def test_bulk_delete_no_valid_pks_return_zero(self):
-        """
-        Test bulk_delete when objects have no valid primary keys (covers line 306).
-
-        This tests the delete_operation function return path when no objects have valid pks.
-        """
-        from django_bulk_triggers.bulk_operations import BulkOperationsMixin
-
-        # Create a mock queryset with the mixin
-        class MockQuerySet(BulkOperationsMixin):
-            def __init__(self):
-                self.model = TriggerModel
-
-        queryset = MockQuerySet()
-
-        # Create objects with no primary keys
-        obj1 = TriggerModel(name="No PK Delete 1", value=100, category=self.category1)
-        obj2 = TriggerModel(name="No PK Delete 2", value=200, category=self.category2)
-        obj1.pk = None
-        obj2.pk = None
-
-        # Create the delete_operation function (this is the inner function from bulk_delete)
-        def delete_operation():
-            pks = [obj.pk for obj in [obj1, obj2] if obj.pk is not None]
-            if pks:
-                # Use the base manager to avoid recursion
-                return queryset.model._base_manager.filter(pk__in=pks).delete()[0]
-            else:
-                return 0  # This covers line 306
-
-        # Test the delete_operation function directly
-        result = delete_operation()
-
-        # Verify result is 0 when no objects have valid pks
-        self.assertEqual(result, 0)
-
-    def test_bulk_create_upsert_foreign_key_id_fields(self):
-        """
-        Test upsert logic with ForeignKey _id field handling (covers lines 105-106, 142, 148).
-
-        This tests the _id field handling for ForeignKey relationships in upsert classification.
-        """
-        trigger_calls = []
-
-        @bulk_trigger(TriggerModel, BEFORE_UPDATE)
-        def before_update_trigger(new_instances, original_instances):
-            trigger_calls.append(('before_update', len(new_instances)))
-
-        try:
-            # Create an existing record
-            existing_obj = TriggerModel.objects.create(
-                name="FK ID Test",
-                value=100,
-                category=self.category1,
-                created_by=self.user1
-            )
-
-            # Create upsert object with ForeignKey field set
-            upsert_obj = TriggerModel(
-                name="FK ID Test",  # Same name to match existing
-                value=200,
-                category=self.category1,
-                created_by=self.user1  # Same user
-            )
-
-            # Ensure the ForeignKey _id field is accessible
-            self.assertEqual(upsert_obj.category_id, self.category1.pk)
-            self.assertEqual(upsert_obj.created_by_id, self.user1.pk)
-
-            # Mock Django's bulk_create to simulate successful operation
-            with patch('django.db.models.QuerySet.bulk_create') as mock_bulk_create:
-                mock_bulk_create.return_value = [upsert_obj]
-
-                # Perform upsert using category as unique field (this will use _id field handling)
-                result = TriggerModel.objects.bulk_create(
-                    [upsert_obj],
-                    update_conflicts=True,
-                    update_fields=['value'],
-                    unique_fields=['category']  # Use ForeignKey as unique field
-                )
-
-                # Verify the _id field handling was executed (lines 105-106, 142, 148)
-                # This should trigger the update path since we're matching by category
-                self.assertIn(('before_update', 1), trigger_calls)
-
-        finally:
-            clear_triggers()
-
-    def test_bulk_create_mti_path_mock(self):
-        """
-        Test MTI bulk_create path using mocks (covers line 192).
-
-        This tests the MTI branch in bulk_create when update_conflicts=True.
-        """
-        trigger_calls = []
-
-        @bulk_trigger(TriggerModel, BEFORE_CREATE)
-        def before_create_trigger(new_instances, original_instances):
-            trigger_calls.append(('before_create', len(new_instances)))
-
-        try:
-            # Mock _is_multi_table_inheritance to return True
-            with patch('django_bulk_triggers.queryset.TriggerQuerySetMixin._is_multi_table_inheritance', return_value=True):
-                # Mock _mti_bulk_create to track calls
-                with patch('django_bulk_triggers.queryset.TriggerQuerySetMixin._mti_bulk_create') as mock_mti_create:
-                    mock_mti_create.return_value = [
-                        TriggerModel(name="MTI Mock Test 1", value=100, category=self.category1),
-                        TriggerModel(name="MTI Mock Test 2", value=200, category=self.category2)
-                    ]
-
-                    upsert_objects = [
-                        TriggerModel(name="MTI Mock Test 1", value=100, category=self.category1),
-                        TriggerModel(name="MTI Mock Test 2", value=200, category=self.category2)
-                    ]
+class MockQuerySet(BulkOperationsMixin):
+    """Bare queryset stand-in carrying only the model, for calling mixin methods directly."""
 
-                    # This should call the MTI path with upsert parameters
-                    result = TriggerModel.objects.bulk_create(
-                        upsert_objects,
-                        update_conflicts=True,
-                        update_fields=['value'],
-                        unique_fields=['name']
-                    )
+    def __init__(self, model):
+        self.model = model
 
-                    # Verify _mti_bulk_create was called with upsert parameters
-                    mock_mti_create.assert_called_once()
-                    call_args = mock_mti_create.call_args
-                    self.assertEqual(call_args[0][0], upsert_objects)  # First arg is objects
-                    self.assertIn('existing_records', call_args[1])
-                    self.assertIn('new_records', call_args[1])
-                    self.assertEqual(call_args[1]['update_conflicts'], True)
-                    self.assertEqual(call_args[1]['unique_fields'], ['name'])
 
-        finally:
-            clear_triggers()
-
-    def test_bulk_create_upsert_no_unique_fields(self):
-        """
-        Test bulk_create upsert with no unique_fields specified (covers line 169).
-
-        This tests the case where no unique fields are provided, so all records are treated as new.
-        """
-        trigger_calls = []
+# Every event the tests below inspect; a recorder is registered once per class for each.
+RECORDED_EVENTS = (
+    VALIDATE_CREATE, BEFORE_CREATE, AFTER_CREATE,
+    VALIDATE_UPDATE, BEFORE_UPDATE, AFTER_UPDATE,
+    BEFORE_DELETE, AFTER_DELETE,
+)
 
-        @bulk_trigger(TriggerModel, BEFORE_CREATE)
-        def before_create_trigger(new_instances, original_instances):
-            trigger_calls.append(('before_create', len(new_instances)))
+# bulk_create runs inside transaction.atomic, which issues SAVEPOINT and RELEASE
+# SAVEPOINT within a TestCase; run_upsert adds these to its expected query count.
+ATOMIC_BLOCK_QUERIES = 2
 
-        try:
-            # Create objects for upsert but don't specify unique_fields
-            upsert_objects = [
-                TriggerModel(name="No Unique 1", value=100, category=self.category1),
-                TriggerModel(name="No Unique 2", value=200, category=self.category2)
-            ]
 
-            # Mock Django's bulk_create to simulate successful operation
-            with patch('django.db.models.QuerySet.bulk_create') as mock_bulk_create:
-                mock_bulk_create.return_value = upsert_objects
+class BulkOperationsCoverageTest(TestCase):
+    """Test class to cover missing lines in bulk_operations.py."""
 
-                # Perform upsert operation without unique_fields - should treat all as new
-                result = TriggerModel.objects.bulk_create(
-                    upsert_objects,
-                    update_conflicts=True,
-                    update_fields=['value']
-                    # Note: no unique_fields specified
-                )
+    @classmethod
+    def setUpClass(cls):
+        """Register the trigger recorders and patch Django's bulk_create once per class."""
+        super().setUpClass()
+        cls.trigger_calls = Counter()
+        for event in RECORDED_EVENTS:
+            cls._register_recorder(event)
 
-                # Verify all records were treated as new (line 169)
-                self.assertIn(('before_create', 2), trigger_calls)  # All objects treated as creates
+        # Mock Django's bulk_create to avoid database-specific upsert requirements
+        cls._bulk_create_patcher = patch.object(QuerySet, 'bulk_create')
+        cls.mock_bulk_create = cls._bulk_create_patcher.start()
+        cls.addClassCleanup(cls._bulk_create_patcher.stop)
+
+    @classmethod
+    def _register_recorder(cls, event):
+        calls = cls.trigger_calls
+        registered = [trigger[:2] for trigger in get_triggers(TriggerModel, event)]
+
+        @bulk_trigger(TriggerModel, event)
+        def record(new_instances, original_instances):
+            calls[event] += len(new_instances)
+
+        # Unregister only this recorder afterwards; clear_triggers() would also wipe
+        # the class-based triggers other modules registered at import time
+        for handler_cls, method_name, _, _ in get_triggers(TriggerModel, event):
+            if (handler_cls, method_name) not in registered:
+                cls.addClassCleanup(unregister_trigger, TriggerModel, event, handler_cls, method_name)
+
+    @classmethod
+    def setUpTestData(cls):
+        """Set up test data shared by every test in the class."""
+        cls.category1, cls.category2, cls.fk_category, cls.fk_new_category = Category.objects.bulk_create([
+            Category(name="Test Category 1", description="First test category"),
+            Category(name="Test Category 2", description="Second test category"),
+            Category(name="FK Category", description="Holds only the FK ID Test row"),
+            Category(name="FK New Category", description="Never holds a seeded row"),
+        ])
+        cls.user1 = UserModel.objects.create(username="testuser1", email="user1@test.com")
+
+        # Existing rows the upsert tests match against. Upserts never write to the
+        # database here, so the rows can be shared. setUpTestData runs before
+        # bulk_create is patched, so one INSERT writes them all.
+        # - Name-keyed rows sit in category1.
+        # - Category-keyed tests use their own categories: fk_category holds exactly
+        #   one row ("FK ID Test") and fk_new_category none, so their matches do not
+        #   depend on the name-keyed fixtures.
+        TriggerModel.objects.bulk_create(
+            [
+                TriggerModel(name=name, value=value, category=category, created_by=created_by)
+                for name, value, category, created_by in [
+                    ("Existing Record", 100, cls.category1, cls.user1),
+                    ("Existing Mock", 100, cls.category1, None),
+                    ("All Existing 1", 100, cls.category1, None),
+                    ("All Existing 2", 200, cls.category1, None),
+                    ("FK ID Test", 100, cls.fk_category, cls.user1),
+                ]
+            ],
+            bypass_triggers=True,
+        )
 
-        finally:
-            clear_triggers()
+    def setUp(self):
+        """Reset the shared recorder and bulk_create mock."""
+        self.trigger_calls.clear()
+        self.mock_bulk_create.reset_mock(return_value=True)
 
-    def test_bulk_delete_no_valid_pks_return_zero(self):
+    @classmethod
+    def create_existing(cls, **kwargs):
         """
-        Test bulk_delete when objects have no valid primary keys (covers line 306).
+        Insert a TriggerModel row without going through bulk_create.
 
-        This tests the delete_operation function return path when no objects have valid pks.
+        save(bypass_triggers=True) uses Django's plain save path, so the row is
+        really written even though QuerySet.bulk_create is patched, and no
+        recorder fires for the fixture itself.
         """
-        from django_bulk_triggers.bulk_operations import BulkOperationsMixin
-
-        # Create a mock queryset with the mixin
-        class MockQuerySet(BulkOperationsMixin):
-            def __init__(self):
-                self.model = TriggerModel
-
-        queryset = MockQuerySet()
-
-        # Create objects with no primary keys
-        obj1 = TriggerModel(name="No PK Delete 1", value=100, category=self.category1)
-        obj2 = TriggerModel(name="No PK Delete 2", value=200, category=self.category2)
-        obj1.pk = None
-        obj2.pk = None
-
-        # Create the delete_operation function (this is the inner function from bulk_delete)
-        def delete_operation():
-            pks = [obj.pk for obj in [obj1, obj2] if obj.pk is not None]
-            if pks:
-                # Use the base manager to avoid recursion
-                return queryset.model._base_manager.filter(pk__in=pks).delete()[0]
-            else:
-                return 0  # This covers line 306
+        obj = TriggerModel(**kwargs)
+        obj.save(bypass_triggers=True)
+        return obj
 
-        # Test the delete_operation function directly
-        result = delete_operation()
-
-        # Verify result is 0 when no objects have valid pks
-        self.assertEqual(result, 0)
-
-    def test_bulk_create_upsert_foreign_key_id_fields(self):
+    def run_upsert(self, upsert_objects, num_queries, update_fields=None, **kwargs):
         """
-        Test upsert logic with ForeignKey _id field handling (covers lines 105-106, 142, 148).
+        Upsert upsert_objects through TriggerModel.objects.bulk_create.
 
-        This tests the _id field handling for ForeignKey relationships in upsert classification.
+        The patched QuerySet.bulk_create echoes the objects back, so only the
+        trigger-side classification runs. num_queries is the number of queries
+        that classification may issue; the SAVEPOINT/RELEASE pair from
+        bulk_create's atomic block is added on top, so a regression back to
+        per-object lookups fails the test.
         """
-        trigger_calls = []
-
-        @bulk_trigger(TriggerModel, BEFORE_UPDATE)
-        def before_update_trigger(new_instances, original_instances):
-            trigger_calls.append(('before_update', len(new_instances)))
-
-        try:
-            # Create an existing record
-            existing_obj = TriggerModel.objects.create(
-                name="FK ID Test",
-                value=100,
-                category=self.category1,
-                created_by=self.user1
+        self.mock_bulk_create.return_value = upsert_objects
+        with self.assertNumQueries(num_queries + ATOMIC_BLOCK_QUERIES):
+            return TriggerModel.objects.bulk_create(
+                upsert_objects,
+                update_conflicts=True,
+                update_fields=update_fields or ['value'],
+                **kwargs
             )
 
-            # Create upsert object with ForeignKey field set
-            upsert_obj = TriggerModel(
-                name="FK ID Test",  # Same name to match existing
-                value=200,
-                category=self.category1,
-                created_by=self.user1  # Same user
-            )
-
-            # Ensure the ForeignKey _id field is accessible
-            self.assertEqual(upsert_obj.category_id, self.category1.pk)
-            self.assertEqual(upsert_obj.created_by_id, self.user1.pk)
-
-            # Mock Django's bulk_create to simulate successful operation
-            with patch('django.db.models.QuerySet.bulk_create') as mock_bulk_create:
-                mock_bulk_create.return_value = [upsert_obj]
-
-                # Perform upsert using category as unique field (this will use _id field handling)
-                result = TriggerModel.objects.bulk_create(
-                    [upsert_obj],
-                    update_conflicts=True,
-                    update_fields=['value'],
-                    unique_fields=['category']  # Use ForeignKey as unique field
-                )
-
-                # Verify the _id field handling was executed (lines 105-106, 142, 148)
-                # This should trigger the update path since we're matching by category
-                self.assertIn(('before_update', 1), trigger_calls)
-
-        finally:
-            clear_triggers()
-
-    def test_bulk_create_upsert_foreign_key_handling(self):
+    def test_bulk_create_upsert_logic_with_foreign_keys(self):
         """
-        Test upsert logic with ForeignKey field handling (covers lines 104-115).
+        Test bulk_create upsert logic with ForeignKey fields (covers lines 93-181).
 
-        This tests the _id field handling for ForeignKey relationships.
+        This tests the upsert logic when update_conflicts=True and unique_fields
+        contains ForeignKey fields.
         """
-        # Mock Django's bulk_create to avoid database-specific upsert requirements
-
-        trigger_calls = []
-
-        @bulk_trigger(TriggerModel, BEFORE_UPDATE)
-        def before_update_trigger(new_instances, original_instances):
-            trigger_calls.append(('before_update', len(new_instances)))
-
-        @bulk_trigger(TriggerModel, BEFORE_CREATE)
-        def before_create_trigger(new_instances, original_instances):
-            trigger_calls.append(('before_create', len(new_instances)))
-
-        try:
-            # Create existing record
-            existing = TriggerModel.objects.create(
-                name="FK Test",
-                value=100,
-                category=self.category1,
+        # Create objects for upsert - one existing (by name), one new
+        upsert_objects = [
+            TriggerModel(
+                name="Existing Record",  # This will update the existing record
+                value=999,
+                category=self.category2,  # Different category
                 created_by=self.user1
-            )
-
-            # Create upsert object with ForeignKey field
-            upsert_obj = TriggerModel(
-                name="FK Test",  # Same name to match existing
+            ),
+            TriggerModel(
+                name="New Record",  # This will create new
                 value=200,
-                category=self.category2,  # Different category
-                created_by=self.user1     # Same user
+                category=self.category1,
+                created_by=self.user1
             )
+        ]
 
-            # Mock Django's bulk_create to simulate upsert behavior
-            with patch('django.db.models.QuerySet.bulk_create') as mock_bulk_create:
-                mock_bulk_create.return_value = [upsert_obj]
+        # Perform upsert operation
+        self.run_upsert(upsert_objects, 1, update_fields=['value', 'category'], unique_fields=['name'])
 
-                # Perform upsert using category as unique field (ForeignKey)
-                result = TriggerModel.objects.bulk_create(
-                    [upsert_obj],
-                    update_conflicts=True,
-                    update_fields=['value', 'name'],
-                    unique_fields=['category']  # Use ForeignKey as unique field
-                )
-
-                # Verify the _id field handling was executed (lines 105-106, 142, 148)
-                # Since categories are different (category1 vs category2), this should be a create operation
-                self.assertIn(('before_create', 1), trigger_calls)
-
-        finally:
-            clear_triggers()
-
-    def test_bulk_create_upsert_no_unique_fields(self):
-        """
-        Test bulk_create upsert with no unique_fields specified (covers line 169).
-
-        This tests the case where no unique fields are provided, so all records are treated as new.
-        """
-        trigger_calls = []
-
-        @bulk_trigger(TriggerModel, BEFORE_CREATE)
-        def before_create_trigger(new_instances, original_instances):
-            trigger_calls.append(('before_create', len(new_instances)))
-
-        try:
-            # Create objects for upsert but don't specify unique_fields
-            upsert_objects = [
-                TriggerModel(name="No Unique 1", value=100, category=self.category1),
-                TriggerModel(name="No Unique 2", value=200, category=self.category2)
-            ]
-
-            # Mock Django's bulk_create to simulate successful operation
-            with patch('django.db.models.QuerySet.bulk_create') as mock_bulk_create:
-                mock_bulk_create.return_value = upsert_objects
-
-                # Perform upsert operation without unique_fields - should treat all as new
-                result = TriggerModel.objects.bulk_create(
-                    upsert_objects,
-                    update_conflicts=True,
-                    update_fields=['value']
-                    # Note: no unique_fields specified
-                )
-
-                # Verify all records were treated as new (line 169)
-                self.assertIn(('before_create', 2), trigger_calls)  # All objects treated as creates
+        # Verify the upsert classification logic was executed: one create and one
+        # update, with no other triggers fired
+        self.assertEqual(self.trigger_calls, Counter({
+            VALIDATE_CREATE: 1, BEFORE_CREATE: 1, AFTER_CREATE: 1,  # New object
+            VALIDATE_UPDATE: 1, BEFORE_UPDATE: 1, AFTER_UPDATE: 1,  # Existing object
+        }))
 
-        finally:
-            clear_triggers()
-
-    def test_bulk_delete_no_valid_pks_return_zero(self):
+    def test_bulk_create_upsert_cases(self):
         """
-        Test bulk_delete when objects have no valid primary keys (covers line 306).
+        Test upsert classification across unique_fields shapes (covers lines 105-106, 142, 148, 169).
 
-        This tests the delete_operation function return path when no objects have valid pks.
+        Each case runs one upsert against the shared existing rows and checks
+        the full tally of triggers fired, so spurious extra triggers fail too:
+        - foreign_key_id_fields: ForeignKey unique field matched through its _id attname
+        - no_unique_fields: no unique_fields given, so every record is treated as new
         """
-        from django_bulk_triggers.bulk_operations import BulkOperationsMixin
-
-        # Create a mock queryset with the mixin
-        class MockQuerySet(BulkOperationsMixin):
-            def __init__(self):
-                self.model = TriggerModel
-
-        queryset = MockQuerySet()
+        cases = [
+            (
+                "foreign_key_id_fields",
+                [dict(name="FK ID Test", value=200, category=self.fk_category, created_by=self.user1)],
+                {"unique_fields": ["category"]},  # Use ForeignKey as unique field
+                1,  # One SELECT for the existing rows
+                {VALIDATE_UPDATE: 1, BEFORE_UPDATE: 1, AFTER_UPDATE: 1},
+            ),
+            (
+                "no_unique_fields",
+                [
+                    dict(name="No Unique 1", value=100, category=self.category1),
+                    dict(name="No Unique 2", value=200, category=self.category2),
+                ],
+                {},  # Note: no unique_fields specified
+                0,  # Nothing to classify, so no SELECT
+                {VALIDATE_CREATE: 2, BEFORE_CREATE: 2, AFTER_CREATE: 2},
+            ),
+        ]
 
-        # Create objects with no primary keys
-        obj1 = TriggerModel(name="No PK Delete 1", value=100, category=self.category1)
-        obj2 = TriggerModel(name="No PK Delete 2", value=200, category=self.category2)
-        obj1.pk = None
-        obj2.pk = None
+        for name, upsert_rows, kwargs, num_queries, expected in cases:
+            with self.subTest(name):
+                self.trigger_calls.clear()
+                self.mock_bulk_create.reset_mock(return_value=True)
 
-        # Create the delete_operation function (this is the inner function from bulk_delete)
-        def delete_operation():
-            pks = [obj.pk for obj in [obj1, obj2] if obj.pk is not None]
-            if pks:
-                # Use the base manager to avoid recursion
-                return queryset.model._base_manager.filter(pk__in=pks).delete()[0]
-            else:
-                return 0  # This covers line 306
+                self.run_upsert([TriggerModel(**fields) for fields in upsert_rows], num_queries, **kwargs)
 
-        # Test the delete_operation function directly
-        result = delete_operation()
+                self.assertEqual(self.trigger_calls, Counter(expected))
 
-        # Verify result is 0 when no objects have valid pks
-        self.assertEqual(result, 0)
-
-    def test_bulk_create_upsert_foreign_key_id_fields(self):
+    def test_classify_upsert_records_single_query(self):
         """
-        Test upsert logic with ForeignKey _id field handling (covers lines 105-106, 142, 148).
+        Test upsert classification resolves ForeignKey unique fields through their attname.
 
-        This tests the _id field handling for ForeignKey relationships in upsert classification.
+        Matching on category compares category_id values, so classifying a batch
+        takes the one SELECT for existing rows and never loads or joins a Category.
         """
-        trigger_calls = []
-
-        @bulk_trigger(TriggerModel, BEFORE_UPDATE)
-        def before_update_trigger(new_instances, original_instances):
-            trigger_calls.append(('before_update', len(new_instances)))
-
-        try:
-            # Create an existing record
-            existing_obj = TriggerModel.objects.create(
-                name="FK ID Test",
-                value=100,
-                category=self.category1,
-                created_by=self.user1
-            )
+        upsert_objects = [
+            TriggerModel(name="Classified 1", value=1, category=self.fk_category),
+            TriggerModel(name="Classified 2", value=2, category=self.fk_new_category),
+        ]
 
-            # Create upsert object with ForeignKey field set
-            upsert_obj = TriggerModel(
-                name="FK ID Test",  # Same name to match existing
-                value=200,
-                category=self.category1,
-                created_by=self.user1  # Same user
+        with self.assertNumQueries(1) as ctx:
+            existing_records, new_records = TriggerModel.objects.get_queryset()._classify_upsert_records(
+                upsert_objects, ['category'], ['value']
             )
 
-            # Ensure the ForeignKey _id field is accessible
-            self.assertEqual(upsert_obj.category_id, self.category1.pk)
-            self.assertEqual(upsert_obj.created_by_id, self.user1.pk)
-
-            # Mock Django's bulk_create to simulate successful operation
-            with patch('django.db.models.QuerySet.bulk_create') as mock_bulk_create:
-                mock_bulk_create.return_value = [upsert_obj]
-
-                # Perform upsert using category as unique field (this will use _id field handling)
-                result = TriggerModel.objects.bulk_create(
-                    [upsert_obj],
-                    update_conflicts=True,
-                    update_fields=['value'],
-                    unique_fields=['category']  # Use ForeignKey as unique field
-                )
-
-                # Verify the _id field handling was executed (lines 105-106, 142, 148)
-                # This should trigger the update path since we're matching by category
-                self.assertIn(('before_update', 1), trigger_calls)
+        self.assertNotIn('JOIN', ctx.captured_queries[0]['sql'])
 
-        finally:
-            clear_triggers()
+        self.assertEqual(existing_records, [upsert_objects[0]])
+        self.assertEqual(new_records, [upsert_objects[1]])
 
-    def test_bulk_create_upsert_logic_mock_database(self):
+    def test_classify_upsert_records_without_unique_fields(self):
         """
-        Test bulk_create upsert logic using mocks to cover lines 93-181.
+        Test upsert classification treats every object as new when no unique fields are given.
 
-        This tests the upsert classification logic without requiring database upsert support.
+        An empty Q() would match every row, so no query may run and no database
+        values may be copied onto the objects.
         """
-        trigger_calls = []
-
-        @bulk_trigger(TriggerModel, BEFORE_CREATE)
-        def before_create_trigger(new_instances, original_instances):
-            trigger_calls.append(('before_create', len(new_instances)))
-
-        @bulk_trigger(TriggerModel, BEFORE_UPDATE)
-        def before_update_trigger(new_instances, original_instances):
-            trigger_calls.append(('before_update', len(new_instances)))
-
-        @bulk_trigger(TriggerModel, VALIDATE_CREATE)
-        def validate_create_trigger(new_instances, original_instances):
-            trigger_calls.append(('validate_create', len(new_instances)))
-
-        @bulk_trigger(TriggerModel, VALIDATE_UPDATE)
-        def validate_update_trigger(new_instances, original_instances):
-            trigger_calls.append(('validate_update', len(new_instances)))
+        obj = TriggerModel(name="Existing Record", value=1, category=self.category1)
 
-        try:
-            # Create an existing record
-            existing_obj = TriggerModel.objects.create(
-                name="Existing Mock",
-                value=100,
-                category=self.category1
+        with self.assertNumQueries(0):
+            existing_records, new_records = TriggerModel.objects.get_queryset()._classify_upsert_records(
+                [obj], [], ['value']
             )
 
-            # Create objects for upsert - one existing (by name), one new
-            upsert_objects = [
-                TriggerModel(
-                    name="Existing Mock",  # This will be classified as existing
-                    value=999,
-                    category=self.category1
-                ),
-                TriggerModel(
-                    name="New Mock",  # This will be classified as new
-                    value=200,
-                    category=self.category2
-                )
-            ]
-
-            # Mock Django's bulk_create to avoid database-specific upsert requirements
-            with patch('django.db.models.QuerySet.bulk_create') as mock_bulk_create:
-                mock_bulk_create.return_value = upsert_objects
-
-                # Perform upsert operation - this will trigger the classification logic
-                result = TriggerModel.objects.bulk_create(
-                    upsert_objects,
-                    update_conflicts=True,
-                    update_fields=['value'],
-                    unique_fields=['name']  # Use name as unique field
-                )
-
-                # Verify the classification logic was executed
-                # We should have triggers for both create and update operations
-                self.assertIn(('validate_create', 1), trigger_calls)  # New object
-                self.assertIn(('validate_update', 1), trigger_calls)  # Existing object
-                self.assertIn(('before_create', 1), trigger_calls)    # New object
-                self.assertIn(('before_update', 1), trigger_calls)    # Existing object
+        self.assertEqual(existing_records, [])
+        self.assertEqual(new_records, [obj])
+        self.assertIsNone(obj.pk)
+        self.assertTrue(obj._state.adding)
 
-        finally:
-            clear_triggers()
-
-    def test_bulk_create_upsert_no_unique_fields(self):
+    def test_bulk_create_upsert_after_triggers_mixed(self):
         """
-        Test bulk_create upsert with no unique_fields specified (covers line 169).
+        Test AFTER triggers for upsert operations with both created and updated records (lines 240-241).
 
-        This tests the case where no unique fields are provided, so all records are treated as new.
+        Classification is patched to return one record of each kind, so no
+        existing row has to be read from the database.
         """
-        trigger_calls = []
-
-        @bulk_trigger(TriggerModel, BEFORE_CREATE)
-        def before_create_trigger(new_instances, original_instances):
-            trigger_calls.append(('before_create', len(new_instances)))
-
-        try:
-            # Create objects for upsert but don't specify unique_fields
-            upsert_objects = [
-                TriggerModel(name="No Unique 1", value=100, category=self.category1),
-                TriggerModel(name="No Unique 2", value=200, category=self.category2)
-            ]
-
-            # Mock Django's bulk_create to simulate successful operation
-            with patch('django.db.models.QuerySet.bulk_create') as mock_bulk_create:
-                mock_bulk_create.return_value = upsert_objects
+        updated = TriggerModel(pk=1, name="Mixed Upsert Test", value=200, category=self.category1)
+        created = TriggerModel(name="New Mixed Test", value=300, category=self.category2)
 
-                # Perform upsert operation without unique_fields - should treat all as new
-                result = TriggerModel.objects.bulk_create(
-                    upsert_objects,
-                    update_conflicts=True,
-                    update_fields=['value']
-                    # Note: no unique_fields specified
-                )
+        with patch.object(
+            TriggerQuerySetMixin, '_classify_upsert_records', return_value=([updated], [created])
+        ):
+            self.run_upsert([updated, created], 0, unique_fields=['name'])
 
-                # Verify all records were treated as new (line 169)
-                self.assertIn(('before_create', 2), trigger_calls)  # All objects treated as creates
-
-        finally:
-            clear_triggers()
+        # Verify AFTER triggers were called for both operations
+        self.assertEqual(self.trigger_calls[AFTER_CREATE], 1)  # New record
+        self.assertEqual(self.trigger_calls[AFTER_UPDATE], 1)  # Existing record
 
     def test_bulk_delete_no_valid_pks_return_zero(self):
         """
         Test bulk_delete when objects have no valid primary keys (covers line 306).
 
         This tests the delete_operation function return path when no objects have valid pks.
+        Object validation normally rejects unsaved instances before the delete runs, so it
+        is patched out to reach the real delete_operation inside bulk_delete.
         """
-        from django_bulk_triggers.bulk_operations import BulkOperationsMixin
-
-        # Create a mock queryset with the mixin
-        class MockQuerySet(BulkOperationsMixin):
-            def __init__(self):
-                self.model = TriggerModel
-
-        queryset = MockQuerySet()
-
-        # Create objects with no primary keys
-        obj1 = TriggerModel(name="No PK Delete 1", value=100, category=self.category1)
-        obj2 = TriggerModel(name="No PK Delete 2", value=200, category=self.category2)
-        obj1.pk = None
-        obj2.pk = None
+        # Objects built without a pk already have pk=None; only pk is read, so no
+        # related objects are assigned
+        obj1 = TriggerModel(name="No PK Delete 1", value=100)
+        obj2 = TriggerModel(name="No PK Delete 2", value=200)
 
-        # Create the delete_operation function (this is the inner function from bulk_delete)
-        def delete_operation():
-            pks = [obj.pk for obj in [obj1, obj2] if obj.pk is not None]
-            if pks:
-                # Use the base manager to avoid recursion
-                return queryset.model._base_manager.filter(pk__in=pks).delete()[0]
-            else:
-                return 0  # This covers line 306
-
-        # Test the delete_operation function directly
-        result = delete_operation()
+        with patch.object(TriggerQuerySetMixin, '_validate_objects'):
+            result = TriggerModel.objects.bulk_delete([obj1, obj2])
 
         # Verify result is 0 when no objects have valid pks
         self.assertEqual(result, 0)
 
-    def test_bulk_create_upsert_foreign_key_id_fields(self):
+    def test_bulk_create_upsert_logic_mock_database(self):
         """
-        Test upsert logic with ForeignKey _id field handling (covers lines 105-106, 142, 148).
+        Test bulk_create upsert logic using mocks to cover lines 93-181.
 
-        This tests the _id field handling for ForeignKey relationships in upsert classification.
+        This tests the upsert classification logic without requiring database upsert support.
         """
-        trigger_calls = []
-
-        @bulk_trigger(TriggerModel, BEFORE_UPDATE)
-        def before_update_trigger(new_instances, original_instances):
-            trigger_calls.append(('before_update', len(new_instances)))
-
-        try:
-            # Create an existing record
-            existing_obj = TriggerModel.objects.create(
-                name="FK ID Test",
-                value=100,
-                category=self.category1,
-                created_by=self.user1
-            )
-
-            # Create upsert object with ForeignKey field set
-            upsert_obj = TriggerModel(
-                name="FK ID Test",  # Same name to match existing
+        # Create objects for upsert - one existing (by name), one new
+        upsert_objects = [
+            TriggerModel(
+                name="Existing Mock",  # This will be classified as existing
+                value=999,
+                category=self.category1
+            ),
+            TriggerModel(
+                name="New Mock",  # This will be classified as new
                 value=200,
-                category=self.category1,
-                created_by=self.user1  # Same user
+                category=self.category2
             )
+        ]
 
-            # Ensure the ForeignKey _id field is accessible
-            self.assertEqual(upsert_obj.category_id, self.category1.pk)
-            self.assertEqual(upsert_obj.created_by_id, self.user1.pk)
-
-            # Mock Django's bulk_create to simulate successful operation
-            with patch('django.db.models.QuerySet.bulk_create') as mock_bulk_create:
-                mock_bulk_create.return_value = [upsert_obj]
-
-                # Perform upsert using category as unique field (this will use _id field handling)
-                result = TriggerModel.objects.bulk_create(
-                    [upsert_obj],
-                    update_conflicts=True,
-                    update_fields=['value'],
-                    unique_fields=['category']  # Use ForeignKey as unique field
-                )
-
-                # Verify the _id field handling was executed (lines 105-106, 142, 148)
-                # This should trigger the update path since we're matching by category
-                self.assertIn(('before_update', 1), trigger_calls)
+        # Perform upsert operation - this will trigger the classification logic
+        self.run_upsert(upsert_objects, 1, unique_fields=['name'])
 
-        finally:
-            clear_triggers()
+        # Verify the classification logic was executed: each object fires exactly
+        # its own create or update triggers, and nothing else fires
+        self.assertEqual(self.trigger_calls, Counter({
+            VALIDATE_CREATE: 1, BEFORE_CREATE: 1, AFTER_CREATE: 1,  # New object
+            VALIDATE_UPDATE: 1, BEFORE_UPDATE: 1, AFTER_UPDATE: 1,  # Existing object
+        }))
 
-    def test_bulk_create_after_triggers_upsert_mock(self):
+    def test_bulk_create_mti_path_with_upsert(self):
         """
-        Test AFTER triggers for upsert operations using mocks (covers lines 240-241).
+        Test MTI bulk_create path with upsert parameters (covers line 192).
 
-        This specifically tests the AFTER trigger logic for mixed create/update operations.
+        This tests the MTI branch when update_conflicts and unique_fields are provided.
         """
-        trigger_calls = []
-
-        @bulk_trigger(TriggerModel, AFTER_CREATE)
-        def after_create_trigger(new_instances, original_instances):
-            trigger_calls.append(('after_create', len(new_instances)))
-
-        @bulk_trigger(TriggerModel, AFTER_UPDATE)
-        def after_update_trigger(new_instances, original_instances):
-            trigger_calls.append(('after_update', len(new_instances)))
+        # Mock _is_multi_table_inheritance to return True
+        with patch.object(TriggerQuerySetMixin, '_is_multi_table_inheritance', return_value=True):
+            # Mock _mti_bulk_create to track calls
+            with patch.object(TriggerQuerySetMixin, '_mti_bulk_create') as mock_mti_create:
+                mock_mti_create.return_value = [
+                    TriggerModel(name="MTI Test 1", value=100, category=self.category1),
+                    TriggerModel(name="MTI Test 2", value=200, category=self.category2)
+                ]
 
-        try:
-            # Create an existing record
-            existing_obj = TriggerModel.objects.create(
-                name="Existing After Test",
-                value=100,
-                category=self.category1
-            )
-
-            # Create objects for upsert
-            upsert_objects = [
-                TriggerModel(name="Existing After Test", value=200, category=self.category1),  # Update
-                TriggerModel(name="New After Test", value=300, category=self.category2)        # Create
-            ]
-
-            # Mock Django's bulk_create to simulate successful operation
-            with patch('django.db.models.QuerySet.bulk_create') as mock_bulk_create:
-                mock_bulk_create.return_value = upsert_objects
+                upsert_objects = [
+                    TriggerModel(name="MTI Test 1", value=100, category=self.category1),
+                    TriggerModel(name="MTI Test 2", value=200, category=self.category2)
+                ]
 
-                # Perform upsert - this should trigger AFTER triggers for both operations
+                # This should call the MTI path with upsert parameters
                 result = TriggerModel.objects.bulk_create(
                     upsert_objects,
                     update_conflicts=True,
@@ -5448,306 +348,158 @@ class BulkOperationsCoverageTest(TestCase):
                     unique_fields=['name']
                 )
 
-                # Verify AFTER triggers were called for both operations
-                self.assertIn(('after_create', 1), trigger_calls)  # New record
-                self.assertIn(('after_update', 1), trigger_calls)  # Existing record
+                # Verify _mti_bulk_create was called with upsert parameters
+                mock_mti_create.assert_called_once()
+                call_args = mock_mti_create.call_args
+                self.assertEqual(call_args.args[0], upsert_objects)  # First arg is objects
+                self.assertIn('existing_records', call_args.kwargs)
+                self.assertIn('new_records', call_args.kwargs)
+                self.assertEqual(call_args.kwargs['update_conflicts'], True)
+                self.assertEqual(call_args.kwargs['unique_fields'], ['name'])
 
-        finally:
-            clear_triggers()
-
-    def test_bulk_create_upsert_no_unique_fields(self):
+    def test_bulk_update_mti_path(self):
         """
-        Test bulk_create upsert with no unique_fields specified (covers line 169).
+        Test bulk_update MTI path (covers line 269).
 
-        This tests the case where no unique fields are provided, so all records are treated as new.
+        This tests the MTI branch in bulk_update method.
         """
-        trigger_calls = []
-
-        @bulk_trigger(TriggerModel, BEFORE_CREATE)
-        def before_create_trigger(new_instances, original_instances):
-            trigger_calls.append(('before_create', len(new_instances)))
+        # Create test objects
+        obj1 = self.create_existing(name="MTI Update 1", value=100, category=self.category1)
+        obj2 = self.create_existing(name="MTI Update 2", value=200, category=self.category2)
 
-        try:
-            # Create objects for upsert but don't specify unique_fields
-            upsert_objects = [
-                TriggerModel(name="No Unique 1", value=100, category=self.category1),
-                TriggerModel(name="No Unique 2", value=200, category=self.category2)
-            ]
+        # Mock _is_multi_table_inheritance method on the queryset
+        with patch.object(TriggerQuerySetMixin, '_is_multi_table_inheritance', return_value=True):
+            # Mock _mti_bulk_update to track calls
+            with patch.object(TriggerQuerySetMixin, '_mti_bulk_update') as mock_mti_update:
+                mock_mti_update.return_value = 2
 
-            # Mock Django's bulk_create to simulate successful operation
-            with patch('django.db.models.QuerySet.bulk_create') as mock_bulk_create:
-                mock_bulk_create.return_value = upsert_objects
+                # Modify objects for update
+                obj1.value = 150
+                obj2.value = 250
 
-                # Perform upsert operation without unique_fields - should treat all as new
-                result = TriggerModel.objects.bulk_create(
-                    upsert_objects,
-                    update_conflicts=True,
-                    update_fields=['value']
-                    # Note: no unique_fields specified
-                )
+                # This should call the MTI bulk_update path
+                result = TriggerModel.objects.bulk_update([obj1, obj2])
 
-                # Verify all records were treated as new (line 169)
-                self.assertIn(('before_create', 2), trigger_calls)  # All objects treated as creates
+                # Verify _mti_bulk_update was called
+                mock_mti_update.assert_called_once()
+                call_args = mock_mti_update.call_args
+                self.assertEqual(call_args.args[0], [obj1, obj2])  # Objects
+                self.assertIsInstance(call_args.args[1], list)     # Fields list
 
-        finally:
-            clear_triggers()
+                # Verify result
+                self.assertEqual(result, 2)
 
-    def test_bulk_delete_no_valid_pks_return_zero(self):
+    def test_bulk_delete_no_objects_return_zero(self):
         """
-        Test bulk_delete when objects have no valid primary keys (covers line 306).
+        Test bulk_delete return value when no objects provided (covers line 300).
 
-        This tests the delete_operation function return path when no objects have valid pks.
+        This tests the case where the pks list is empty by passing an empty list.
         """
-        from django_bulk_triggers.bulk_operations import BulkOperationsMixin
-
-        # Create a mock queryset with the mixin
-        class MockQuerySet(BulkOperationsMixin):
-            def __init__(self):
-                self.model = TriggerModel
-
-        queryset = MockQuerySet()
-
-        # Create objects with no primary keys
-        obj1 = TriggerModel(name="No PK Delete 1", value=100, category=self.category1)
-        obj2 = TriggerModel(name="No PK Delete 2", value=200, category=self.category2)
-        obj1.pk = None
-        obj2.pk = None
-
-        # Create the delete_operation function (this is the inner function from bulk_delete)
-        def delete_operation():
-            pks = [obj.pk for obj in [obj1, obj2] if obj.pk is not None]
-            if pks:
-                # Use the base manager to avoid recursion
-                return queryset.model._base_manager.filter(pk__in=pks).delete()[0]
-            else:
-                return 0  # This covers line 306
+        # Test with empty list - should return 0 and not call triggers
+        result = TriggerModel.objects.bulk_delete([])
 
-        # Test the delete_operation function directly
-        result = delete_operation()
-
-        # Verify result is 0 when no objects have valid pks
+        # Verify result is 0
         self.assertEqual(result, 0)
 
-    def test_bulk_create_upsert_foreign_key_id_fields(self):
-        """
-        Test upsert logic with ForeignKey _id field handling (covers lines 105-106, 142, 148).
-
-        This tests the _id field handling for ForeignKey relationships in upsert classification.
-        """
-        trigger_calls = []
-
-        @bulk_trigger(TriggerModel, BEFORE_UPDATE)
-        def before_update_trigger(new_instances, original_instances):
-            trigger_calls.append(('before_update', len(new_instances)))
-
-        try:
-            # Create an existing record
-            existing_obj = TriggerModel.objects.create(
-                name="FK ID Test",
-                value=100,
-                category=self.category1,
-                created_by=self.user1
-            )
-
-            # Create upsert object with ForeignKey field set
-            upsert_obj = TriggerModel(
-                name="FK ID Test",  # Same name to match existing
-                value=200,
-                category=self.category1,
-                created_by=self.user1  # Same user
-            )
-
-            # Ensure the ForeignKey _id field is accessible
-            self.assertEqual(upsert_obj.category_id, self.category1.pk)
-            self.assertEqual(upsert_obj.created_by_id, self.user1.pk)
-
-            # Mock Django's bulk_create to simulate successful operation
-            with patch('django.db.models.QuerySet.bulk_create') as mock_bulk_create:
-                mock_bulk_create.return_value = [upsert_obj]
+        # Verify no triggers were called
+        self.assertFalse(self.trigger_calls)
 
-                # Perform upsert using category as unique field (this will use _id field handling)
-                result = TriggerModel.objects.bulk_create(
-                    [upsert_obj],
-                    update_conflicts=True,
-                    update_fields=['value'],
-                    unique_fields=['category']  # Use ForeignKey as unique field
-                )
-
-                # Verify the _id field handling was executed (lines 105-106, 142, 148)
-                # This should trigger the update path since we're matching by category
-                self.assertIn(('before_update', 1), trigger_calls)
-
-        finally:
-            clear_triggers()
-
-    def test_bulk_create_mti_path_mock(self):
+    def test_bulk_create_upsert_with_all_new_records(self):
         """
-        Test MTI bulk_create path using mocks (covers line 192).
+        Test bulk_create upsert logic when all records are new (covers lines 168-169).
 
-        This tests the MTI branch in bulk_create when update_conflicts=True.
+        This tests the case where no existing records are found.
         """
-        trigger_calls = []
-
-        @bulk_trigger(TriggerModel, BEFORE_CREATE)
-        def before_create_trigger(new_instances, original_instances):
-            trigger_calls.append(('before_create', len(new_instances)))
-
-        try:
-            # Mock _is_multi_table_inheritance to return True
-            with patch('django_bulk_triggers.queryset.TriggerQuerySetMixin._is_multi_table_inheritance', return_value=True):
-                # Mock _mti_bulk_create to track calls
-                with patch('django_bulk_triggers.queryset.TriggerQuerySetMixin._mti_bulk_create') as mock_mti_create:
-                    mock_mti_create.return_value = [
-                        TriggerModel(name="MTI Mock Test 1", value=100, category=self.category1),
-                        TriggerModel(name="MTI Mock Test 2", value=200, category=self.category2)
-                    ]
+        # Create objects that don't exist in database
+        upsert_objects = [
+            TriggerModel(name="All New 1", value=100, category=self.category1),
+            TriggerModel(name="All New 2", value=200, category=self.category2)
+        ]
 
-                    upsert_objects = [
-                        TriggerModel(name="MTI Mock Test 1", value=100, category=self.category1),
-                        TriggerModel(name="MTI Mock Test 2", value=200, category=self.category2)
-                    ]
+        # Perform upsert - all records should be treated as new
+        self.run_upsert(upsert_objects, 1, unique_fields=['name'])
 
-                    # This should call the MTI path with upsert parameters
-                    result = TriggerModel.objects.bulk_create(
-                        upsert_objects,
-                        update_conflicts=True,
-                        update_fields=['value'],
-                        unique_fields=['name']
-                    )
+        # Verify only create triggers were called (all records are new)
+        self.assertEqual(self.trigger_calls, Counter({
+            VALIDATE_CREATE: 2, BEFORE_CREATE: 2, AFTER_CREATE: 2,
+        }))
 
-                    # Verify _mti_bulk_create was called with upsert parameters
-                    mock_mti_create.assert_called_once()
-                    call_args = mock_mti_create.call_args
-                    self.assertEqual(call_args[0][0], upsert_objects)  # First arg is objects
-                    self.assertIn('existing_records', call_args[1])
-                    self.assertIn('new_records', call_args[1])
-                    self.assertEqual(call_args[1]['update_conflicts'], True)
-                    self.assertEqual(call_args[1]['unique_fields'], ['name'])
-
-        finally:
-            clear_triggers()
-
-    def test_bulk_create_upsert_no_unique_fields(self):
+    def test_bulk_create_upsert_with_all_existing_records(self):
         """
-        Test bulk_create upsert with no unique_fields specified (covers line 169).
+        Test bulk_create upsert logic when all records already exist (covers existing_records path).
 
-        This tests the case where no unique fields are provided, so all records are treated as new.
+        This tests the case where all records are classified as existing.
         """
-        trigger_calls = []
-
-        @bulk_trigger(TriggerModel, BEFORE_CREATE)
-        def before_create_trigger(new_instances, original_instances):
-            trigger_calls.append(('before_create', len(new_instances)))
-
-        try:
-            # Create objects for upsert but don't specify unique_fields
-            upsert_objects = [
-                TriggerModel(name="No Unique 1", value=100, category=self.category1),
-                TriggerModel(name="No Unique 2", value=200, category=self.category2)
-            ]
-
-            # Mock Django's bulk_create to simulate successful operation
-            with patch('django.db.models.QuerySet.bulk_create') as mock_bulk_create:
-                mock_bulk_create.return_value = upsert_objects
-
-                # Perform upsert operation without unique_fields - should treat all as new
-                result = TriggerModel.objects.bulk_create(
-                    upsert_objects,
-                    update_conflicts=True,
-                    update_fields=['value']
-                    # Note: no unique_fields specified
-                )
+        # Create objects with same unique fields (should update existing)
+        upsert_objects = [
+            TriggerModel(name="All Existing 1", value=150, category=self.category1),
+            TriggerModel(name="All Existing 2", value=250, category=self.category2)
+        ]
 
-                # Verify all records were treated as new (line 169)
-                self.assertIn(('before_create', 2), trigger_calls)  # All objects treated as creates
+        # Perform upsert - all records should be treated as updates
+        self.run_upsert(upsert_objects, 1, unique_fields=['name'])
 
-        finally:
-            clear_triggers()
+        # Verify only update triggers were called (all records are updates)
+        self.assertEqual(self.trigger_calls, Counter({
+            VALIDATE_UPDATE: 2, BEFORE_UPDATE: 2, AFTER_UPDATE: 2,
+        }))
 
-    def test_bulk_delete_no_valid_pks_return_zero(self):
+    def test_bulk_create_upsert_foreign_key_handling(self):
         """
-        Test bulk_delete when objects have no valid primary keys (covers line 306).
+        Test upsert logic with ForeignKey field handling (covers lines 104-115).
 
-        This tests the delete_operation function return path when no objects have valid pks.
+        This tests the _id field handling for ForeignKey relationships.
         """
-        from django_bulk_triggers.bulk_operations import BulkOperationsMixin
-
-        # Create a mock queryset with the mixin
-        class MockQuerySet(BulkOperationsMixin):
-            def __init__(self):
-                self.model = TriggerModel
+        # Create upsert object with ForeignKey field
+        upsert_obj = TriggerModel(
+            name="FK Test",  # Not matched on: the upsert is keyed on category alone
+            value=200,
+            category=self.fk_new_category,  # Category with no seeded rows
+            created_by=self.user1           # Same user
+        )
 
-        queryset = MockQuerySet()
+        # Perform upsert using category as unique field (ForeignKey)
+        self.run_upsert([upsert_obj], 1, update_fields=['value', 'name'], unique_fields=['category'])
 
-        # Create objects with no primary keys
-        obj1 = TriggerModel(name="No PK Delete 1", value=100, category=self.category1)
-        obj2 = TriggerModel(name="No PK Delete 2", value=200, category=self.category2)
-        obj1.pk = None
-        obj2.pk = None
+        # Verify the _id field handling was executed (lines 105-106, 142, 148)
+        # No seeded row sits in fk_new_category, so this should be a create operation
+        self.assertEqual(self.trigger_calls, Counter({
+            VALIDATE_CREATE: 1, BEFORE_CREATE: 1, AFTER_CREATE: 1,
+        }))
 
-        # Create the delete_operation function (this is the inner function from bulk_delete)
-        def delete_operation():
-            pks = [obj.pk for obj in [obj1, obj2] if obj.pk is not None]
-            if pks:
-                # Use the base manager to avoid recursion
-                return queryset.model._base_manager.filter(pk__in=pks).delete()[0]
-            else:
-                return 0  # This covers line 306
 
-        # Test the delete_operation function directly
-        result = delete_operation()
+class BulkOperationsUnitTest(SimpleTestCase):
+    """Tests for bulk_operations.py helpers that never reach the database."""
 
-        # Verify result is 0 when no objects have valid pks
-        self.assertEqual(result, 0)
-
-    def test_bulk_create_upsert_foreign_key_id_fields(self):
+    def test_apply_custom_update_fields_empty_list(self):
         """
-        Test upsert logic with ForeignKey _id field handling (covers lines 105-106, 142, 148).
+        Test _apply_custom_update_fields with empty custom_update_fields (covers line 323).
 
-        This tests the _id field handling for ForeignKey relationships in upsert classification.
+        This tests the early return when custom_update_fields is empty.
         """
-        trigger_calls = []
+        queryset = MockQuerySet(TriggerModel)
 
-        @bulk_trigger(TriggerModel, BEFORE_UPDATE)
-        def before_update_trigger(new_instances, original_instances):
-            trigger_calls.append(('before_update', len(new_instances)))
-
-        try:
-            # Create an existing record
-            existing_obj = TriggerModel.objects.create(
-                name="FK ID Test",
-                value=100,
-                category=self.category1,
-                created_by=self.user1
-            )
+        # Unsaved instances are enough - the early return never touches them
+        obj1 = TriggerModel(name="Custom Fields Test 1", value=100)
+        obj2 = TriggerModel(name="Custom Fields Test 2", value=200)
 
-            # Create upsert object with ForeignKey field set
-            upsert_obj = TriggerModel(
-                name="FK ID Test",  # Same name to match existing
-                value=200,
-                category=self.category1,
-                created_by=self.user1  # Same user
-            )
+        # Test with empty custom_update_fields - should return immediately
+        fields_set = {'value', 'name'}
+        result = queryset._apply_custom_update_fields([obj1, obj2], [], fields_set)
 
-            # Ensure the ForeignKey _id field is accessible
-            self.assertEqual(upsert_obj.category_id, self.category1.pk)
-            self.assertEqual(upsert_obj.created_by_id, self.user1.pk)
+        # Verify method returns None (early return)
+        self.assertIsNone(result)
 
-            # Mock Django's bulk_create to simulate successful operation
-            with patch('django.db.models.QuerySet.bulk_create') as mock_bulk_create:
-                mock_bulk_create.return_value = [upsert_obj]
+        # Verify fields_set was not modified
+        self.assertEqual(fields_set, {'value', 'name'})
 
-                # Perform upsert using category as unique field (this will use _id field handling)
-                result = TriggerModel.objects.bulk_create(
-                    [upsert_obj],
-                    update_conflicts=True,
-                    update_fields=['value'],
-                    unique_fields=['category']  # Use ForeignKey as unique field
-                )
+    def test_query_counter_counts_and_passes_through(self):
+        """Test _QueryCounter counts each query and returns the wrapped execute's result."""
+        counter = _QueryCounter()
+        execute = Mock(return_value="cursor result")
 
-                # Verify the _id field handling was executed (lines 105-106, 142, 148)
-                # This should trigger the update path since we're matching by category
-                self.assertIn(('before_update', 1), trigger_calls)
+        self.assertEqual(counter(execute, "SELECT 1", None, False, {}), "cursor result")
+        counter(execute, "SELECT 2", None, False, {})
 
-        finally:
-            clear_triggers()
+        self.assertEqual(counter.count, 2)
+        execute.assert_called_with("SELECT 2", None, False, {})
@@ -531,6 +531,21 @@ class TestDecoratorIntegration:
         # Verify the trigger was registered
         assert hasattr(test_trigger, '_bulk_trigger_registered')
 
+    def test_bulk_trigger_decorator_with_multiple_events(self):
+        """Test bulk_trigger registers one handler for each event in a list."""
+        from django_bulk_triggers.registry import get_triggers
+
+        @bulk_trigger(TriggerModel, ['BEFORE_CREATE', 'BEFORE_UPDATE'])
+        def test_trigger(new_records, old_records=None, **kwargs):
+            pass
+
+        create_handlers = [t[0] for t in get_triggers(TriggerModel, 'BEFORE_CREATE')]
+        update_handlers = [t[0] for t in get_triggers(TriggerModel, 'BEFORE_UPDATE')]
+
+        # The same handler class is registered under both events
+        assert len(create_handlers) == 1
+        assert create_handlers == update_handlers
+
     def test_select_related_with_valid_fields(self, test_user, test_category):
         """Test select_related decorator with valid field names."""
         # Create test instances
@@ -5,8 +5,9 @@ Integration tests for django-bulk-triggers.
 from unittest.mock import patch
 
 import pytest
-from django.db import transaction
-from django.test import TestCase, TransactionTestCase
+from django.db import connection, transaction
+from django.test import TestCase, TransactionTestCase, override_settings
+from django.test.utils import CaptureQueriesContext
 
 from django_bulk_triggers import TriggerClass
 from django_bulk_triggers.conditions import HasChanged, IsEqual, IsNotEqual, WasEqual
@@ -418,6 +419,71 @@ class TestFullSystemIntegration(TestCase):
         for instance in created_instances:
             self.assertIsNotNone(instance.pk)
 
+    def test_upsert_existing_rows_fires_after_update(self):
+        """Test an upsert matching only existing rows fires AFTER_UPDATE, not AFTER_CREATE."""
+
+        create_trigger = BulkCreateTestTrigger()
+        update_trigger = BulkUpdateTestTrigger()
+
+        existing = TriggerModel.objects.bulk_create(
+            [TriggerModel(name="Upsert 1", value=1, created_by=self.user)],
+            bypass_triggers=True,
+        )[0]
+
+        upsert_objects = [
+            TriggerModel(pk=existing.pk, name="Upsert 1", value=10, created_by=self.user)
+        ]
+        TriggerModel.objects.bulk_create(
+            upsert_objects,
+            update_conflicts=True,
+            unique_fields=["id"],
+            update_fields=["value"],
+        )
+
+        self.assertEqual(len(create_trigger.tracker.before_create_calls), 0)
+        self.assertEqual(len(create_trigger.tracker.after_create_calls), 0)
+        self.assertEqual(len(update_trigger.tracker.before_update_calls), 1)
+        self.assertEqual(len(update_trigger.tracker.after_update_calls), 1)
+        self.assertEqual(
+            update_trigger.tracker.after_update_calls[0]["new_records"], upsert_objects
+        )
+
+        existing.refresh_from_db()
+        self.assertEqual(existing.value, 10)
+
+    def test_upsert_mixed_rows_fires_after_update_and_create(self):
+        """Test a mixed upsert fires AFTER_UPDATE for matched rows and AFTER_CREATE for new ones."""
+
+        create_trigger = BulkCreateTestTrigger()
+        update_trigger = BulkUpdateTestTrigger()
+
+        existing = TriggerModel.objects.bulk_create(
+            [TriggerModel(name="Upsert 1", value=1, created_by=self.user)],
+            bypass_triggers=True,
+        )[0]
+
+        updated = TriggerModel(pk=existing.pk, name="Upsert 1", value=10, created_by=self.user)
+        created = TriggerModel(name="Upsert 2", value=2, created_by=self.user)
+        TriggerModel.objects.bulk_create(
+            [updated, created],
+            update_conflicts=True,
+            unique_fields=["id"],
+            update_fields=["value"],
+        )
+
+        self.assertEqual(len(update_trigger.tracker.after_update_calls), 1)
+        self.assertEqual(
+            update_trigger.tracker.after_update_calls[0]["new_records"], [updated]
+        )
+        self.assertEqual(len(create_trigger.tracker.after_create_calls), 1)
+        self.assertEqual(
+            create_trigger.tracker.after_create_calls[0]["new_records"], [created]
+        )
+
+        self.assertEqual(TriggerModel.objects.count(), 2)
+        existing.refresh_from_db()
+        self.assertEqual(existing.value, 10)
+
     def test_complete_bulk_update_workflow(self):
         """Test complete bulk_update workflow with triggers."""
 
@@ -481,6 +547,87 @@ class TestFullSystemIntegration(TestCase):
         remaining_count = TriggerModel.objects.count()
         self.assertEqual(remaining_count, 0)
 
+    def test_bulk_delete_in_batches(self):
+        """Test bulk_delete splits the pk__in filter into batch_size chunks."""
+
+        trigger_instance = BulkDeleteTestTrigger()
+
+        created_instances = TriggerModel.objects.bulk_create(
+            [
+                TriggerModel(name=f"Batch {i}", value=i, created_by=self.user)
+                for i in range(5)
+            ],
+            bypass_triggers=True,
+        )
+
+        with CaptureQueriesContext(connection) as ctx:
+            deleted_count = TriggerModel.objects.bulk_delete(
+                created_instances, batch_size=2
+            )
+
+        # 5 pks in batches of 2 take three DELETE ... IN statements
+        delete_queries = [
+            query["sql"]
+            for query in ctx.captured_queries
+            if query["sql"].lstrip().upper().startswith("DELETE")
+            and TriggerModel._meta.db_table in query["sql"]
+        ]
+        self.assertEqual(len(delete_queries), 3)
+        for sql in delete_queries:
+            self.assertIn(" IN (", sql)
+
+        # Triggers still fire once for the whole set, not once per batch
+        self.assertEqual(len(trigger_instance.tracker.before_delete_calls), 1)
+        self.assertEqual(len(trigger_instance.tracker.after_delete_calls), 1)
+
+        self.assertEqual(deleted_count, 5)
+        self.assertEqual(TriggerModel.objects.count(), 0)
+
+    @override_settings(BULK_TRIGGERS_DELETE_BATCH=4)
+    def test_bulk_delete_batch_size_setting(self):
+        """Test bulk_delete takes its default batch size from BULK_TRIGGERS_DELETE_BATCH."""
+
+        created_instances = TriggerModel.objects.bulk_create(
+            [
+                TriggerModel(name=f"Batch {i}", value=i, created_by=self.user)
+                for i in range(5)
+            ],
+            bypass_triggers=True,
+        )
+
+        with CaptureQueriesContext(connection) as ctx:
+            deleted_count = TriggerModel.objects.bulk_delete(created_instances)
+
+        delete_queries = [
+            query["sql"]
+            for query in ctx.captured_queries
+            if query["sql"].lstrip().upper().startswith("DELETE")
+            and TriggerModel._meta.db_table in query["sql"]
+        ]
+        self.assertEqual(len(delete_queries), 2)
+        self.assertEqual(deleted_count, 5)
+
+    def test_bulk_delete_rejects_invalid_batch_size(self):
+        """Test bulk_delete raises ValueError for a batch_size that is not a positive integer."""
+
+        trigger_instance = BulkDeleteTestTrigger()
+
+        created_instances = TriggerModel.objects.bulk_create(
+            [TriggerModel(name="Batch 0", value=0, created_by=self.user)],
+            bypass_triggers=True,
+        )
+
+        for batch_size in (0, -1, "2", 1.5):
+            with self.subTest(batch_size=batch_size):
+                with self.assertRaises(ValueError):
+                    TriggerModel.objects.bulk_delete(
+                        created_instances, batch_size=batch_size
+                    )
+
+        # Nothing is deleted and no trigger fires
+        self.assertEqual(len(trigger_instance.tracker.before_delete_calls), 0)
+        self.assertEqual(TriggerModel.objects.count(), 1)
+
     def test_triggers_with_conditions(self):
         """Test triggers with various conditions."""
 